@@ -0,0 +1,255 @@
+import numpy as np
+
+try:
+    import numba
+except ImportError:  # optional: strategies keep their pure Python / NumPy paths
+    numba = None
+
+
+def _jit(function):
+    """Compile with Numba when it is installed; cache=True keeps the machine code in __pycache__,
+    so the compilation cost is paid once per kernel and not on every launch."""
+    if numba is None:
+        return function
+    return numba.njit(cache=True, nogil=True)(function)
+
+
+def backend():
+    """"numba" when the kernels are compiled, "python" when strategies use their own loops."""
+    if numba is None or numba.config.DISABLE_JIT:
+        return "python"
+    return "numba"
+
+
+def enabled():
+    return backend() == "numba"
+
+
+# Indexed binary min-heap over flat arrays, ordered by (key, item) like IndexedDaryHeap
+
+@_jit
+def _sift_up(heap, positions, keys, position):
+    item = heap[position]
+    key = keys[item]
+    while position > 0:
+        parent_position = (position - 1) // 2
+        parent = heap[parent_position]
+        if keys[parent] < key or (keys[parent] == key and parent < item):
+            break
+        heap[position] = parent
+        positions[parent] = position
+        position = parent_position
+    heap[position] = item
+    positions[item] = position
+
+
+@_jit
+def _sift_down(heap, positions, keys, position, size):
+    item = heap[position]
+    key = keys[item]
+    while True:
+        child_position = 2 * position + 1
+        if child_position >= size:
+            break
+        child = heap[child_position]
+        if child_position + 1 < size:
+            right = heap[child_position + 1]
+            if keys[right] < keys[child] or (keys[right] == keys[child] and right < child):
+                child_position, child = child_position + 1, right
+        if key < keys[child] or (key == keys[child] and item < child):
+            break
+        heap[position] = child
+        positions[child] = position
+        position = child_position
+    heap[position] = item
+    positions[item] = position
+
+
+@_jit
+def peel(indptr, indices, offsets):
+    """Charikar's peel on CSR adjacency: repeatedly remove the node of minimum offset + degree.
+
+    Args:
+        indptr, indices: Symmetric CSR adjacency (CompactGraph.indptr / CompactGraph.indices)
+        offsets: int64 per-node priority offsets (zeros for a plain peel, loads for Greedy++)
+
+    Returns:
+        (node indices in removal order, degree of each node at its removal)
+    """
+    n = len(indptr) - 1
+    degrees = np.empty(n, dtype=np.int64)
+    keys = np.empty(n, dtype=np.int64)
+    heap = np.empty(n, dtype=np.int64)
+    positions = np.empty(n, dtype=np.int64)
+    for v in range(n):
+        degrees[v] = indptr[v + 1] - indptr[v]
+        keys[v] = offsets[v] + degrees[v]
+        heap[v] = v
+        positions[v] = v
+    for position in range((n - 2) // 2, -1, -1):
+        _sift_down(heap, positions, keys, position, n)
+
+    alive = np.ones(n, dtype=np.bool_)
+    order = np.empty(n, dtype=np.int64)
+    removal_degrees = np.zeros(n, dtype=np.int64)
+    size = n
+    for step in range(n):
+        v = heap[0]
+        size -= 1
+        if size > 0:
+            heap[0] = heap[size]
+            positions[heap[0]] = 0
+            _sift_down(heap, positions, keys, 0, size)
+        alive[v] = False
+        order[step] = v
+        removal_degrees[v] = degrees[v]
+        for a in range(indptr[v], indptr[v + 1]):
+            u = indices[a]
+            if alive[u]:
+                degrees[u] -= 1
+                keys[u] -= 1
+                _sift_up(heap, positions, keys, positions[u])
+    return order, removal_degrees
+
+
+@_jit
+def max_flow(indptr, heads, reverse, capacity, source, sink):
+    """Dinic's maximum flow on a CSR residual network with float capacities.
+
+    Args:
+        indptr, heads: CSR arcs by tail; arc a goes to heads[a]
+        reverse: Index of the residual partner of every arc
+        capacity: Arc capacities (not modified)
+
+    Returns:
+        (flow value, boolean mask of the nodes on the source side of a minimum cut)
+    """
+    eps = 1e-9
+    n = len(indptr) - 1
+    residual = capacity.copy()
+    level = np.empty(n, dtype=np.int64)
+    queue = np.empty(n, dtype=np.int64)
+    next_arc = np.empty(n, dtype=np.int64)
+    path = np.empty(n, dtype=np.int64)
+    total = 0.0
+
+    while True:
+        # BFS levels over arcs with residual capacity
+        level[:] = -1
+        level[source] = 0
+        queue[0] = source
+        head, tail = 0, 1
+        while head < tail:
+            v = queue[head]
+            head += 1
+            for a in range(indptr[v], indptr[v + 1]):
+                u = heads[a]
+                if level[u] < 0 and residual[a] > eps:
+                    level[u] = level[v] + 1
+                    queue[tail] = u
+                    tail += 1
+        if level[sink] < 0:
+            return total, level >= 0
+
+        # blocking flow with an iterative DFS along level-increasing arcs
+        for v in range(n):
+            next_arc[v] = indptr[v]
+        depth = 0
+        node = source
+        while True:
+            if node == sink:
+                bottleneck = np.inf
+                for k in range(depth):
+                    bottleneck = min(bottleneck, residual[path[k]])
+                for k in range(depth):
+                    residual[path[k]] -= bottleneck
+                    residual[reverse[path[k]]] += bottleneck
+                total += bottleneck
+                # retreat to the tail of the first saturated arc
+                for k in range(depth):
+                    if residual[path[k]] <= eps:
+                        depth = k
+                        break
+                node = source if depth == 0 else heads[path[depth - 1]]
+                continue
+            advanced = False
+            while next_arc[node] < indptr[node + 1]:
+                a = next_arc[node]
+                u = heads[a]
+                if residual[a] > eps and level[u] == level[node] + 1:
+                    path[depth] = a
+                    depth += 1
+                    node = u
+                    advanced = True
+                    break
+                next_arc[node] += 1
+            if not advanced:
+                if node == source:
+                    break
+                level[node] = -1  # dead end for this phase
+                depth -= 1
+                node = source if depth == 0 else heads[path[depth - 1]]
+                next_arc[node] += 1
+
+
+class GoldbergNetwork:
+    """Goldberg's flow network of a CompactGraph in CSR form, reused across density guesses.
+
+    Nodes 0 .. n - 1 are the graph's, n is the source and n + 1 the sink. Every undirected edge is
+    a pair of unit arcs that are each other's residual partner; source and sink arcs get a zero
+    capacity partner. Only the sink capacities m + 2g - deg(v) depend on the guess g.
+    """
+
+    def __init__(self, graph):
+        """
+        Args:
+            graph: CompactGraph
+        """
+        n, m = graph.num_nodes, graph.num_edges
+        self.num_nodes = n
+        self.num_edges = m
+        self.source, self.sink = n, n + 1
+        nodes = np.arange(n, dtype=np.int64)
+        sources = np.full(n, self.source, dtype=np.int64)
+        sinks = np.full(n, self.sink, dtype=np.int64)
+
+        # arc blocks: edges u -> v, edges v -> u, source -> v, v -> source, v -> sink, sink -> v
+        tails = np.concatenate((graph.sources, graph.targets, sources, nodes, nodes, sinks))
+        heads = np.concatenate((graph.targets, graph.sources, nodes, sources, sinks, nodes))
+        offsets = np.cumsum([0, m, m, n, n, n, n])
+        reverse = np.concatenate((np.arange(offsets[1], offsets[2]), np.arange(offsets[0], offsets[1]),
+                                  np.arange(offsets[3], offsets[4]), np.arange(offsets[2], offsets[3]),
+                                  np.arange(offsets[5], offsets[6]), np.arange(offsets[4], offsets[5])))
+        capacity = np.concatenate((np.ones(2 * m), np.full(n, float(m)), np.zeros(n), np.zeros(n), np.zeros(n)))
+
+        order = np.argsort(tails, kind='stable')
+        new_index = np.empty_like(order)
+        new_index[order] = np.arange(len(order))
+        self.heads = heads[order]
+        self.reverse = new_index[reverse[order]]
+        self.capacity = capacity[order]
+        self.indptr = np.zeros(n + 3, dtype=np.int64)
+        np.cumsum(np.bincount(tails, minlength=n + 2), out=self.indptr[1:])
+        self.sink_arcs = new_index[offsets[4]:offsets[5]]
+        self.degrees = graph.degrees.astype(np.float64)
+
+    def min_cut(self, g):
+        """Boolean mask of the graph nodes on the source side of the minimum cut for guess g."""
+        self.capacity[self.sink_arcs] = self.num_edges + 2 * g - self.degrees
+        _, source_side = max_flow(self.indptr, self.heads, self.reverse, self.capacity, self.source, self.sink)
+        return source_side[:self.num_nodes]
+
+
+# Usage
+if __name__ == "__main__":
+    import time
+
+    from CompactGraph import CompactGraph
+    from GraphLoader import GraphLoader
+
+    graph = CompactGraph.from_networkx(GraphLoader.load_graph("datasets/hamsterster.txt"))
+    print(f"Backend: {backend()}")
+    for attempt in ("first call (compiles or loads the cache)", "second call"):
+        start_time = time.perf_counter()
+        order, removal_degrees = peel(graph.indptr, graph.indices, np.zeros(graph.num_nodes, dtype=np.int64))
+        print(f"  peel, {attempt}: {time.perf_counter() - start_time:.3f} s")
@@ -3,16 +3,30 @@ from DatasetsService import DatasetsService
 from AlgorithmStrategy import AlgorithmStrategy as AlgoStrat, GoldbergsMaxDensitySubgraph
 import AlgorithmStrategy
 import time
-import tracemalloc
-import psutil
-import os
 import networkx as nx
 
 from EvaluationResultsView import AlgorithmResultsViewer
+from MemorySampler import MemorySampler
+from RenderQueue import RenderQueue
 
 
 class AlgorithmEvaluator:
-    def __init__(self, algorithm_strategy, dataset):
+    def __init__(self, algorithm_strategy, dataset, gap_tolerance=0.0, reference_nodes=None, time_budget=None,
+                 memory_sampler=None, trace_memory=False):
+        """
+        Args:
+            algorithm_strategy: AlgorithmStrategy to evaluate
+            dataset: NetworkX graph to evaluate on
+            gap_tolerance: Largest certified relative gap (upper bound / found density - 1) for
+                which the exact solver is skipped; 0.0 skips it only when optimality is certified
+            reference_nodes: Optimal node set computed earlier for this dataset, used instead of
+                running the exact solver again
+            time_budget: Seconds after which the strategy's anytime run is stopped, keeping its best result
+            memory_sampler: MemorySampler sampling process memory during the timed run (defaults to
+                MemorySampler(trace_python=False), since tracing allocations slows the strategy down several times)
+            trace_memory: Also run the strategy a second, untimed time under a tracing MemorySampler, for the
+                traced Python peak and its attribution to structures; skipped when the timed run was stopped
+        """
         self.accuracy = None
         self.identified_subgraph_nodes = None
         self.optimal_density = None
@@ -20,26 +34,56 @@ class AlgorithmEvaluator:
         self.identified_subgraph_density = None
         self.identified_subgraph_size = None
         self.memory_used = None
+        self.memory_profile = None
         self.running_time = None
+        self.strategy_metrics = None
+        self.progress_curve = None
+        self.stopped_early = None
+        self.certified_upper_bound = None
+        self.guaranteed_ratio = None
+        self.exact_solver_run = None
+        self.gap_tolerance = gap_tolerance
+        self.reference_nodes = reference_nodes
+        self.time_budget = time_budget
+        self.memory_sampler = memory_sampler if memory_sampler is not None else MemorySampler(trace_python=False)
+        self.trace_memory = trace_memory
         self.algorithm = algorithm_strategy
         self.dataset = dataset
+        # weighted datasets (GraphLoader.load_graph(..., weighted=True)) are scored by total edge weight per node
+        self.weight = 'weight' if dataset.graph.get('weighted') else None
         self.reset_metrics()
 
     def reset_metrics(self):
         self.running_time = 0.0
         self.memory_used = 0.0
+        self.memory_profile = {}
         self.accuracy = 0.0
         self.identified_subgraph_size = 0
         self.identified_subgraph_density = 0.0
         self.optimal_density = None
         self.identified_subgraph_nodes = set()
+        self.strategy_metrics = {}
+        self.progress_curve = []
+        self.stopped_early = False
+        self.optimal_nodes_overlap = None
+        self.certified_upper_bound = None
+        self.guaranteed_ratio = None
+        self.exact_solver_run = False
 
     def get_optimal(self):
-        goldbergs_solution = AlgorithmStrategy.GoldbergsMaxDensitySubgraph()
+        if self.reference_nodes is not None:
+            self.optimal_nodes_overlap = AlgorithmEvaluator.get_similarity_with_optimal_nodes(
+                self.identified_subgraph_nodes, self.reference_nodes)
+            return AlgoStrat.subgraph_density(self.dataset, self.reference_nodes, self.weight)
+
+        if self.weight is not None:
+            goldbergs_solution = AlgorithmStrategy.WeightedGoldbergsMaxDensitySubgraph(self.weight)
+        else:
+            goldbergs_solution = AlgorithmStrategy.GoldbergsMaxDensitySubgraph()
         optimal_nodes = goldbergs_solution.apply_algorithm(self.dataset)
         self.optimal_nodes_overlap = AlgorithmEvaluator.get_similarity_with_optimal_nodes(self.identified_subgraph_nodes,optimal_nodes)
 
-        return AlgoStrat.subgraph_density(self.dataset, optimal_nodes)
+        return AlgoStrat.subgraph_density(self.dataset, optimal_nodes, self.weight)
 
     @staticmethod
     def get_similarity_with_optimal_nodes(identified_densest_nodes, optimal_nodes):
@@ -49,73 +93,170 @@ class AlgorithmEvaluator:
             return 0.0
         return 100 * len(opt & set(identified_densest_nodes)) / len(opt)
 
-    def evaluate_algorithm(self, algorithm_strategy, iterations=None):
-        """Evaluate an algorithm strategy and record all metrics"""
-        self.reset_metrics()
+    def evaluate_algorithm(self, algorithm_strategy, iterations=None, progress_callback=None):
+        """
+        Evaluate an algorithm strategy and record all metrics.
 
-        # Start memory tracking
-        tracemalloc.start()
-        snapshot_before = tracemalloc.take_snapshot()
+        The strategy runs through its anytime iter_algorithm, so every progress report is
+        recorded in progress_curve, and a KeyboardInterrupt stops the run while keeping the
+        best node set reported so far. Process memory (RSS/USS) is sampled during the timed
+        run; with trace_memory, traced Python memory comes from a second run, which is skipped
+        when the first one stopped early. After a stop the exact solver is skipped as well,
+        leaving accuracy None next to the certified bound, unless reference_nodes are given.
 
-        process = psutil.Process(os.getpid())
-        memory_before = process.memory_full_info().uss / 1024 / 1024  # MB
+        Args:
+            algorithm_strategy: AlgorithmStrategy to evaluate
+            iterations: Iterations for Greedy++ strategies
+            progress_callback: Optional callable(report, elapsed_seconds) invoked on every progress report
+        """
+        self.reset_metrics()
+        completed = False
 
         # Start timing
+        self.memory_sampler.start()
         start_time = time.perf_counter()
 
         # Execute the algorithm
         try:
-            if hasattr(algorithm_strategy, 'apply_algorithm'):
+            if hasattr(algorithm_strategy, 'iter_algorithm'):
                 AlgorithmResultsViewer.display_algorithm_and_dataset(algorithm_strategy, self.dataset)
-                if (type(algorithm_strategy) in [
-                    AlgorithmStrategy.GreedyPlusPlus,
-                    AlgorithmStrategy.GreedyPlusPlusPriorityQueue
-                ] and iterations is not None):
-                    self.identified_subgraph_nodes = algorithm_strategy.apply_algorithm(
-                        self.dataset, iterations
-                    )
-                else:
-                    self.identified_subgraph_nodes = algorithm_strategy.apply_algorithm(
-                        self.dataset
-                    )
+                reports = self.iter_reports(algorithm_strategy, iterations)
+                completed = self.record_progress(reports, start_time, progress_callback)
             else:
-                raise AttributeError("Algorithm strategy must have apply_algorithm method")
+                raise AttributeError("Algorithm strategy must have iter_algorithm method")
 
         except Exception as e:
             print(f"Error executing algorithm: {e}")
             self.identified_subgraph_nodes = set()
 
-        # Take final snapshot
-        snapshot_after = tracemalloc.take_snapshot()
-
         # Stop timing
         end_time = time.perf_counter()
         self.running_time = end_time - start_time
+        self.memory_sampler.stop()
+        self.record_memory()
 
-        # Calculate cumulative memory allocations from tracemalloc
-        stats = snapshot_after.compare_to(snapshot_before, 'lineno')
-        total_allocated = sum(stat.size_diff for stat in stats if stat.size_diff > 0)
-        tracemalloc_usage = total_allocated / 1024 / 1024  # Convert to MB
-
-        # Calculate USS memory usage from psutil
-        memory_after = process.memory_full_info().uss / 1024 / 1024  # MB
-        uss_usage = memory_after - memory_before
+        # Metrics of the timed run, before the memory run overwrites the strategy's state
+        self.strategy_metrics = algorithm_strategy.get_strategy_metrics()
 
-        # Use the higher of the two memory measurements
-        self.memory_used = max(tracemalloc_usage, uss_usage)
-
-        tracemalloc.stop()
-
-        # Calculate metrics
+        if completed and self.trace_memory:
+            self.measure_memory(algorithm_strategy, iterations)
         self.identified_subgraph_size = len(self.identified_subgraph_nodes)
         self.identified_subgraph_density = AlgoStrat.subgraph_density(
-            self.dataset, self.identified_subgraph_nodes
+            self.dataset, self.identified_subgraph_nodes, self.weight
         )
 
-        self.optimal_density = self.get_optimal()
+        self.certify(algorithm_strategy)
+        if self.stopped_early and self.reference_nodes is None:
+            # the exact solver would outlast the budget or the interrupt; the certified bound still applies
+            self.accuracy = None
+        elif self.guaranteed_ratio is None or 1 / self.guaranteed_ratio - 1 > self.gap_tolerance:
+            try:
+                self.optimal_density = self.get_optimal()
+            except KeyboardInterrupt:
+                print("\n⏹ Exact solver stopped, accuracy is unknown")
+                self.optimal_nodes_overlap = None
+                self.accuracy = None
+                return
+            self.exact_solver_run = True
+
+            # Calculate accuracy
+            self.calculate_accuracy()
+        else:
+            self.accuracy = None
+
+    def iter_reports(self, algorithm_strategy, iterations=None):
+        """The strategy's progress reports on the dataset, with iterations for Greedy++ strategies."""
+        if getattr(algorithm_strategy, 'takes_iterations', False) and iterations is not None:
+            return algorithm_strategy.iter_algorithm(self.dataset, iterations)
+        return algorithm_strategy.iter_algorithm(self.dataset)
+
+    def record_memory(self):
+        """Take memory_profile and memory_used from the timed run's sampler (USS, or RSS without USS)."""
+        self.memory_profile = self.memory_sampler.to_dict()
+        process_peak = self.memory_profile['peak_uss_mb']
+        if process_peak is None:
+            process_peak = self.memory_profile['peak_rss_mb']
+        self.memory_used = max(self.memory_profile['peak_traced_mb'] or 0.0, process_peak or 0.0)
+
+    def measure_memory(self, algorithm_strategy, iterations):
+        """Run the strategy again under a tracing MemorySampler and add its traced peak and attribution.
 
-        # Calculate accuracy
-        self.calculate_accuracy()
+        The sampler samples memory in the background, so transient peaks are caught as well.
+        """
+        traced_sampler = MemorySampler()
+        reports = self.iter_reports(algorithm_strategy, iterations)
+        traced_sampler.start()
+        try:
+            for _ in reports:
+                pass
+        except KeyboardInterrupt:
+            print("\n⏹ Memory measurement stopped early")
+        finally:
+            reports.close()
+            traced_sampler.stop()
+
+        traced_profile = traced_sampler.to_dict()
+        self.memory_profile['peak_traced_mb'] = traced_profile['peak_traced_mb']
+        self.memory_profile['structure_mb'] = traced_profile['structure_mb']
+        self.memory_used = max(self.memory_used, traced_profile['peak_traced_mb'] or 0.0)
+
+    def certify(self, algorithm_strategy):
+        """Derive the guaranteed approximation ratio from the strategy's last reported upper bound.
+
+        Any reported upper bound is valid, including one from a run stopped early. Bounds are in
+        the strategy's own density, so they are only used when it matches the evaluator's.
+        """
+        if not self.progress_curve or self.progress_curve[-1][2] is None:
+            return
+        if self.weight is not None and getattr(algorithm_strategy, 'weight', None) != self.weight:
+            return
+        if getattr(algorithm_strategy, 'objective', 'edge') != 'edge':
+            return  # e.g. triangle-density bounds say nothing about edge density
+
+        self.certified_upper_bound = max(self.progress_curve[-1][2], self.identified_subgraph_density)
+        if self.certified_upper_bound <= 0:
+            self.guaranteed_ratio = 1.0
+        elif self.identified_subgraph_density > 0:
+            self.guaranteed_ratio = self.identified_subgraph_density / self.certified_upper_bound
+
+    def record_progress(self, reports, start_time, progress_callback=None):
+        """Consume progress reports, keeping the latest node set, until done or interrupted.
+
+        Returns:
+            True if the reports ran to completion
+        """
+        try:
+            for report in reports:
+                elapsed = time.perf_counter() - start_time
+                self.identified_subgraph_nodes = report['nodes']
+                self.progress_curve.append(
+                    (elapsed, report['lower_bound'], report['upper_bound'], report['progress']))
+                if progress_callback is not None:
+                    progress_callback(report, elapsed)
+                if self.time_budget is not None and elapsed > self.time_budget and report['progress'] < 1.0:
+                    reports.close()
+                    self.stopped_early = True
+                    print(f"\n⏹ Time budget of {self.time_budget} s exceeded, keeping the best result found so far")
+                    return False
+        except KeyboardInterrupt:
+            reports.close()
+            self.stopped_early = True
+            print("\n⏹ Stopped early, keeping the best result found so far")
+            return False
+        return True
+
+    def time_to_quality_curve(self):
+        """(elapsed seconds, lower bound / optimal density) for every recorded progress report."""
+        if not self.optimal_density or getattr(self.algorithm, 'objective', 'edge') != 'edge':
+            return []
+        return [(elapsed, lower_bound / self.optimal_density) for elapsed, lower_bound, _, _ in self.progress_curve]
+
+    def time_to_quality(self, quality):
+        """Seconds until the reported lower bound first reached quality * optimal density, or None."""
+        for elapsed, reached in self.time_to_quality_curve():
+            if reached >= quality - 1e-12:
+                return elapsed
+        return None
 
     def calculate_accuracy(self):
         """Calculate accuracy as the ratio of found density to optimal density"""
@@ -131,13 +272,26 @@ class AlgorithmEvaluator:
             'algorithm': type(self.algorithm).__name__,
             'running_time': self.running_time,
             'memory_used': self.memory_used,
+            'peak_traced_memory': self.memory_profile.get('peak_traced_mb'),
+            'peak_uss_memory': self.memory_profile.get('peak_uss_mb'),
+            'peak_rss_memory': self.memory_profile.get('peak_rss_mb'),
+            **{f"{structure}_memory": (self.memory_profile.get('structure_mb') or {}).get(structure)
+               for structure in MemorySampler.structure_names()},
             'identified_subgraph_size': self.identified_subgraph_size,
             'identified_subgraph_density': self.identified_subgraph_density,
             'optimal_density': self.optimal_density,
             'overlap_with_optimal_subgraph': self.optimal_nodes_overlap,
             'accuracy': self.accuracy,
             '#_dataset_nodes': self.dataset.number_of_nodes(),
-            '#_dataset_edges': self.dataset.number_of_edges()
+            '#_dataset_edges': self.dataset.number_of_edges(),
+            'weighted': self.weight is not None,
+            'stopped_early': self.stopped_early,
+            'certified_upper_bound': self.certified_upper_bound,
+            'guaranteed_ratio': self.guaranteed_ratio,
+            'exact_solver_run': self.exact_solver_run,
+            'time_to_90%_optimal_density': self.time_to_quality(0.9),
+            'time_to_99%_optimal_density': self.time_to_quality(0.99),
+            **self.strategy_metrics
         }
 
 
@@ -145,6 +299,9 @@ if __name__ == "__main__":
     # Load datasets
     datasets = Datasets()
 
+    # Figures render in background processes; the sweep only waits for them at the end
+    render_queue = RenderQueue()
+
     # Example evaluation
     for dataset_name, dataset_graph in datasets.datasets.items():
         if dataset_name == "Hamsterster":
@@ -156,12 +313,16 @@ if __name__ == "__main__":
                 AlgorithmStrategy.CharikarsGreedyFibonacciHeap(),
                 AlgorithmStrategy.GoldbergsMaxDensitySubgraph(),
                 AlgorithmStrategy.GreedyPlusPlus(),
-                AlgorithmStrategy.GreedyPlusPlusPriorityQueue()
+                AlgorithmStrategy.GreedyPlusPlusPriorityQueue(),
+                AlgorithmStrategy.BatchPeelingDensestSubgraph(),
+                AlgorithmStrategy.EdgeSamplingSketch()
             ]
 
             for algorithm in algorithms:
                 evaluator = AlgorithmEvaluator(algorithm, dataset_graph)
                 evaluator.evaluate_algorithm(algorithm, iterations=15)
                 AlgorithmResultsViewer.display_evaluation_results(evaluator)
-                AlgorithmResultsViewer.draw_densest_component_zoom(dataset_graph, evaluator.identified_subgraph_nodes, dataset_name, algorithm.algorithm_name)
-                #evaluator.display_evaluation_results()
\ No newline at end of file
+                render_queue.submit_zoom(dataset_graph, evaluator.identified_subgraph_nodes, dataset_name, algorithm.algorithm_name)
+                #evaluator.display_evaluation_results()
+
+    render_queue.close()
\ No newline at end of file
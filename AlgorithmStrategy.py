@@ -1,17 +1,21 @@
 from abc import ABC, abstractmethod
 import networkx as nx
-import dsd
 import time
 import heapq
+import random
+import hashlib
+import weakref
 import numpy as np
 import time
-from dsd import exact_densest
 
 import numpy as np
-from dsd import flowless
-from dsd.fibheap import FibonacciHeap
+from concurrent.futures import ProcessPoolExecutor
 
+import AcceleratedKernels
+from CompactGraph import CompactGraph, CompactDirectedGraph
 from Datasets import Datasets
+from GraphLoader import GraphLoader
+from IndexedHeap import IndexedDaryHeap
 
 
 
@@ -23,159 +27,272 @@ class AlgorithmStrategy:
         pass
 
     @staticmethod
-    def subgraph_density(graph, nodes):
-        """Calculate the density of a subgraph given its nodes"""
+    def subgraph_density(graph, nodes, weight=None):
+        """Calculate the density of a subgraph given its nodes (total edge weight per node when weight is given)"""
         if len(nodes) == 0:
             return 0.0
+        if isinstance(graph, CompactGraph):
+            return graph.subgraph_density(nodes, weighted=weight is not None)
         subgraph = graph.subgraph(nodes)
-        num_edges = subgraph.number_of_edges()
+        num_edges = subgraph.size(weight=weight) if weight is not None else subgraph.number_of_edges()
         num_nodes = len(nodes)
         return num_edges / num_nodes if num_nodes > 0 else 0.0
 
+    @staticmethod
+    def directed_subgraph_density(graph, source_nodes, target_nodes):
+        """Calculate the directed density |E(S, T)| / sqrt(|S| |T|) of a pair of node sets"""
+        if len(source_nodes) == 0 or len(target_nodes) == 0:
+            return 0.0
+        target_nodes = set(target_nodes)
+        num_edges = sum(1 for u in source_nodes for v in graph.successors(u) if v in target_nodes)
+        return num_edges / np.sqrt(len(source_nodes) * len(target_nodes))
+
+    def get_strategy_metrics(self):
+        """Strategy-specific metrics of the last run, merged into the evaluator's metrics dict."""
+        return {}
+
+    # number of progress reports a peel yields over its run
+    PROGRESS_CHECKPOINTS = 20
+
+    def iter_algorithm(self, undirected_dataset_graph, *args):
+        """
+        Anytime variant of apply_algorithm that yields progress reports while the strategy runs.
+
+        Strategies that can report intermediate results override this; the default runs
+        apply_algorithm and yields a single final report without an upper bound. Stopping
+        the iteration early keeps the last report's node set as the best result so far.
+
+        Yields:
+            Dicts with 'nodes', 'lower_bound', 'upper_bound' (or None) and 'progress' in [0, 1]
+        """
+        nodes = self.apply_algorithm(undirected_dataset_graph, *args)
+        if isinstance(nodes, tuple):  # strategies return (set(), 0.0) on empty input
+            nodes = nodes[0]
+        lower_bound = AlgorithmStrategy.subgraph_density(undirected_dataset_graph, nodes, getattr(self, 'weight', None))
+        yield AlgorithmStrategy.progress_report(nodes, lower_bound, None, 1.0)
+
+    @staticmethod
+    def progress_report(nodes, lower_bound, upper_bound, progress):
+        """Progress report of an anytime run; nodes is copied since strategies keep mutating their sets."""
+        return {
+            'nodes': set(nodes),
+            'lower_bound': lower_bound,
+            'upper_bound': upper_bound,
+            'progress': progress
+        }
+
+    @staticmethod
+    def run_to_completion(reports):
+        """Exhaust an iter_algorithm generator and return the final node set."""
+        nodes = set()
+        for report in reports:
+            nodes = report['nodes']
+        return nodes
+
+    @staticmethod
+    def checkpoint_interval(num_nodes):
+        """Removals between two progress reports of a peel."""
+        return max(1, num_nodes // AlgorithmStrategy.PROGRESS_CHECKPOINTS)
+
+    @staticmethod
+    def peel_upper_bound(max_removal_degree, remaining_graph):
+        """Upper bound on the optimum density during a min-degree peel.
+
+        The first node of the densest subgraph to be peeled had degree at least the optimum when
+        it was removed; while none of it is peeled, the optimum is at most half the max degree left.
+        """
+        max_remaining_degree = max((degree for _, degree in remaining_graph.degree()), default=0)
+        return max(float(max_removal_degree), max_remaining_degree / 2)
+
 class CharikarsGreedy(AlgorithmStrategy):
-    def __init__(self):
+    def __init__(self, min_size=1):
         self.algorithm_name = "Charikars Greedy"
+        self.min_size = min_size  # only subgraphs with at least min_size nodes are considered
 
     def apply_algorithm(self, undirected_dataset_graph):
         if undirected_dataset_graph.number_of_nodes() == 0:
             return set(), 0.0
+        return AlgorithmStrategy.run_to_completion(self.iter_algorithm(undirected_dataset_graph))
 
+    def iter_algorithm(self, undirected_dataset_graph):
         current_subgraph = undirected_dataset_graph.copy()
         current_subgraph_nodes = set(current_subgraph.nodes())
+        num_graph_nodes = len(current_subgraph_nodes)
+        checkpoint = AlgorithmStrategy.checkpoint_interval(num_graph_nodes)
 
         best_density = 0.0
         best_subgraph_nodes = set(current_subgraph.nodes())
+        max_removal_degree = 0
 
         while len(current_subgraph_nodes) > 0:
             num_edges = current_subgraph.number_of_edges()
             num_nodes = len(current_subgraph_nodes)
             current_density = num_edges / num_nodes if num_nodes > 0 else 0.0
 
-            if current_density > best_density:
+            if current_density > best_density and num_nodes >= self.min_size:
                 best_density = current_density
                 best_subgraph_nodes = current_subgraph_nodes.copy()
 
+            if (num_graph_nodes - num_nodes) % checkpoint == 0:
+                yield AlgorithmStrategy.progress_report(
+                    best_subgraph_nodes, best_density,
+                    AlgorithmStrategy.peel_upper_bound(max_removal_degree, current_subgraph),
+                    1 - num_nodes / num_graph_nodes)
+
             min_vertex = min(current_subgraph_nodes, key=lambda v: (current_subgraph.degree(v), str(v)))
+            max_removal_degree = max(max_removal_degree, current_subgraph.degree(min_vertex))
 
             current_subgraph_nodes.remove(min_vertex)
             current_subgraph.remove_node(min_vertex)
 
-        return best_subgraph_nodes
+        yield AlgorithmStrategy.progress_report(best_subgraph_nodes, best_density, float(max_removal_degree), 1.0)
 
 class CharikarsGreedyMinHeap(AlgorithmStrategy):
-    def __init__(self):
+    def __init__(self, min_size=1):
         self.algorithm_name = "Charikars Greedy Using MinHeap"
+        self.min_size = min_size  # only subgraphs with at least min_size nodes are considered
+        self.backend = "python"
 
     def apply_algorithm(self, dataset_graph):
+        return AlgorithmStrategy.run_to_completion(self.iter_algorithm(dataset_graph))
+
+    def get_strategy_metrics(self):
+        return {'backend': self.backend}
+
+    def _iter_compiled(self, dataset_graph):
+        """The same peel as a compiled kernel over CSR arrays; yields only the final report."""
+        graph = CompactGraph.from_networkx(dataset_graph)
+        order, removal_degrees = AcceleratedKernels.peel(
+            graph.indptr, graph.indices, np.zeros(graph.num_nodes, dtype=np.int64))
+        profile = DensityProfile(graph, order, removal_degrees)
+        yield AlgorithmStrategy.progress_report(profile.nodes(self.min_size), profile.best_density(self.min_size),
+                                                float(removal_degrees.max(initial=0)), 1.0)
+
+    def iter_algorithm(self, dataset_graph):
+        self.backend = AcceleratedKernels.backend()
+        if AcceleratedKernels.enabled() and dataset_graph.number_of_nodes() > 0:
+            yield from self._iter_compiled(dataset_graph)
+            return
+
         h = dataset_graph.copy()
         remaining_nodes = set(h.nodes())
+        num_graph_nodes = len(remaining_nodes)
+        checkpoint = AlgorithmStrategy.checkpoint_interval(num_graph_nodes)
 
-        # Initialize a min-heap with (degree, node) tuples
-        heap = [(h.degree(node), node) for node in remaining_nodes]
-        heapq.heapify(heap)
+        # Indexed min-heap of node degrees, updated in place with decrease-key
+        node_list = list(h.nodes())
+        node_index = {node: i for i, node in enumerate(node_list)}
+        heap = IndexedDaryHeap.from_keys([h.degree(node) for node in node_list])
 
         best_density = 0.0
         best_subgraph_nodes = set()
+        max_removal_degree = 0
 
+        num_edges = h.number_of_edges()  # kept up to date as nodes are removed
         while remaining_nodes:
-            num_edges = h.number_of_edges()
             num_nodes = len(remaining_nodes)
             current_density = num_edges / num_nodes if num_nodes > 0 else 0.0
 
-            if current_density > best_density:
+            if current_density > best_density and num_nodes >= self.min_size:
                 best_density = current_density
                 best_subgraph_nodes = remaining_nodes.copy()
 
-            # Pop nodes from heap until we find one that is still valid
-            min_vertex = None
-            while heap:
-                degree, node = heapq.heappop(heap)
-                if node in remaining_nodes and h.degree(node) == degree:
-                    min_vertex = node
-                    break
+            if (num_graph_nodes - num_nodes) % checkpoint == 0:
+                yield AlgorithmStrategy.progress_report(
+                    best_subgraph_nodes, best_density,
+                    AlgorithmStrategy.peel_upper_bound(max_removal_degree, h),
+                    1 - num_nodes / num_graph_nodes)
 
-            if min_vertex is None:
-                break
+            i, degree = heap.pop()
+            min_vertex = node_list[i]
+            max_removal_degree = max(max_removal_degree, degree)
 
             # Remove the selected node
             remaining_nodes.remove(min_vertex)
 
             # Get neighbors before removing the node
             neighbors = list(h.neighbors(min_vertex))
+            num_edges -= len(neighbors)
             h.remove_node(min_vertex)
 
             # Update the heap with new degrees of neighbors
             for neighbor in neighbors:
                 if neighbor in remaining_nodes:
-                    heapq.heappush(heap, (h.degree(neighbor), neighbor))
+                    heap.decrease_key(node_index[neighbor], h.degree(neighbor))
 
-        return best_subgraph_nodes
+        yield AlgorithmStrategy.progress_report(best_subgraph_nodes, best_density, float(max_removal_degree), 1.0)
 
 class CharikarsGreedyFibonacciHeap(AlgorithmStrategy):
-    def __init__(self):
+    def __init__(self, min_size=1):
         self.algorithm_name = "Charikars Greedy Using Fibonacci Heap"
+        self.min_size = min_size  # only subgraphs with at least min_size nodes are considered
 
     def apply_algorithm(self, dataset_graph):
+        return AlgorithmStrategy.run_to_completion(self.iter_algorithm(dataset_graph))
+
+    def iter_algorithm(self, dataset_graph):
         h = dataset_graph.copy()
         remaining_nodes = set(h.nodes())
-        fh = FibonacciHeap()
-        node_to_entry = {}
-
-        # Initialize Fibonacci heap with node degrees
-        for node in remaining_nodes:
-            entry = fh.insert(h.degree(node), node)
-            node_to_entry[node] = entry
+        num_graph_nodes = len(remaining_nodes)
+        checkpoint = AlgorithmStrategy.checkpoint_interval(num_graph_nodes)
+        # array-backed indexed heap with decrease-key, replacing the pointer-based Fibonacci heap
+        node_list = list(h.nodes())
+        node_index = {node: i for i, node in enumerate(node_list)}
+        heap = IndexedDaryHeap.from_keys([h.degree(node) for node in node_list])
 
         best_density = 0.0
         best_subgraph = set()
+        max_removal_degree = 0
 
+        num_edges = h.number_of_edges()  # kept up to date as nodes are removed
         while remaining_nodes:
-            num_edges = h.number_of_edges()
             num_nodes = len(remaining_nodes)
             current_density = num_edges / num_nodes if num_nodes > 0 else 0.0
 
-            if current_density > best_density:
+            if current_density > best_density and num_nodes >= self.min_size:
                 best_density = current_density
                 best_subgraph = set(remaining_nodes)
 
-            # Extract minimum degree node
-            min_entry = fh.extract_min()
-            if not min_entry:
-                break
-            min_degree, min_vertex = min_entry.key, min_entry.value
+            if (num_graph_nodes - num_nodes) % checkpoint == 0:
+                yield AlgorithmStrategy.progress_report(
+                    best_subgraph, best_density,
+                    AlgorithmStrategy.peel_upper_bound(max_removal_degree, h),
+                    1 - num_nodes / num_graph_nodes)
 
-            # Validate entry (handle stale degrees)
-            if min_vertex not in remaining_nodes or h.degree(min_vertex) != min_degree:
-                continue
+            # Extract minimum degree node
+            i, min_degree = heap.pop()
+            min_vertex = node_list[i]
+            max_removal_degree = max(max_removal_degree, min_degree)
 
             # Remove node from tracking structures
             remaining_nodes.remove(min_vertex)
-            del node_to_entry[min_vertex]
 
             # Process neighbors before removal
             neighbors = list(h.neighbors(min_vertex))
+            num_edges -= len(neighbors)
             h.remove_node(min_vertex)
 
-            # Update neighbor degrees in Fibonacci heap
+            # Update neighbor degrees in the heap
             for neighbor in neighbors:
                 if neighbor in remaining_nodes:
-                    new_degree = h.degree(neighbor)
-                    try:
-                        fh.decrease_key(node_to_entry[neighbor], new_degree)
-                    except ValueError:
-                        # Handle cases where new degree isn't smaller
-                        pass
+                    heap.decrease_key(node_index[neighbor], h.degree(neighbor))
 
-        return best_subgraph
+        yield AlgorithmStrategy.progress_report(best_subgraph, best_density, float(max_removal_degree), 1.0)
 
 class GreedyPlusPlus(AlgorithmStrategy):
-    def __init__(self):
+    takes_iterations = True  # apply_algorithm / iter_algorithm accept an iterations count
+
+    def __init__(self, min_size=1):
         self.algorithm_name = "Greedy++ (Flowless)"
+        self.min_size = min_size  # only subgraphs with at least min_size nodes are considered
 
     def apply_algorithm(self, undirected_dataset_graph, iterations=10):
         if undirected_dataset_graph.number_of_nodes() == 0:
             return set(), 0.0
+        return AlgorithmStrategy.run_to_completion(self.iter_algorithm(undirected_dataset_graph, iterations))
 
+    def iter_algorithm(self, undirected_dataset_graph, iterations=10):
+        """Yields a progress report after every round; the upper bound is min(first-peel bound, max load / rounds)."""
         max_density_nodes = set(undirected_dataset_graph.nodes)
         max_density = 0.0
 
@@ -183,10 +300,12 @@ class GreedyPlusPlus(AlgorithmStrategy):
             max_density = undirected_dataset_graph.number_of_edges() / len(max_density_nodes)
 
         vertex_loads = {vertex: 0 for vertex in undirected_dataset_graph.nodes}
+        upper_bound = float('inf')
 
         for i in range(iterations):
             current_subgraph = undirected_dataset_graph.copy()
             current_subgraph_nodes = set(current_subgraph.nodes)
+            max_removal_degree = 0
 
             while current_subgraph_nodes:
                 # Find node with minimum (load + degree)
@@ -194,6 +313,7 @@ class GreedyPlusPlus(AlgorithmStrategy):
                                  key=lambda v: (vertex_loads[v] + current_subgraph.degree(v), str(v)))
                 min_vertex_degree = current_subgraph.degree(min_vertex)
                 vertex_loads[min_vertex] += min_vertex_degree
+                max_removal_degree = max(max_removal_degree, min_vertex_degree)
 
                 current_subgraph_nodes.remove(min_vertex)
                 current_subgraph.remove_node(min_vertex)
@@ -203,20 +323,51 @@ class GreedyPlusPlus(AlgorithmStrategy):
 
                 current_subgraph_density = current_subgraph.number_of_edges() / len(current_subgraph_nodes)
 
-                if current_subgraph_density > max_density:
+                if current_subgraph_density > max_density and len(current_subgraph_nodes) >= self.min_size:
                     max_density = current_subgraph_density
                     max_density_nodes = set(current_subgraph_nodes)
 
-        return max_density_nodes
+            # the first round is a plain peel; every round's loads / rounds is a fractional edge assignment
+            if i == 0:
+                upper_bound = float(max_removal_degree)
+            upper_bound = min(upper_bound, max(vertex_loads.values(), default=0) / (i + 1))
+            yield AlgorithmStrategy.progress_report(max_density_nodes, max_density, upper_bound, (i + 1) / iterations)
 
 class GreedyPlusPlusPriorityQueue(AlgorithmStrategy):
-    def __init__(self):
+    takes_iterations = True
+
+    def __init__(self, min_size=1):
         self.algorithm_name = "Greedy++ (Flowless) using Priority Queue"
+        self.min_size = min_size  # only subgraphs with at least min_size nodes are considered
+        self.backend = "python"
 
     def apply_algorithm(self, undirected_dataset_graph, iterations=10):
         if undirected_dataset_graph.number_of_nodes() == 0:
             return set(), 0.0
-
+        return AlgorithmStrategy.run_to_completion(self.iter_algorithm(undirected_dataset_graph, iterations))
+
+    def get_strategy_metrics(self):
+        return {'backend': self.backend}
+
+    def _iter_compiled(self, undirected_dataset_graph, rounds, max_density_nodes, max_density):
+        """Rounds as compiled peels with the loads as priority offsets."""
+        graph = CompactGraph.from_networkx(undirected_dataset_graph)
+        loads = np.zeros(graph.num_nodes, dtype=np.int64)
+        upper_bound = float('inf')
+        for i in range(rounds):
+            order, removal_degrees = AcceleratedKernels.peel(graph.indptr, graph.indices, loads)
+            loads += removal_degrees
+            profile = DensityProfile(graph, order, removal_degrees)
+            if profile.best_density(self.min_size) > max_density:
+                max_density = profile.best_density(self.min_size)
+                max_density_nodes = profile.nodes(self.min_size)
+            if i == 0:
+                upper_bound = float(removal_degrees.max(initial=0))
+            upper_bound = min(upper_bound, loads.max(initial=0) / (i + 1))
+            yield AlgorithmStrategy.progress_report(max_density_nodes, max_density, upper_bound, (i + 1) / rounds)
+
+    def iter_algorithm(self, undirected_dataset_graph, iterations=10):
+        """Yields a progress report after every round; the upper bound is min(first-peel bound, max load / rounds)."""
         max_density_nodes = set(undirected_dataset_graph.nodes)
         max_density = 0.0
 
@@ -224,77 +375,120 @@ class GreedyPlusPlusPriorityQueue(AlgorithmStrategy):
             max_density = undirected_dataset_graph.number_of_edges() / len(max_density_nodes)
 
         vertex_loads = {vertex: 0 for vertex in undirected_dataset_graph.nodes}
+        upper_bound = float('inf')
+        rounds = max(iterations - 1, 0)
 
-        for i in range(iterations-1):
+        self.backend = AcceleratedKernels.backend()
+        if AcceleratedKernels.enabled() and rounds > 0:
+            yield from self._iter_compiled(undirected_dataset_graph, rounds, max_density_nodes, max_density)
+            return
+
+        for i in range(rounds):
             current_subgraph = undirected_dataset_graph.copy()
             current_subgraph_nodes = set(current_subgraph.nodes)
+            max_removal_degree = 0
 
-            fib_heap = FibonacciHeap()
-            node_map = {}
+            # Indexed heap of (load + degree) priorities; loads are integers in the unweighted graph
+            node_list = list(current_subgraph.nodes)
+            node_index = {vertex: index for index, vertex in enumerate(node_list)}
+            heap = IndexedDaryHeap.from_keys(
+                [vertex_loads[vertex] + current_subgraph.degree(vertex) for vertex in node_list])
 
-            # Insert all vertices with (load + degree) priority
-            for vertex in current_subgraph_nodes:
-                priority = vertex_loads[vertex] + current_subgraph.degree(vertex)
-                node = fib_heap.insert(priority, vertex)
-                node_map[vertex] = node
+            num_edges = current_subgraph.number_of_edges()
 
             for j in range(len(current_subgraph_nodes) - 1): # until there's one vertex left where the degree would be 0.
                 # Extract minimum priority vertex
-                min_node = fib_heap.extract_min()
-                min_vertex = min_node.value
+                index, _ = heap.pop()
+                min_vertex = node_list[index]
                 min_vertex_degree = current_subgraph.degree(min_vertex)
                 vertex_loads[min_vertex] += min_vertex_degree
+                max_removal_degree = max(max_removal_degree, min_vertex_degree)
 
                 # Process neighbors before removal
                 neighbours = list(current_subgraph.neighbors(min_vertex))
+                num_edges -= len(neighbours)
 
                 # Remove vertex from subgraph
                 current_subgraph.remove_node(min_vertex)
                 current_subgraph_nodes.remove(min_vertex)
-                del node_map[min_vertex]
 
                 # Update neighbor priorities
                 for neighbour in neighbours:
-                    if neighbour in node_map:
+                    if neighbour in current_subgraph_nodes:
                         new_neighbour_priority = vertex_loads[neighbour] + current_subgraph.degree(neighbour)
-                        fib_heap.decrease_key(node_map[neighbour], new_neighbour_priority)
+                        heap.decrease_key(node_index[neighbour], new_neighbour_priority)
 
                 # Update maximum density
                 if current_subgraph_nodes:
-                    current_density = current_subgraph.number_of_edges() / len(current_subgraph_nodes)
-                    if current_density > max_density:
+                    current_density = num_edges / len(current_subgraph_nodes)
+                    if current_density > max_density and len(current_subgraph_nodes) >= self.min_size:
                         max_density = current_density
                         max_density_nodes = set(current_subgraph_nodes)
 
-        return max_density_nodes
+            # the first round is a plain peel; every round's loads / rounds is a fractional edge assignment
+            if i == 0:
+                upper_bound = float(max_removal_degree)
+            upper_bound = min(upper_bound, max(vertex_loads.values(), default=0) / (i + 1))
+            yield AlgorithmStrategy.progress_report(max_density_nodes, max_density, upper_bound, (i + 1) / rounds)
+
+        if rounds == 0:
+            yield AlgorithmStrategy.progress_report(max_density_nodes, max_density, None, 1.0)
 
 class GoldbergsMaxDensitySubgraph(AlgorithmStrategy):
     def __init__(self):
         self.algorithm_name = "Goldberg's Maximum Density Subgraph"
+        self.backend = "python"
+
+    def get_strategy_metrics(self):
+        return {'backend': self.backend}
 
     def apply_algorithm(self, undirected_dataset_graph):
         graph_nodes = undirected_dataset_graph.nodes
         if len(graph_nodes) == 0:
             return set(), 0.0
 
+        n = len(graph_nodes)
+        if undirected_dataset_graph.number_of_edges() == 0:
+            return set(list(graph_nodes)[:1]) if n > 0 else set(), 0.0
+
+        return AlgorithmStrategy.run_to_completion(self.iter_algorithm(undirected_dataset_graph))
+
+    def iter_algorithm(self, undirected_dataset_graph):
+        """Yields a progress report after every binary-search step, bracketing the optimum by [density of v1, u]."""
+        graph_nodes = undirected_dataset_graph.nodes
         n = len(graph_nodes)
         m = undirected_dataset_graph.number_of_edges()
         l = 0.0
         u = float(m)
         v1 = set()
-
-        if m == 0:
-            return set(list(graph_nodes)[:1]) if n > 0 else set(), 0.0
+        v1_density = 0.0
 
         smallest_possible_difference = 1.0 / (n * (n - 1)) if n > 1 else 1e-9
         iteration_count = 0
         degrees = dict(undirected_dataset_graph.degree())
-        max_iterations = int(np.ceil(np.log2(m * n * (n - 1)))) + 10 # binary search convergence theory bound
+        max_iterations = int(np.ceil(np.log2(m * n * (n - 1)))) + 10 if m > 0 else 0 # binary search convergence theory bound
+        expected_iterations = max(1, int(np.ceil(np.log2(max(u, 1.0) / smallest_possible_difference))))
+
+        # the compiled path builds the CSR flow network once and only resets the sink capacities
+        self.backend = AcceleratedKernels.backend()
+        compact_graph = CompactGraph.from_networkx(undirected_dataset_graph) if AcceleratedKernels.enabled() else None
+        network = AcceleratedKernels.GoldbergNetwork(compact_graph) if compact_graph is not None else None
 
         while u - l >= smallest_possible_difference and iteration_count < max_iterations:
             iteration_count += 1
             g = (u + l) / 2.0
 
+            if network is not None:
+                source_side = network.min_cut(g)
+                if source_side.any():
+                    l = g
+                    v1 = compact_graph.labels(source_side)
+                    v1_density = AlgorithmStrategy.subgraph_density(undirected_dataset_graph, v1)
+                else:
+                    u = g
+                yield AlgorithmStrategy.progress_report(v1, v1_density, u, min(iteration_count / expected_iterations, 1.0))
+                continue
+
             flow_graph = nx.DiGraph()
             source = 's'
             sink = 't'
@@ -320,9 +514,1061 @@ class GoldbergsMaxDensitySubgraph(AlgorithmStrategy):
                 else:
                     l = g # A subgraph with density >= g exists
                     v1 = S - {source}
+                    v1_density = AlgorithmStrategy.subgraph_density(undirected_dataset_graph, v1)
 
             except nx.NetworkXError:
                 u = g # so that the binary search to get stuck or converge incorrectly so we treat it as "no denser subgraph found"
                 continue
 
-        return v1
\ No newline at end of file
+            yield AlgorithmStrategy.progress_report(v1, v1_density, u, min(iteration_count / expected_iterations, 1.0))
+
+        yield AlgorithmStrategy.progress_report(v1, v1_density, u, 1.0)
+
+
+def _batch_peel_chunk(sources, targets, alive):
+    """Worker step of batch peeling: split an edge chunk into surviving and removed edges.
+
+    Returns the surviving-edge mask and the per-node count of removed edges in the chunk.
+    """
+    removed = ~(alive[sources] & alive[targets])
+    degree_loss = (np.bincount(sources[removed], minlength=len(alive)) +
+                   np.bincount(targets[removed], minlength=len(alive)))
+    return ~removed, degree_loss
+
+class BatchPeelingDensestSubgraph(AlgorithmStrategy):
+    """Bahmani-style (2 + 2ε)-approximate densest subgraph by batch peeling.
+
+    Every pass removes, in one vectorised step, all vertices whose degree is at most
+    2(1 + ε) times the current density, so the peel finishes in O(log n / ε) passes.
+    """
+    accepts_compact = True  # runs on a CompactGraph as well as on a NetworkX graph
+
+    def __init__(self, epsilon=0.1, workers=1, parallel_min_edges=2_000_000, min_size=1):
+        self.algorithm_name = "Batch Peeling (Bahmani)"
+        self.epsilon = epsilon
+        self.min_size = min_size
+        self.workers = workers
+        self.parallel_min_edges = parallel_min_edges
+        self.passes = 0
+
+    def _peel_step(self, sources, targets, alive, executor):
+        if executor is None or len(sources) < self.parallel_min_edges:
+            return _batch_peel_chunk(sources, targets, alive)
+
+        bounds = np.linspace(0, len(sources), self.workers + 1, dtype=np.int64)
+        futures = [executor.submit(_batch_peel_chunk, sources[lo:hi], targets[lo:hi], alive)
+                   for lo, hi in zip(bounds[:-1], bounds[1:])]
+        results = [future.result() for future in futures]
+        return (np.concatenate([keep for keep, _ in results]),
+                np.sum([loss for _, loss in results], axis=0))
+
+    def apply_algorithm(self, undirected_dataset_graph):
+        self.passes = 0
+        if undirected_dataset_graph.number_of_nodes() == 0:
+            return set()
+        return AlgorithmStrategy.run_to_completion(self.iter_algorithm(undirected_dataset_graph))
+
+    def iter_algorithm(self, undirected_dataset_graph):
+        """Yields a progress report after every pass; the largest degree of a removed vertex bounds the optimum."""
+        self.passes = 0
+        if undirected_dataset_graph.number_of_nodes() == 0:
+            yield AlgorithmStrategy.progress_report(set(), 0.0, 0.0, 1.0)
+            return
+        graph = CompactGraph.of(undirected_dataset_graph)
+        sources, targets = graph.sources, graph.targets
+        degrees = graph.degrees.copy()
+        alive = np.ones(graph.num_nodes, dtype=bool)
+        num_alive = graph.num_nodes
+
+        best_density = graph.num_edges / graph.num_nodes
+        best_alive = alive.copy()
+        max_removal_degree = 0
+
+        executor = ProcessPoolExecutor(max_workers=self.workers) if self.workers > 1 else None
+        try:
+            while num_alive > 0:
+                self.passes += 1
+                density = len(sources) / num_alive
+                if density > best_density and num_alive >= self.min_size:
+                    best_density = density
+                    best_alive = alive.copy()
+
+                # the average degree is 2 * density, so at least one vertex is always removed
+                removed = alive & (degrees <= 2 * (1 + self.epsilon) * density)
+                max_removal_degree = max(max_removal_degree, int(degrees[removed].max(initial=0)))
+                alive &= ~removed
+                num_alive -= int(np.count_nonzero(removed))
+
+                keep, degree_loss = self._peel_step(sources, targets, alive, executor)
+                sources, targets = sources[keep], targets[keep]
+                degrees -= degree_loss
+
+                # while vertices remain, none of the densest subgraph may have been removed yet
+                upper_bound = max(max_removal_degree, int(degrees[alive].max(initial=0)) / 2)
+                yield AlgorithmStrategy.progress_report(
+                    graph.labels(best_alive), best_density, float(upper_bound), 1 - num_alive / graph.num_nodes)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+
+class WeightedCharikarsGreedy(AlgorithmStrategy):
+    """Charikar's peeling on edge weights: repeatedly remove the vertex of minimum weighted degree.
+
+    Uses a lazy binary heap over float weighted degrees, so the peel stays O(m log n).
+    """
+    accepts_compact = True
+
+    def __init__(self, weight='weight', min_size=1):
+        self.algorithm_name = "Weighted Charikars Greedy"
+        self.weight = weight
+        self.min_size = min_size
+
+    @staticmethod
+    def peel(graph, priorities=None, min_size=1):
+        """One weighted peel over a CompactGraph.
+
+        Args:
+            graph: CompactGraph with edge weights
+            priorities: Optional per-node offsets added to the weighted degree (Greedy++ loads)
+            min_size: Smallest remaining set considered for the best density
+
+        Returns:
+            (removal order, weighted degree of each node at its removal, best density, number of
+            removals after which the best density was reached)
+        """
+        if graph.num_nodes == 0:
+            return [], np.zeros(0), 0.0, 0
+        degrees = graph.weighted_degrees.copy()
+        offsets = np.zeros(graph.num_nodes) if priorities is None else priorities
+        alive = np.ones(graph.num_nodes, dtype=bool)
+        heap = [(offsets[i] + degrees[i], i) for i in range(graph.num_nodes)]
+        heapq.heapify(heap)
+
+        remaining_weight = graph.total_weight
+        best_density = remaining_weight / graph.num_nodes
+        best_step = 0
+        order = []
+        removal_degrees = np.zeros(graph.num_nodes)
+
+        while heap:
+            key, v = heapq.heappop(heap)
+            if not alive[v] or key != offsets[v] + degrees[v]:
+                continue  # stale entry
+            alive[v] = False
+            order.append(v)
+            removal_degrees[v] = degrees[v]
+            remaining_weight -= degrees[v]
+
+            for u, w in zip(graph.neighbours(v), graph.neighbour_weights(v)):
+                if alive[u]:
+                    degrees[u] -= w
+                    heapq.heappush(heap, (offsets[u] + degrees[u], u))
+
+            num_alive = graph.num_nodes - len(order)
+            if num_alive >= max(min_size, 1) and remaining_weight / num_alive > best_density:
+                best_density = remaining_weight / num_alive
+                best_step = len(order)
+
+        return order, removal_degrees, best_density, best_step
+
+    def apply_algorithm(self, undirected_dataset_graph):
+        if undirected_dataset_graph.number_of_nodes() == 0:
+            return set()
+        return AlgorithmStrategy.run_to_completion(self.iter_algorithm(undirected_dataset_graph))
+
+    def iter_algorithm(self, undirected_dataset_graph):
+        """Yields one final report; the largest weighted degree at removal bounds the optimum."""
+        graph = CompactGraph.of(undirected_dataset_graph, weight=self.weight)
+        order, removal_degrees, density, best_step = WeightedCharikarsGreedy.peel(graph, min_size=self.min_size)
+        yield AlgorithmStrategy.progress_report(
+            graph.labels(order[best_step:]), density, float(removal_degrees.max(initial=0.0)), 1.0)
+
+class WeightedGreedyPlusPlus(AlgorithmStrategy):
+    """Greedy++ on edge weights: iterated weighted peels ordered by load + weighted degree."""
+    accepts_compact = True
+    takes_iterations = True
+
+    def __init__(self, weight='weight', min_size=1):
+        self.algorithm_name = "Weighted Greedy++ (Flowless)"
+        self.weight = weight
+        self.min_size = min_size
+
+    def apply_algorithm(self, undirected_dataset_graph, iterations=10):
+        if undirected_dataset_graph.number_of_nodes() == 0:
+            return set()
+        return AlgorithmStrategy.run_to_completion(self.iter_algorithm(undirected_dataset_graph, iterations))
+
+    def iter_algorithm(self, undirected_dataset_graph, iterations=10):
+        """Yields a progress report after every round; the upper bound is min(first-peel bound, max load / rounds)."""
+        graph = CompactGraph.of(undirected_dataset_graph, weight=self.weight)
+        loads = np.zeros(graph.num_nodes)
+        best_density = -1.0
+        best_nodes = set()
+        upper_bound = float('inf')
+
+        for i in range(iterations):
+            order, removal_degrees, density, best_step = WeightedCharikarsGreedy.peel(graph, loads, self.min_size)
+            loads += removal_degrees
+            if density > best_density:
+                best_density = density
+                best_nodes = graph.labels(order[best_step:])
+
+            if i == 0:
+                upper_bound = float(removal_degrees.max(initial=0.0))
+            upper_bound = min(upper_bound, float(loads.max(initial=0.0)) / (i + 1))
+            yield AlgorithmStrategy.progress_report(best_nodes, best_density, upper_bound, (i + 1) / iterations)
+
+class WeightedGoldbergsMaxDensitySubgraph(AlgorithmStrategy):
+    """Goldberg's exact construction with edge weights as flow capacities and weighted degrees.
+
+    The binary search stops at the gap between distinct densities when all positive weights are
+    integers (exact), and otherwise once u - l is below tolerance times a lower bound on the
+    optimum, so the answer is within a relative tolerance of it. Non-positive weights add
+    nothing to the precision.
+    """
+    def __init__(self, weight='weight', tolerance=1e-6):
+        self.algorithm_name = "Weighted Goldberg's Maximum Density Subgraph"
+        self.weight = weight
+        self.tolerance = tolerance
+
+    def apply_algorithm(self, undirected_dataset_graph):
+        if undirected_dataset_graph.number_of_nodes() == 0:
+            return set()
+        return AlgorithmStrategy.run_to_completion(self.iter_algorithm(undirected_dataset_graph))
+
+    def precision(self, undirected_dataset_graph):
+        """Width of [l, u] at which the binary search stops."""
+        n = undirected_dataset_graph.number_of_nodes()
+        weights = np.array([d.get(self.weight, 1.0) for _, _, d in undirected_dataset_graph.edges(data=True)],
+                           dtype=np.float64)
+        weights = weights[weights > 0]
+        if n > 1 and np.all(weights == np.round(weights)) and weights.max() < 2 ** 53:
+            # densities a / p and b / q with a, b multiples of the gcd differ by at least gcd / (p q)
+            return float(np.gcd.reduce(weights.astype(np.int64))) / (n * (n - 1))
+        # the heaviest edge alone has density max weight / 2, a lower bound on the optimum
+        return self.tolerance * float(weights.max()) / 2
+
+    def iter_algorithm(self, undirected_dataset_graph):
+        """Yields a progress report after every binary-search step, bracketing the optimum by [density of v1, u]."""
+        graph_nodes = undirected_dataset_graph.nodes
+        total_weight = undirected_dataset_graph.size(weight=self.weight)
+        if len(graph_nodes) == 0 or total_weight <= 0:
+            nodes = set(list(graph_nodes)[:1])
+            yield AlgorithmStrategy.progress_report(nodes, 0.0, max(total_weight, 0.0), 1.0)
+            return
+
+        degrees = dict(undirected_dataset_graph.degree(weight=self.weight))
+        smallest_possible_difference = self.precision(undirected_dataset_graph)
+        l = 0.0
+        u = float(total_weight)
+        v1 = set()
+        v1_density = 0.0
+        iteration_count = 0
+        expected_iterations = max(1, int(np.ceil(np.log2(u / smallest_possible_difference))))
+        max_iterations = expected_iterations + 10
+
+        while u - l >= smallest_possible_difference and iteration_count < max_iterations:
+            iteration_count += 1
+            g = (u + l) / 2.0
+
+            flow_graph = nx.DiGraph()
+            source = 's'
+            sink = 't'
+            flow_graph.add_nodes_from([source, sink])
+            flow_graph.add_nodes_from(graph_nodes)
+
+            for u_node, v_node, data in undirected_dataset_graph.edges(data=True):
+                capacity = data.get(self.weight, 1.0)
+                flow_graph.add_edge(u_node, v_node, capacity=capacity)
+                flow_graph.add_edge(v_node, u_node, capacity=capacity)
+
+            for node in graph_nodes:
+                flow_graph.add_edge(source, node, capacity=total_weight)
+                flow_graph.add_edge(node, sink, capacity=total_weight + (2 * g) - degrees[node])
+
+            cut_value, (S, T) = nx.minimum_cut(flow_graph, source, sink)
+            if S == {source}:
+                u = g
+            else:
+                l = g
+                v1 = S - {source}
+                v1_density = AlgorithmStrategy.subgraph_density(undirected_dataset_graph, v1, self.weight)
+
+            yield AlgorithmStrategy.progress_report(v1, v1_density, u, min(iteration_count / expected_iterations, 1.0))
+
+        yield AlgorithmStrategy.progress_report(v1, v1_density, u, 1.0)
+
+class DensityProfile:
+    """Densest-at-least-k answers for every k from a single peel.
+
+    The peel visits one remaining set per size n, n - 1, ..., 1, so the densest set with at
+    least k nodes among them is a running maximum over the first n - k + 1 peel steps.
+    """
+    def __init__(self, graph, order, removal_degrees):
+        """
+        Args:
+            graph: CompactGraph that was peeled
+            order: Node indices in removal order
+            removal_degrees: (Weighted) degree of each node at the time it was removed
+        """
+        self.graph = graph
+        self.order = np.asarray(order, dtype=np.int64)
+        self.removal_degrees = np.asarray(removal_degrees, dtype=np.float64)
+        n = graph.num_nodes
+
+        # remaining weight and density after i removals, i = 0 .. n - 1 (set size n - i)
+        removed_weight = np.concatenate(([0.0], np.cumsum(removal_degrees[self.order])[:-1]))
+        self.sizes = n - np.arange(n)
+        self.densities = (graph.total_weight - removed_weight) / self.sizes
+
+        # sets with at least n - i nodes are those after 0 .. i removals, so both the best density
+        # and the removal count that reaches it are prefix maxima over the peel
+        self.best_densities = np.maximum.accumulate(self.densities)
+        self.best_step = np.maximum.accumulate(
+            np.where(self.densities >= self.best_densities, np.arange(n), 0))
+
+    def best_density(self, k):
+        """Best peel density over sets with at least k nodes."""
+        k = min(max(k, 1), self.graph.num_nodes)
+        return float(self.best_densities[self.graph.num_nodes - k])
+
+    def nodes(self, k):
+        """Node labels of the densest peel set with at least k nodes."""
+        k = min(max(k, 1), self.graph.num_nodes)
+        return self.graph.labels(self.order[self.best_step[self.graph.num_nodes - k]:])
+
+    def as_curve(self):
+        """(k, best density with at least k nodes) for every k, smallest k first."""
+        return list(zip(self.sizes[::-1].tolist(), self.best_densities[::-1].tolist()))
+
+class DensestAtLeastK(AlgorithmStrategy):
+    """Densest subgraph with at least min_size nodes from one heap peel (a 1/3-approximation).
+
+    density_profile() exposes the same peel for every k at once.
+    """
+    accepts_compact = True
+
+    def __init__(self, min_size=1, weight=None):
+        self.algorithm_name = "Densest At Least k (Peeling)"
+        self.min_size = min_size
+        self.weight = weight
+
+    def density_profile(self, undirected_dataset_graph):
+        graph = CompactGraph.of(undirected_dataset_graph, weight=self.weight)
+        order, removal_degrees, _, _ = WeightedCharikarsGreedy.peel(graph)
+        return DensityProfile(graph, order, removal_degrees)
+
+    def apply_algorithm(self, undirected_dataset_graph):
+        if undirected_dataset_graph.number_of_nodes() == 0:
+            return set()
+        return AlgorithmStrategy.run_to_completion(self.iter_algorithm(undirected_dataset_graph))
+
+    def iter_algorithm(self, undirected_dataset_graph):
+        """Yields one final report; the peel's unconstrained bound also bounds the size-constrained optimum."""
+        if undirected_dataset_graph.number_of_nodes() == 0:
+            yield AlgorithmStrategy.progress_report(set(), 0.0, 0.0, 1.0)
+            return
+        profile = self.density_profile(undirected_dataset_graph)
+        yield AlgorithmStrategy.progress_report(
+            profile.nodes(self.min_size), profile.best_density(self.min_size),
+            float(profile.removal_degrees.max(initial=0.0)), 1.0)
+
+class ExactDensestAtLeastK(DensestAtLeastK):
+    """Densest-at-least-k with flow-based refinement of the peeling answer.
+
+    Follows Andersen and Chellapilla: starting from D = {}, repeatedly add the node set H that
+    maximises the marginal density (e(H) + e(H, D)) / |H|, which is one Goldberg search with a
+    per-node bonus e(v, D), until |D| >= k. Sets smaller than k are padded with their best
+    connected neighbours. The densest of these candidates and the peel answer is returned; when
+    the unconstrained densest subgraph already has k nodes this is the exact optimum.
+    """
+    accepts_compact = False  # the flow refinement works on the NetworkX graph
+
+    def __init__(self, min_size=1):
+        super().__init__(min_size)
+        self.algorithm_name = "Densest At Least k (Peeling + Flow Refinement)"
+
+    @staticmethod
+    def _densest_extension(graph, forced):
+        """Find H outside forced maximising (e(H) + e(H, forced)) / |H|.
+
+        Uses Goldberg's cut with a per-node bonus, iterated Dinkelbach style: each cut at the
+        current density g either returns a strictly denser H (which becomes the next g) or
+        proves g optimal, which converges in far fewer cuts than a binary search.
+        """
+        candidates = [v for v in graph.nodes if v not in forced]
+        if not candidates:
+            return set()
+        residual = graph.subgraph(candidates)
+        bonus = {v: sum(1 for u in graph.neighbors(v) if u in forced) for v in candidates}
+        degrees = dict(residual.degree())
+
+        def marginal_density(nodes):
+            return (residual.subgraph(nodes).number_of_edges() + sum(bonus[v] for v in nodes)) / len(nodes)
+
+        best = set(candidates)
+        g = marginal_density(best)
+        big = max(degrees[v] + 2 * bonus[v] for v in candidates) + 1
+
+        while True:
+            flow_graph = nx.DiGraph()
+            flow_graph.add_nodes_from(['s', 't'])
+            for u_node, v_node in residual.edges():
+                flow_graph.add_edge(u_node, v_node, capacity=1)
+                flow_graph.add_edge(v_node, u_node, capacity=1)
+            for v in candidates:
+                flow_graph.add_edge('s', v, capacity=big)
+                flow_graph.add_edge(v, 't', capacity=big + 2 * g - degrees[v] - 2 * bonus[v])
+
+            _, (S, _) = nx.minimum_cut(flow_graph, 's', 't')
+            S = S - {'s'}
+            if not S or marginal_density(S) <= g + 1e-12:
+                return best
+            best = S
+            g = marginal_density(S)
+
+    @staticmethod
+    def _pad(graph, nodes, k):
+        """Grow nodes to k nodes, adding the outside node with most edges into the set each time."""
+        nodes = set(nodes)
+        while len(nodes) < k:
+            frontier = {v for u in nodes for v in graph.neighbors(u) if v not in nodes}
+            if not frontier:
+                frontier = set(graph.nodes) - nodes
+            nodes.add(max(frontier, key=lambda v: (sum(1 for u in graph.neighbors(v) if u in nodes), str(v))))
+        return nodes
+
+    def iter_algorithm(self, undirected_dataset_graph):
+        """Yields the peel answer, then a report after every link of the chain."""
+        k = min(self.min_size, undirected_dataset_graph.number_of_nodes())
+
+        peel_report = next(super().iter_algorithm(undirected_dataset_graph))
+        best_nodes = peel_report['nodes']
+        best_density = AlgorithmStrategy.subgraph_density(undirected_dataset_graph, best_nodes)
+        upper_bound = peel_report['upper_bound']
+        yield AlgorithmStrategy.progress_report(best_nodes, best_density, upper_bound, 0.0 if k > 0 else 1.0)
+
+        chain = set()
+        while len(chain) < k:
+            chain |= ExactDensestAtLeastK._densest_extension(undirected_dataset_graph, chain)
+            candidate = ExactDensestAtLeastK._pad(undirected_dataset_graph, chain, k)
+            density = AlgorithmStrategy.subgraph_density(undirected_dataset_graph, candidate)
+            if density > best_density:
+                best_density = density
+                best_nodes = candidate
+            yield AlgorithmStrategy.progress_report(best_nodes, best_density, upper_bound, min(len(chain) / k, 1.0))
+
+_triangle_worker_arrays = None
+
+
+def _init_triangle_worker(out_indptr, out_indices, edge_keys):
+    """Process pool initializer: receive the orientation once per worker instead of once per range."""
+    global _triangle_worker_arrays
+    _triangle_worker_arrays = (out_indptr, out_indices, edge_keys)
+
+def _triangle_worker_range(start, stop):
+    return _list_triangles_range(*_triangle_worker_arrays, start, stop)
+
+def _list_triangles_range(out_indptr, out_indices, edge_keys, start, stop):
+    """Worker step of triangle listing: the triangles whose lowest-ranked vertex is in nodes [start, stop).
+
+    Out-neighbour lists are sorted by rank, so a wedge v <- u -> w with v listed before w closes a
+    triangle exactly when the oriented edge v -> w exists, which is one searchsorted over edge_keys.
+    """
+    num_nodes = len(out_indptr) - 1
+    out_degrees = np.diff(out_indptr[start:stop + 1])
+    arcs = np.arange(out_indptr[start], out_indptr[stop])
+    # the arc at offset k of a list of length d pairs with the d - 1 - k arcs after it
+    pair_counts = np.repeat(out_indptr[start + 1:stop + 1], out_degrees) - arcs - 1
+    first = np.repeat(arcs, pair_counts)
+    offsets = np.arange(len(first)) - np.repeat(np.cumsum(pair_counts) - pair_counts, pair_counts)
+    second = first + 1 + offsets
+    v, w = out_indices[first], out_indices[second]
+    keys = v * num_nodes + w
+    closed = edge_keys[np.minimum(np.searchsorted(edge_keys, keys), len(edge_keys) - 1)] == keys
+    u = np.repeat(np.repeat(np.arange(start, stop), out_degrees), pair_counts)
+    return np.stack((u[closed], v[closed], w[closed]), axis=1)
+
+class TriangleCounts:
+    """Triangles of an undirected graph with per-node counts and node -> triangle incidence.
+
+    Triangles are listed over the degree-ordered orientation (every edge points to the endpoint of
+    higher (degree, index) rank), where out-degrees are O(sqrt(m)), by vectorised wedge checks over
+    ranges of nodes; ranges are balanced by wedge count and can run on a process pool.
+    Counts are cached per graph object and content (see of()), so strategies on the same dataset
+    share them.
+    DensityProfile accepts a TriangleCounts, with the triangles as the peeled total_weight.
+    """
+
+    # graph -> (version stamp, TriangleCounts); weak, so datasets can be freed
+    _cache = weakref.WeakKeyDictionary()
+
+    def __init__(self, graph, triangles):
+        """
+        Args:
+            graph: CompactGraph the triangles belong to
+            triangles: (t, 3) array of node index triples
+        """
+        self.graph = graph
+        self.triangles = triangles
+        self.num_nodes = graph.num_nodes
+        self.total_weight = float(len(triangles))
+        self.counts = np.bincount(triangles.ravel(), minlength=graph.num_nodes).astype(np.int64)
+        order = np.argsort(triangles.ravel(), kind='stable')
+        self.incidence = order // 3  # triangles of node i: incidence[indptr[i]:indptr[i + 1]]
+        self.indptr = np.zeros(graph.num_nodes + 1, dtype=np.int64)
+        np.cumsum(self.counts, out=self.indptr[1:])
+
+    def labels(self, indices):
+        return self.graph.labels(indices)
+
+    @staticmethod
+    def orientation(graph):
+        """(out_indptr, out_indices sorted by rank, sorted keys u * n + v of the oriented edges)."""
+        n = graph.num_nodes
+        rank = np.empty(n, dtype=np.int64)
+        rank[np.lexsort((np.arange(n), graph.degrees))] = np.arange(n)
+        forward = rank[graph.sources] < rank[graph.targets]
+        tails = np.where(forward, graph.sources, graph.targets)
+        heads = np.where(forward, graph.targets, graph.sources)
+        order = np.lexsort((rank[heads], tails))
+        out_indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(tails, minlength=n), out=out_indptr[1:])
+        return out_indptr, heads[order], np.sort(tails * n + heads)
+
+    @staticmethod
+    def node_ranges(out_indptr, parts, max_wedges):
+        """Split the nodes into at least parts ranges of about equal wedge count, each below max_wedges."""
+        out_degrees = np.diff(out_indptr)
+        wedges = np.cumsum(out_degrees * (out_degrees - 1) // 2)
+        total = int(wedges[-1]) if len(wedges) else 0
+        parts = max(parts, -(-total // max_wedges), 1)
+        bounds = np.searchsorted(wedges, np.linspace(0, total, parts + 1)[1:-1], side='right')
+        bounds = np.unique(np.concatenate(([0], bounds, [len(out_degrees)])))
+        return list(zip(bounds[:-1].tolist(), bounds[1:].tolist()))
+
+    @staticmethod
+    def count(graph, workers=1, max_wedges=4_000_000):
+        """
+        List the triangles of a CompactGraph.
+
+        Args:
+            graph: CompactGraph
+            workers: Processes listing node ranges in parallel (1 lists them in this process)
+            max_wedges: Wedges checked per range, bounding the memory of one vectorised step
+        """
+        out_indptr, out_indices, edge_keys = TriangleCounts.orientation(graph)
+        ranges = TriangleCounts.node_ranges(out_indptr, workers, max_wedges)
+        if workers > 1 and len(ranges) > 1:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_triangle_worker,
+                                     initargs=(out_indptr, out_indices, edge_keys)) as executor:
+                chunks = list(executor.map(_triangle_worker_range, *zip(*ranges)))
+        else:
+            chunks = [_list_triangles_range(out_indptr, out_indices, edge_keys, start, stop) for start, stop in ranges]
+        triangles = np.concatenate(chunks) if chunks else np.zeros((0, 3), dtype=np.int64)
+        return TriangleCounts(graph, triangles)
+
+    @staticmethod
+    def version(graph):
+        """Version stamp of a CompactGraph's content: its node labels and edge arrays."""
+        digest = hashlib.blake2b(graph.sources.tobytes(), digest_size=16)
+        digest.update(graph.targets.tobytes())
+        return hash(tuple(graph.node_labels)), digest.digest()
+
+    @staticmethod
+    def of(undirected_dataset_graph, workers=1):
+        """Cached TriangleCounts of a NetworkX graph; recounted when its content changed.
+
+        The stamp covers every edge, so edge swaps that keep the node and edge counts are seen
+        too; building and hashing the CompactGraph costs about half of a recount.
+
+        Returns:
+            (TriangleCounts, whether it came from the cache)
+        """
+        if isinstance(undirected_dataset_graph, CompactGraph):
+            # the counts keep a reference to their CompactGraph, so it cannot be a weak cache key
+            return TriangleCounts.count(undirected_dataset_graph, workers), False
+        graph = CompactGraph.from_networkx(undirected_dataset_graph)
+        stamp = TriangleCounts.version(graph)
+        cached = TriangleCounts._cache.get(undirected_dataset_graph)
+        if cached is not None and cached[0] == stamp:
+            return cached[1], True
+        counts = TriangleCounts.count(graph, workers)
+        TriangleCounts._cache[undirected_dataset_graph] = (stamp, counts)
+        return counts, False
+
+    def peel(self, offsets=None):
+        """
+        Peel by triangle counts: repeatedly remove the node in the fewest remaining triangles.
+
+        Args:
+            offsets: Optional per-node integer offsets added to the counts (Greedy++ loads)
+
+        Returns:
+            (node indices in removal order, remaining triangles of each node at its removal)
+        """
+        n = self.num_nodes
+        counts = self.counts.tolist()
+        offsets = [0] * n if offsets is None else [int(offset) for offset in offsets]
+        heap = IndexedDaryHeap.from_keys([offsets[v] + counts[v] for v in range(n)])
+        triangles = self.triangles.tolist()
+        incidence, indptr = self.incidence.tolist(), self.indptr.tolist()
+        alive_triangles = bytearray(b"\x01") * len(triangles)
+        order = []
+        removal_counts = np.zeros(n, dtype=np.int64)
+
+        while heap:
+            v, _ = heap.pop()
+            order.append(v)
+            removal_counts[v] = counts[v]
+            for t in incidence[indptr[v]:indptr[v + 1]]:
+                if alive_triangles[t]:
+                    alive_triangles[t] = 0
+                    for u in triangles[t]:
+                        if u != v:
+                            counts[u] -= 1
+                            heap.decrease_key(u, offsets[u] + counts[u])
+        return order, removal_counts
+
+class TriangleDensestGreedy(AlgorithmStrategy):
+    """Triangle-densest subgraph (k-clique densest for k = 3) by peeling on triangle counts.
+
+    Maximises triangles per node instead of edges per node, which favours tightly knit communities
+    over large sparse ones; the peel is a 1/3-approximation. Reported bounds are in triangle density
+    (objective = "triangle"), so the evaluator does not certify edge density with them.
+    """
+    objective = "triangle"
+    accepts_compact = True
+
+    def __init__(self, min_size=1, workers=1):
+        self.algorithm_name = "Triangle-Densest Greedy Peeling"
+        self.min_size = min_size
+        self.workers = workers  # processes counting triangles
+        self.metrics = {}
+
+    def apply_algorithm(self, undirected_dataset_graph):
+        if undirected_dataset_graph.number_of_nodes() == 0:
+            return set()
+        return AlgorithmStrategy.run_to_completion(self.iter_algorithm(undirected_dataset_graph))
+
+    def triangle_counts(self, undirected_dataset_graph):
+        start_time = time.perf_counter()
+        triangles, cached = TriangleCounts.of(undirected_dataset_graph, self.workers)
+        self.metrics = {
+            'triangles': len(triangles.triangles),
+            'triangle_counts_cached': cached,
+            'triangle_counting_time': time.perf_counter() - start_time
+        }
+        return triangles
+
+    def iter_algorithm(self, undirected_dataset_graph):
+        """Yields one final report; the largest triangle count at removal bounds the optimum."""
+        if undirected_dataset_graph.number_of_nodes() == 0:
+            yield AlgorithmStrategy.progress_report(set(), 0.0, 0.0, 1.0)
+            return
+        triangles = self.triangle_counts(undirected_dataset_graph)
+        order, removal_counts = triangles.peel()
+        profile = DensityProfile(triangles, order, removal_counts)
+        self.metrics['triangle_density'] = profile.best_density(self.min_size)
+        yield AlgorithmStrategy.progress_report(profile.nodes(self.min_size), profile.best_density(self.min_size),
+                                                float(removal_counts.max(initial=0)), 1.0)
+
+    def get_strategy_metrics(self):
+        return dict(self.metrics)
+
+class TriangleDensestGreedyPlusPlus(TriangleDensestGreedy):
+    """Greedy++ on triangle counts: every round peels by load + remaining triangles, then adds each
+    node's count at removal to its load, converging to the triangle-densest subgraph."""
+    takes_iterations = True
+
+    def __init__(self, min_size=1, workers=1):
+        super().__init__(min_size, workers)
+        self.algorithm_name = "Triangle-Densest Greedy++"
+
+    def apply_algorithm(self, undirected_dataset_graph, iterations=10):
+        if undirected_dataset_graph.number_of_nodes() == 0:
+            return set()
+        return AlgorithmStrategy.run_to_completion(self.iter_algorithm(undirected_dataset_graph, iterations))
+
+    def iter_algorithm(self, undirected_dataset_graph, iterations=10):
+        """Yields a report after every round; the upper bound is min(first-peel bound, max load / rounds)."""
+        if undirected_dataset_graph.number_of_nodes() == 0:
+            yield AlgorithmStrategy.progress_report(set(), 0.0, 0.0, 1.0)
+            return
+        triangles = self.triangle_counts(undirected_dataset_graph)
+        loads = np.zeros(triangles.num_nodes, dtype=np.int64)
+        best_nodes, best_density = set(), -1.0
+        upper_bound = float('inf')
+        rounds = max(iterations, 1)
+
+        for i in range(rounds):
+            order, removal_counts = triangles.peel(loads)
+            loads += removal_counts
+            profile = DensityProfile(triangles, order, removal_counts)
+            if profile.best_density(self.min_size) > best_density:
+                best_density = profile.best_density(self.min_size)
+                best_nodes = profile.nodes(self.min_size)
+            # every round assigns each triangle to one of its nodes, so max load / rounds bounds the optimum
+            if i == 0:
+                upper_bound = float(removal_counts.max(initial=0))
+            upper_bound = min(upper_bound, loads.max(initial=0) / (i + 1))
+            self.metrics['triangle_density'] = best_density
+            yield AlgorithmStrategy.progress_report(best_nodes, best_density, upper_bound, (i + 1) / rounds)
+
+class EdgeSamplingSketch(AlgorithmStrategy):
+    """Approximate densest subgraph from a uniform edge sample, for graphs too large to hold.
+
+    Edges are streamed (from an edge list file or a NetworkX graph) and each is kept with
+    probability p; the solver runs on the sample only, so memory scales with p * m. If the
+    densest sample subgraph has at least SAMPLING_CONSTANT * ln(n / delta) / epsilon^2 sampled
+    edges per node, every subgraph's density is preserved within (1 ± epsilon) after rescaling
+    by 1 / p with probability 1 - delta. p starts from a sample budget and is raised until that
+    holds; each edge draws one fixed uniform number, so every larger sample contains the smaller
+    one. A final pass counts the candidate's true edges, so the returned density is exact.
+    """
+    SAMPLING_CONSTANT = 3.0
+
+    def __init__(self, epsilon=0.1, delta=0.05, initial_sample_edges=100_000, solver=None, seed=42):
+        """
+        Args:
+            epsilon: Target relative error of sampled densities
+            delta: Allowed failure probability of the error bound
+            initial_sample_edges: Expected size of the first sample
+            solver: AlgorithmStrategy run on the sample (defaults to CharikarsGreedyMinHeap)
+            seed: Seed for the per-edge uniform numbers
+        """
+        self.algorithm_name = "Edge Sampling Sketch"
+        self.epsilon = epsilon
+        self.delta = delta
+        self.initial_sample_edges = initial_sample_edges
+        self.solver = solver if solver is not None else CharikarsGreedyMinHeap()
+        self.seed = seed
+        self.metrics = {}
+
+    @staticmethod
+    def _edge_stream(source):
+        if isinstance(source, str):
+            return GraphLoader.stream_edges(source)
+        return source.edges()
+
+    def _sample(self, source, p):
+        """One streaming pass keeping every edge whose fixed uniform number is below p."""
+        rng = random.Random(self.seed)
+        sample = nx.Graph()
+        for u, v in EdgeSamplingSketch._edge_stream(source):
+            if rng.random() < p and u != v:
+                sample.add_edge(u, v)
+        return sample
+
+    @staticmethod
+    def _count_internal_edges(source, nodes):
+        """Streaming pass counting distinct edges with both ends in nodes."""
+        internal = set()
+        for u, v in EdgeSamplingSketch._edge_stream(source):
+            if u != v and u in nodes and v in nodes:
+                internal.add((u, v) if u <= v else (v, u))
+        return len(internal)
+
+    def apply_algorithm(self, undirected_dataset_graph):
+        """
+        Args:
+            undirected_dataset_graph: Undirected NetworkX graph, or path to an edge list file to stream
+
+        Returns:
+            Node set of the candidate densest subgraph
+        """
+        source = undirected_dataset_graph
+        if isinstance(source, str):
+            num_edges = sum(1 for _ in GraphLoader.stream_edges(source))
+            passes = 1
+        else:
+            num_edges = source.number_of_edges()
+            passes = 0
+        self.metrics = {}
+        if num_edges == 0:
+            return set()
+
+        # n <= 2m, so ln(2m / delta) bounds the union-bound term without storing the node set
+        required = EdgeSamplingSketch.SAMPLING_CONSTANT * float(np.log(2 * num_edges / self.delta)) / self.epsilon ** 2
+        p = min(1.0, self.initial_sample_edges / num_edges)
+
+        while True:
+            sample = self._sample(source, p)
+            passes += 1
+            nodes = self.solver.apply_algorithm(sample) if sample.number_of_edges() > 0 else set()
+            if isinstance(nodes, tuple):  # strategies return (set(), 0.0) on empty input
+                nodes = nodes[0]
+            sample_density = AlgorithmStrategy.subgraph_density(sample, nodes)
+            if sample_density >= required or p >= 1.0:
+                break
+            # aim straight for the required sampled density, at least doubling p
+            growth = 2.0 if sample_density == 0 else max(2.0, 1.1 * required / sample_density)
+            p = min(1.0, p * growth)
+
+        verified_density = EdgeSamplingSketch._count_internal_edges(source, set(nodes)) / len(nodes) if nodes else 0.0
+        passes += 1
+
+        # achieved error: the epsilon for which the found sampled density would just meet the requirement
+        if p >= 1.0:
+            error_bound = 0.0
+        elif sample_density > 0:
+            error_bound = self.epsilon * float(np.sqrt(required / sample_density))
+        else:
+            error_bound = float('inf')
+        # the sample's max core number bounds its optimum, so rescaling it bounds the true optimum
+        max_core = max(nx.core_number(sample).values(), default=0)
+        if p >= 1.0:
+            upper_bound = float(max_core)
+        elif error_bound < 1.0:
+            upper_bound = max_core / (p * (1 - error_bound))
+        else:
+            upper_bound = float('inf')
+
+        self.metrics = {
+            'sketch_sampling_probability': p,
+            'sketch_sample_edges': sample.number_of_edges(),
+            'sketch_passes': passes,
+            'sketch_estimated_density': sample_density / p,
+            'sketch_verified_density': verified_density,
+            'sketch_error_bound': error_bound,
+            'sketch_confidence': 1.0 if p >= 1.0 else 1 - self.delta,
+            'sketch_density_upper_bound': upper_bound
+        }
+        return set(nodes)
+
+    def get_strategy_metrics(self):
+        return dict(self.metrics)
+
+class DirectedDensestSubgraphStrategy(AlgorithmStrategy):
+    """Shared plumbing for directed densest subgraph strategies.
+
+    apply_algorithm accepts a NetworkX DiGraph (an undirected graph is read as arcs in both
+    directions) or a CompactDirectedGraph from GraphLoader.load_directed_arrays. It returns
+    S | T so results stay comparable with the undirected strategies; the pair itself is kept
+    in source_nodes / target_nodes and its density |E(S, T)| / sqrt(|S| |T|) in directed_density.
+    """
+    def __init__(self, epsilon):
+        self.epsilon = epsilon
+        self.source_nodes = set()
+        self.target_nodes = set()
+        self.directed_density = 0.0
+
+    def ratio_grid(self, graph, density_lower_bound=0.0):
+        """Geometric grid of candidate ratios c = |S| / |T| with step (1 + epsilon).
+
+        Any pair denser than rho satisfies rho <= max_out * sqrt(c) and rho <= max_in / sqrt(c),
+        so a known lower bound rho narrows the grid from [1/n, n] to [(rho / max_out)^2, (max_in / rho)^2].
+        """
+        low, high = 1.0 / max(graph.num_nodes, 2), float(max(graph.num_nodes, 2))
+        if density_lower_bound > 0:
+            low = max(low, (density_lower_bound / graph.out_degrees.max()) ** 2)
+            high = min(high, (graph.in_degrees.max() / density_lower_bound) ** 2)
+        first = int(np.floor(np.log(low) / np.log1p(self.epsilon)))
+        last = int(np.ceil(np.log(high) / np.log1p(self.epsilon)))
+        return (1 + self.epsilon) ** np.arange(first, last + 1)
+
+    @staticmethod
+    def pair_density(graph, in_source, in_target):
+        """Directed density of the pair given as boolean masks over a CompactDirectedGraph."""
+        num_sources, num_targets = np.count_nonzero(in_source), np.count_nonzero(in_target)
+        if num_sources == 0 or num_targets == 0:
+            return 0.0
+        num_edges = np.count_nonzero(in_source[graph.sources] & in_target[graph.targets])
+        return num_edges / np.sqrt(num_sources * num_targets)
+
+    def _store_result(self, graph, in_source, in_target):
+        self.source_nodes = graph.labels(in_source)
+        self.target_nodes = graph.labels(in_target)
+        self.directed_density = DirectedDensestSubgraphStrategy.pair_density(graph, in_source, in_target)
+        return self.source_nodes | self.target_nodes
+
+    @staticmethod
+    def _compact(directed_dataset_graph):
+        if isinstance(directed_dataset_graph, CompactDirectedGraph):
+            return directed_dataset_graph
+        return CompactDirectedGraph.from_networkx(directed_dataset_graph)
+
+class DirectedCharikarsGreedy(DirectedDensestSubgraphStrategy):
+    """Charikar's greedy peeling for directed density over a geometric grid of ratios c = |S| / |T|.
+
+    For a fixed c the peel repeatedly removes either the S-vertex with the fewest arcs into T or the
+    T-vertex with the fewest arcs from S, whichever loses fewer arcs per unit of the c-weighted size
+    (remove i from S when c * out(i) <= in(j)). Trying O(log n / epsilon) ratios instead of all
+    O(n^2) values of |S| / |T| keeps the 2-approximation up to a (1 + epsilon) factor.
+    """
+    def __init__(self, epsilon=0.5):
+        super().__init__(epsilon)
+        self.algorithm_name = "Directed Charikars Greedy (Ratio Grid)"
+
+    @staticmethod
+    def _peel(graph, c):
+        n = graph.num_nodes
+        out_degrees = graph.out_degrees.copy()
+        in_degrees = graph.in_degrees.copy()
+        in_source = np.ones(n, dtype=bool)
+        in_target = np.ones(n, dtype=bool)
+        num_sources = num_targets = n
+        num_edges = graph.num_edges
+
+        source_heap = [(int(d), i) for i, d in enumerate(out_degrees)]
+        target_heap = [(int(d), i) for i, d in enumerate(in_degrees)]
+        heapq.heapify(source_heap)
+        heapq.heapify(target_heap)
+
+        best_density = num_edges / np.sqrt(num_sources * num_targets)
+        best_step = 0
+        removals = []  # (is_source, node) in peel order, replayed to rebuild the best pair
+
+        while num_sources > 0 and num_targets > 0:
+            # drop stale heap entries
+            while source_heap and (not in_source[source_heap[0][1]] or source_heap[0][0] != out_degrees[source_heap[0][1]]):
+                heapq.heappop(source_heap)
+            while target_heap and (not in_target[target_heap[0][1]] or target_heap[0][0] != in_degrees[target_heap[0][1]]):
+                heapq.heappop(target_heap)
+
+            min_out, i = source_heap[0]
+            min_in, j = target_heap[0]
+            if c * min_out <= min_in:
+                heapq.heappop(source_heap)
+                in_source[i] = False
+                num_sources -= 1
+                num_edges -= min_out
+                for v in graph.out_neighbours(i):
+                    if in_target[v]:
+                        in_degrees[v] -= 1
+                        heapq.heappush(target_heap, (int(in_degrees[v]), int(v)))
+                removals.append((True, i))
+            else:
+                heapq.heappop(target_heap)
+                in_target[j] = False
+                num_targets -= 1
+                num_edges -= min_in
+                for u in graph.in_neighbours(j):
+                    if in_source[u]:
+                        out_degrees[u] -= 1
+                        heapq.heappush(source_heap, (int(out_degrees[u]), int(u)))
+                removals.append((False, j))
+
+            if num_sources > 0 and num_targets > 0:
+                density = num_edges / np.sqrt(num_sources * num_targets)
+                if density > best_density:
+                    best_density = density
+                    best_step = len(removals)
+
+        in_source = np.ones(n, dtype=bool)
+        in_target = np.ones(n, dtype=bool)
+        for is_source, node in removals[:best_step]:
+            (in_source if is_source else in_target)[node] = False
+        return best_density, in_source, in_target
+
+    def apply_algorithm(self, directed_dataset_graph):
+        graph = DirectedDensestSubgraphStrategy._compact(directed_dataset_graph)
+        if graph.num_edges == 0:
+            return set()
+
+        best = (-1.0, None, None)
+        for c in self.ratio_grid(graph):
+            result = DirectedCharikarsGreedy._peel(graph, c)
+            if result[0] > best[0]:
+                best = result
+
+        return self._store_result(graph, best[1], best[2])
+
+class DirectedGoldbergApprox(DirectedDensestSubgraphStrategy):
+    """Flow-based directed densest subgraph, optimal up to the ratio grid's (1 + epsilon^2 / 8) factor.
+
+    By AM-GM, sqrt(|S| |T|) <= (|S| / sqrt(c) + sqrt(c) |T|) / 2 with equality when |S| / |T| = c,
+    so for every c the optimum of |E(S, T)| - a|S| - b|T| with a = g / (2 sqrt(c)), b = g sqrt(c) / 2
+    being positive certifies density >= g. That objective is a min-cut on 2n + 2 nodes (an S-copy
+    and a T-copy per vertex, unit arcs u_S -> v_T). Ratios come from a geometric grid, and the
+    ratio of the best pair is searched again at the end; a grid step of (1 + epsilon) costs at most
+    a (1 + epsilon^2 / 8) factor (under 1% for the default), so the result is approximate unlike
+    the undirected GoldbergsMaxDensitySubgraph. Ratios that cannot beat the incumbent are rejected
+    with a single cut.
+    """
+    def __init__(self, epsilon=0.25, tolerance=1e-4):
+        super().__init__(epsilon)
+        self.algorithm_name = f"Directed Goldberg (Flow, Ratio Grid, ε={epsilon:g})"
+        self.tolerance = tolerance
+
+    @staticmethod
+    def _denser_pair_exists(graph, c, g):
+        """Min-cut test for some (S, T) with |E(S, T)| - a|S| - b|T| > 0; returns the pair masks or None."""
+        n = graph.num_nodes
+        a = g / (2 * np.sqrt(c))
+        b = g * np.sqrt(c) / 2
+        source, sink = 2 * n, 2 * n + 1
+
+        flow_graph = nx.DiGraph()
+        flow_graph.add_nodes_from(range(2 * n + 2))
+        flow_graph.add_edges_from(zip(graph.sources.tolist(), (graph.targets + n).tolist()), capacity=1)
+        constant = 0.0
+        for u in range(n):
+            surplus = graph.out_degrees[u] - a
+            if surplus > 0:
+                flow_graph.add_edge(source, u, capacity=float(surplus))
+                constant -= surplus
+            elif surplus < 0:
+                flow_graph.add_edge(u, sink, capacity=float(-surplus))
+            if graph.in_degrees[u] > 0:
+                flow_graph.add_edge(u + n, sink, capacity=float(b))
+
+        cut_value, (source_side, _) = nx.minimum_cut(flow_graph, source, sink)
+        if constant + cut_value >= -1e-9 * max(1.0, -constant):
+            return None
+        in_source = np.zeros(n, dtype=bool)
+        in_target = np.zeros(n, dtype=bool)
+        for node in source_side:
+            if node < n:
+                in_source[node] = True
+            elif node < 2 * n:
+                in_target[node - n] = True
+        # guard against floating point noise in the cut value: a genuine pair is strictly denser than g
+        if DirectedDensestSubgraphStrategy.pair_density(graph, in_source, in_target) <= g:
+            return None
+        return in_source, in_target
+
+    def _search_ratio(self, graph, c, best):
+        """Binary search the best density for ratio c, returning the improved incumbent (density, S mask, T mask)."""
+        # a single cut decides whether ratio c can beat the incumbent at all
+        low = best[0] * (1 + self.tolerance)
+        high = float(np.sqrt(graph.num_edges)) + 1.0  # the directed density never exceeds sqrt(m)
+        pair = DirectedGoldbergApprox._denser_pair_exists(graph, c, low)
+
+        while pair is not None:
+            density = DirectedDensestSubgraphStrategy.pair_density(graph, *pair)
+            if density > best[0]:
+                best = (density, pair[0], pair[1])
+            low = max(low, density)
+
+            pair = None
+            while pair is None and high - low > self.tolerance * max(low, 1.0):
+                g = (low + high) / 2.0
+                pair = DirectedGoldbergApprox._denser_pair_exists(graph, c, g)
+                if pair is None:
+                    high = g
+        return best
+
+    def apply_algorithm(self, directed_dataset_graph):
+        graph = DirectedDensestSubgraphStrategy._compact(directed_dataset_graph)
+        if graph.num_edges == 0:
+            return set()
+
+        # start from the greedy pair so most ratios are rejected by a single cut
+        greedy = DirectedCharikarsGreedy(epsilon=max(self.epsilon, 0.5))
+        greedy.apply_algorithm(graph)
+        index = {label: i for i, label in enumerate(graph.node_labels)}
+        in_source = np.zeros(graph.num_nodes, dtype=bool)
+        in_target = np.zeros(graph.num_nodes, dtype=bool)
+        in_source[[index[v] for v in greedy.source_nodes]] = True
+        in_target[[index[v] for v in greedy.target_nodes]] = True
+        best = (greedy.directed_density, in_source, in_target)
+
+        for c in self.ratio_grid(graph, best[0]):
+            best = self._search_ratio(graph, c, best)
+
+        best_ratio = np.count_nonzero(best[1]) / np.count_nonzero(best[2])
+        best = self._search_ratio(graph, best_ratio, best)
+
+        return self._store_result(graph, best[1], best[2])
@@ -0,0 +1,383 @@
+import contextlib
+import inspect
+import io
+import itertools
+import json
+import multiprocessing
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import datetime
+from multiprocessing import shared_memory
+
+import networkx as nx
+import numpy as np
+
+import AlgorithmStrategy
+from CompactGraph import CompactGraph
+from DatasetsService import DatasetsService
+from GraphLoader import GraphLoader
+
+
+class SharedGraph:
+    """Publishes a graph's edge arrays in shared memory so worker processes can read them without copies.
+
+    Only the arrays live in shared memory; handle() returns a small picklable description that
+    workers pass to attach() to map the same buffers as a CompactGraph.
+    """
+
+    def __init__(self, dataset_name, graph):
+        weight = 'weight' if graph.graph.get('weighted') else None
+        compact = CompactGraph.from_networkx(graph, weight=weight)
+        arrays = {
+            'node_labels': np.asarray(compact.node_labels, dtype=np.int64),
+            'sources': compact.sources,
+            'targets': compact.targets,
+            'weights': compact.weights
+        }
+        self.dataset_name = dataset_name
+        self.weighted = weight is not None
+        self.blocks = {}
+        self.layout = {}
+        for key, array in arrays.items():
+            block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[:] = array
+            self.blocks[key] = block
+            self.layout[key] = (block.name, array.dtype.str, array.shape)
+
+    def handle(self):
+        return {'dataset': self.dataset_name, 'weighted': self.weighted, 'arrays': self.layout}
+
+    def release(self):
+        for block in self.blocks.values():
+            block.close()
+            block.unlink()
+        self.blocks = {}
+
+    @staticmethod
+    def attach(handle):
+        """Wrap the shared arrays in a CompactGraph; the edge and weight arrays are read in place.
+
+        Returns:
+            (CompactGraph, the attached SharedMemory blocks, which must stay open while it is in use)
+        """
+        blocks = {key: shared_memory.SharedMemory(name=name) for key, (name, _, _) in handle['arrays'].items()}
+        try:
+            arrays = {key: np.ndarray(shape, dtype=np.dtype(dtype), buffer=blocks[key].buf)
+                      for key, (_, dtype, shape) in handle['arrays'].items()}
+            graph = CompactGraph(arrays['node_labels'].tolist(), arrays['sources'], arrays['targets'],
+                                 arrays['weights'] if handle['weighted'] else None)
+            graph.graph['weighted'] = handle['weighted']
+        except Exception:
+            for block in blocks.values():
+                block.close()
+            raise
+        return graph, blocks
+
+    @staticmethod
+    def to_networkx(compact_graph):
+        """NetworkX graph of an attached CompactGraph, for strategies that do not run on CSR arrays."""
+        labels = compact_graph.node_labels
+        graph = nx.Graph()
+        graph.add_nodes_from(labels)
+        if compact_graph.weighted:
+            graph.add_weighted_edges_from(zip((labels[i] for i in compact_graph.sources),
+                                              (labels[i] for i in compact_graph.targets),
+                                              compact_graph.weights.tolist()))
+        else:
+            graph.add_edges_from(zip((labels[i] for i in compact_graph.sources),
+                                     (labels[i] for i in compact_graph.targets)))
+        graph.graph['weighted'] = compact_graph.graph['weighted']
+        return graph
+
+
+# datasets attached by this worker process: name -> {'key', 'compact', 'networkx', 'blocks'}; jobs of
+# several datasets interleave, so each stays attached until the runner releases its shared memory
+_worker_graphs = {}
+
+
+def _detach(entry):
+    entry['compact'] = entry['networkx'] = None  # views must go before their buffers are closed
+    for block in entry['blocks'].values():
+        try:
+            block.close()
+        except BufferError:
+            pass  # a view is still referenced; the mapping is closed when it is collected
+
+
+def _detach_released():
+    """Detach datasets whose shared memory the runner unlinked, which it does once all their jobs are done."""
+    for dataset_name, entry in list(_worker_graphs.items()):
+        try:
+            shared_memory.SharedMemory(name=entry['key']).close()
+        except FileNotFoundError:
+            _detach(_worker_graphs.pop(dataset_name))
+
+
+def _worker_graph(handle, networkx=True):
+    """The attached graph of a dataset: its CompactGraph, or (built once, on demand) its NetworkX graph."""
+    key = handle['arrays']['sources'][0]
+    entry = _worker_graphs.get(handle['dataset'])
+    if entry is None or entry['key'] != key:
+        if entry is not None:
+            _detach(entry)
+        _detach_released()
+        compact, blocks = SharedGraph.attach(handle)
+        entry = {'key': key, 'compact': compact, 'networkx': None, 'blocks': blocks}
+        _worker_graphs[handle['dataset']] = entry
+    if not networkx:
+        return entry['compact']
+    if entry['networkx'] is None:
+        entry['networkx'] = SharedGraph.to_networkx(entry['compact'])
+    return entry['networkx']
+
+
+def _run_reference_job(handle):
+    """Exact densest subgraph of a dataset, shared by all of its strategy jobs."""
+    graph = _worker_graph(handle)
+    if handle['weighted']:
+        solver = AlgorithmStrategy.WeightedGoldbergsMaxDensitySubgraph()
+    else:
+        solver = AlgorithmStrategy.GoldbergsMaxDensitySubgraph()
+    start_time = time.perf_counter()
+    nodes = solver.apply_algorithm(graph)
+    if isinstance(nodes, tuple):  # strategies return (set(), 0.0) on empty input
+        nodes = nodes[0]
+    return set(nodes), time.perf_counter() - start_time
+
+
+def _run_strategy_job(handle, job, reference_nodes, gap_tolerance):
+    """Evaluate one (strategy, parameters, repeat) job and return its metrics row."""
+    from AlgorithmEvaluator import AlgorithmEvaluator
+
+    strategy = getattr(AlgorithmStrategy, job['strategy'])(**job['parameters'])
+    # CSR-capable strategies run on the shared arrays; without reference nodes the evaluator may
+    # need the exact solver, which works on the NetworkX graph
+    compact = getattr(strategy, 'accepts_compact', False) and reference_nodes is not None
+    graph = _worker_graph(handle, networkx=not compact)
+    evaluator = AlgorithmEvaluator(strategy, graph, gap_tolerance, reference_nodes, job['time_budget'])
+    with contextlib.redirect_stdout(io.StringIO()):
+        evaluator.evaluate_algorithm(strategy, iterations=job['iterations'])
+
+    row = dict(job)
+    row.update(evaluator.get_metrics_dict())
+    row['memory_profile'] = evaluator.memory_profile
+    row['worker_pid'] = os.getpid()
+    return row
+
+
+class BatchExperimentRunner:
+    """Runs an experiment spec (datasets x strategies x parameter grid x repeats) unattended on a process pool.
+
+    The spec is a JSON file:
+
+        {
+          "name": "nightly",
+          "datasets": ["Hamsterster", {"name": "Custom", "path": "datasets/custom.txt", "weighted": false}],
+          "strategies": [
+            {"class": "CharikarsGreedyMinHeap"},
+            {"class": "GreedyPlusPlusPriorityQueue", "grid": {"iterations": [5, 10]}},
+            {"class": "BatchPeelingDensestSubgraph", "grid": {"epsilon": [0.05, 0.1, 0.2]}}
+          ],
+          "repeats": 3,
+          "time_budget": 600,
+          "reference": "exact",
+          "gap_tolerance": 0.0,
+          "workers": 0,
+          "output_folder": "experiment_results/batch"
+        }
+
+    Grid keys are constructor arguments of the strategy class, except "iterations", which is passed
+    to Greedy++ runs. With "reference": "exact" one exact job per dataset is planned before its
+    strategy jobs, whose accuracy is then measured against it. With "certified", every evaluation
+    decides by its own certified gap whether the exact solver is needed. "workers": 0 uses every core.
+
+    Each dataset is loaded once in the runner, published through SharedGraph and released as soon
+    as its last job finishes. Datasets are loaded one after another: the next one when the pool has
+    an idle worker or when the previous dataset's reference job completes, so only a few are
+    resident at a time. Jobs dropped with a failed dataset load or reference job get an error row. Workers run strategies with accepts_compact directly on a CompactGraph
+    over the shared arrays (when an exact reference is available) and build a NetworkX graph only
+    for the others. Results are appended to results.jsonl as jobs complete.
+    """
+
+    def __init__(self, spec):
+        """
+        Args:
+            spec: Experiment spec dict (see the class docstring) or path to a JSON spec file
+        """
+        if isinstance(spec, str):
+            with open(spec, 'r') as spec_file:
+                spec = json.load(spec_file)
+        self.spec = spec
+        self.name = spec.get('name', 'experiment')
+        self.repeats = spec.get('repeats', 1)
+        self.time_budget = spec.get('time_budget')
+        self.reference = spec.get('reference', 'exact')
+        self.gap_tolerance = spec.get('gap_tolerance', 0.0)
+        self.workers = spec.get('workers', 0) or os.cpu_count()
+        self.output_folder = spec.get('output_folder', os.path.join('experiment_results', 'batch'))
+        if self.reference not in ('exact', 'certified'):
+            raise ValueError(f"Unknown reference mode: {self.reference}")
+
+    @staticmethod
+    def _dataset_source(entry):
+        """(name, file path, weighted) of a dataset entry given by name or as a dict."""
+        if isinstance(entry, str):
+            return entry, DatasetsService.dataset_path(entry), False
+        return entry['name'], entry['path'], entry.get('weighted', False)
+
+    @staticmethod
+    def expand_grid(strategy_entry):
+        """All (constructor parameters, iterations) combinations of one strategy entry."""
+        strategy_class = getattr(AlgorithmStrategy, strategy_entry['class'])
+        constructor_arguments = inspect.signature(strategy_class.__init__).parameters
+        fixed = dict(strategy_entry.get('parameters', {}))
+        grid = strategy_entry.get('grid', {})
+        for key in list(fixed) + list(grid):
+            if key != 'iterations' and key not in constructor_arguments:
+                raise ValueError(f"{strategy_entry['class']} has no parameter '{key}'")
+
+        keys = list(grid)
+        for values in itertools.product(*(grid[key] for key in keys)):
+            parameters = dict(fixed, **dict(zip(keys, values)))
+            iterations = parameters.pop('iterations', None)
+            yield parameters, iterations
+
+    def plan(self):
+        """Jobs grouped by dataset, in spec order: {dataset name: (path, weighted, [job, ...])}."""
+        plan = {}
+        for entry in self.spec['datasets']:
+            dataset_name, path, weighted = BatchExperimentRunner._dataset_source(entry)
+            jobs = []
+            for strategy_entry in self.spec['strategies']:
+                for parameters, iterations in BatchExperimentRunner.expand_grid(strategy_entry):
+                    for repeat in range(self.repeats):
+                        jobs.append({
+                            'dataset': dataset_name,
+                            'strategy': strategy_entry['class'],
+                            'parameters': parameters,
+                            'iterations': iterations,
+                            'repeat': repeat,
+                            'time_budget': self.time_budget
+                        })
+            plan[dataset_name] = (path, weighted, jobs)
+        return plan
+
+    def run(self):
+        """
+        Execute the spec and write the results.
+
+        Returns:
+            Path of the run folder containing spec.json and results.jsonl
+        """
+        plan = self.plan()
+        num_jobs = sum(len(jobs) for _, _, jobs in plan.values())
+        run_folder = os.path.join(self.output_folder,
+                                  f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{self.name.replace(' ', '_')}")
+        os.makedirs(run_folder, exist_ok=True)
+        with open(os.path.join(run_folder, 'spec.json'), 'w') as spec_file:
+            json.dump(self.spec, spec_file, indent=2)
+        results_path = os.path.join(run_folder, 'results.jsonl')
+
+        print(f"🧪 {self.name}: {num_jobs} jobs on {len(plan)} datasets with {self.workers} workers")
+        start_time = time.perf_counter()
+        shared_graphs = {}
+        remaining = {}
+        futures = {}
+        completed = 0
+
+        executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"))
+        try:
+            with open(results_path, 'w') as results_file:
+                pending = deque(plan.items())
+
+                def drop(jobs):
+                    """Write an error row for every job that will not run."""
+                    nonlocal completed
+                    for job in jobs:
+                        completed += 1
+                        results_file.write(json.dumps(dict(job, error=True), default=str) + "\n")
+                    results_file.flush()
+
+                def publish_next():
+                    """Load the next loadable dataset of the plan, publish it and submit its first jobs."""
+                    while pending:
+                        dataset_name, (path, weighted, jobs) = pending.popleft()
+                        graph = GraphLoader.load_graph(path, weighted=weighted)
+                        if graph is None:
+                            print(f"⛔ Skipping {len(jobs)} jobs of {dataset_name}: dataset could not be loaded")
+                            drop(jobs)
+                            continue
+                        shared_graphs[dataset_name] = SharedGraph(dataset_name, graph)
+                        del graph
+                        handle = shared_graphs[dataset_name].handle()
+
+                        if self.reference == 'exact':
+                            # strategy jobs are submitted once the dataset's reference job completes
+                            remaining[dataset_name] = len(jobs) + 1
+                            futures[executor.submit(_run_reference_job, handle)] = ('reference', dataset_name, jobs)
+                        else:
+                            remaining[dataset_name] = len(jobs)
+                            for job in jobs:
+                                futures[executor.submit(_run_strategy_job, handle, job, None,
+                                                        self.gap_tolerance)] = ('job', dataset_name, job)
+                        return
+
+                while futures or pending:
+                    while pending and len(futures) < self.workers:
+                        publish_next()
+                    if not futures:
+                        break
+                    done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        kind, dataset_name, payload = futures.pop(future)
+                        remaining[dataset_name] -= 1
+                        try:
+                            result = future.result()
+                        except Exception as e:
+                            print(f"⛔ {kind} job on {dataset_name} failed: {e}")
+                            if kind == 'reference':
+                                remaining[dataset_name] -= len(payload)
+                                drop(payload)
+                            result = None
+
+                        if kind == 'reference':
+                            if result is not None:
+                                reference_nodes, exact_time = result
+                                print(f"  📐 {dataset_name}: exact reference in {exact_time:.2f} s")
+                                handle = shared_graphs[dataset_name].handle()
+                                for job in payload:
+                                    futures[executor.submit(_run_strategy_job, handle, job, reference_nodes,
+                                                            self.gap_tolerance)] = ('job', dataset_name, job)
+                            publish_next()
+                        elif kind == 'job':
+                            completed += 1
+                            row = result if result is not None else dict(payload, error=True)
+                            results_file.write(json.dumps(row, default=str) + "\n")
+                            results_file.flush()
+                            if result is not None:
+                                settings = dict(payload['parameters'])
+                                if payload['iterations'] is not None:
+                                    settings['iterations'] = payload['iterations']
+                                print(f"  ✅ [{completed}/{num_jobs}] {dataset_name} / {payload['strategy']} "
+                                      f"{settings or ''} #{payload['repeat']}: "
+                                      f"density {result['identified_subgraph_density']:.4f}, "
+                                      f"{result['running_time']:.3f} s")
+
+                        if remaining[dataset_name] <= 0 and dataset_name in shared_graphs:
+                            shared_graphs.pop(dataset_name).release()
+        finally:
+            executor.shutdown()
+            for shared_graph in shared_graphs.values():
+                shared_graph.release()
+
+        print(f"🏁 {completed} jobs finished in {time.perf_counter() - start_time:.2f} s, results in {results_path}")
+        return run_folder
+
+
+# Usage: python BatchExperimentRunner.py experiment_specs/example_sweep.json
+if __name__ == "__main__":
+    spec_path = sys.argv[1] if len(sys.argv) > 1 else "experiment_specs/example_sweep.json"
+    BatchExperimentRunner(spec_path).run()
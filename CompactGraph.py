@@ -0,0 +1,163 @@
+import numpy as np
+
+
+class CompactGraph:
+    """Integer-indexed edge arrays and CSR adjacency for an undirected graph."""
+
+    def __init__(self, node_labels, sources, targets, weights=None):
+        """
+        Args:
+            node_labels: Sequence mapping node index -> original node label
+            sources: Edge source indices, one entry per undirected edge
+            targets: Edge target indices, one entry per undirected edge
+            weights: Optional edge weights aligned with sources / targets (defaults to 1.0)
+        """
+        self.node_labels = list(node_labels)
+        self.sources = np.asarray(sources, dtype=np.int64)
+        self.targets = np.asarray(targets, dtype=np.int64)
+        self.num_nodes = len(self.node_labels)
+        self.num_edges = len(self.sources)
+        self.weighted = weights is not None
+        self.graph = {}  # graph attributes, like networkx's Graph.graph
+        self._index = None
+        self.weights = (np.ones(self.num_edges, dtype=np.float64) if weights is None
+                        else np.asarray(weights, dtype=np.float64))
+        self.total_weight = float(self.weights.sum())
+
+        self.degrees = (np.bincount(self.sources, minlength=self.num_nodes) +
+                        np.bincount(self.targets, minlength=self.num_nodes)).astype(np.int64)
+        self.weighted_degrees = (np.bincount(self.sources, weights=self.weights, minlength=self.num_nodes) +
+                                 np.bincount(self.targets, weights=self.weights, minlength=self.num_nodes))
+
+        # symmetric CSR adjacency: neighbours of i are indices[indptr[i]:indptr[i + 1]]
+        heads = np.concatenate((self.sources, self.targets))
+        tails = np.concatenate((self.targets, self.sources))
+        order = np.argsort(heads, kind='stable')
+        self.indices = tails[order]
+        self.adjacency_weights = np.concatenate((self.weights, self.weights))[order]
+        self.indptr = np.zeros(self.num_nodes + 1, dtype=np.int64)
+        np.cumsum(self.degrees, out=self.indptr[1:])
+
+    @staticmethod
+    def from_networkx(graph, weight=None):
+        """Build a CompactGraph from an undirected NetworkX graph, dropping self loops.
+
+        Args:
+            graph: Undirected NetworkX graph
+            weight: Edge attribute holding the weight, or None for unit weights
+        """
+        node_labels = list(graph.nodes())
+        index = {node: i for i, node in enumerate(node_labels)}
+        edges = np.fromiter((x for u, v in graph.edges() if u != v for x in (index[u], index[v])),
+                            dtype=np.int64, count=-1).reshape(-1, 2)
+        weights = None
+        if weight is not None:
+            weights = np.fromiter((d.get(weight, 1.0) for u, v, d in graph.edges(data=True) if u != v),
+                                  dtype=np.float64, count=len(edges))
+        return CompactGraph(node_labels, edges[:, 0], edges[:, 1], weights)
+
+    @staticmethod
+    def of(graph, weight=None):
+        """A CompactGraph of graph: a CompactGraph is used as is, a NetworkX graph is converted.
+
+        Args:
+            graph: CompactGraph or undirected NetworkX graph
+            weight: Edge attribute holding the weight, or None for unit weights
+        """
+        if not isinstance(graph, CompactGraph):
+            return CompactGraph.from_networkx(graph, weight=weight)
+        if weight is None and graph.weighted:
+            return CompactGraph(graph.node_labels, graph.sources, graph.targets)
+        return graph
+
+    def number_of_nodes(self):
+        return self.num_nodes
+
+    def number_of_edges(self):
+        return self.num_edges
+
+    def subgraph_density(self, nodes, weighted=False):
+        """Edges (or total edge weight) per node of the subgraph induced by the given node labels."""
+        if len(nodes) == 0:
+            return 0.0
+        if self._index is None:
+            self._index = {node: i for i, node in enumerate(self.node_labels)}
+        mask = np.zeros(self.num_nodes, dtype=bool)
+        mask[[self._index[node] for node in nodes if node in self._index]] = True
+        inside = mask[self.sources] & mask[self.targets]
+        internal = self.weights[inside].sum() if weighted else np.count_nonzero(inside)
+        return float(internal) / len(nodes)
+
+    def neighbours(self, i):
+        return self.indices[self.indptr[i]:self.indptr[i + 1]]
+
+    def neighbour_weights(self, i):
+        return self.adjacency_weights[self.indptr[i]:self.indptr[i + 1]]
+
+    def labels(self, indices):
+        """Translate node indices (or a boolean mask) back to a set of original labels."""
+        indices = np.asarray(indices)
+        if indices.dtype == bool:
+            indices = np.flatnonzero(indices)
+        return {self.node_labels[i] for i in indices}
+
+
+class CompactDirectedGraph:
+    """Integer-indexed arc arrays with out- and in-adjacency in CSR form for a directed graph."""
+
+    def __init__(self, node_labels, sources, targets):
+        """
+        Args:
+            node_labels: Sequence mapping node index -> original node label
+            sources: Arc tail indices
+            targets: Arc head indices
+        """
+        self.node_labels = list(node_labels)
+        self.sources = np.asarray(sources, dtype=np.int64)
+        self.targets = np.asarray(targets, dtype=np.int64)
+        self.num_nodes = len(self.node_labels)
+        self.num_edges = len(self.sources)
+
+        self.out_degrees = np.bincount(self.sources, minlength=self.num_nodes).astype(np.int64)
+        self.in_degrees = np.bincount(self.targets, minlength=self.num_nodes).astype(np.int64)
+
+        self.out_indptr = np.zeros(self.num_nodes + 1, dtype=np.int64)
+        np.cumsum(self.out_degrees, out=self.out_indptr[1:])
+        self.out_indices = self.targets[np.argsort(self.sources, kind='stable')]
+
+        self.in_indptr = np.zeros(self.num_nodes + 1, dtype=np.int64)
+        np.cumsum(self.in_degrees, out=self.in_indptr[1:])
+        self.in_indices = self.sources[np.argsort(self.targets, kind='stable')]
+
+    @staticmethod
+    def from_networkx(graph):
+        """Build from a NetworkX graph; an undirected graph contributes both arcs of every edge."""
+        node_labels = list(graph.nodes())
+        index = {node: i for i, node in enumerate(node_labels)}
+        arcs = [(index[u], index[v]) for u, v in graph.edges() if u != v]
+        if not graph.is_directed():
+            arcs += [(v, u) for u, v in arcs]
+        arcs = np.array(arcs, dtype=np.int64).reshape(-1, 2)
+        return CompactDirectedGraph(node_labels, arcs[:, 0], arcs[:, 1])
+
+    @staticmethod
+    def from_edge_array(edges):
+        """Build from an (m, 2) array of (tail, head) labels, dropping self loops and duplicate arcs."""
+        edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+        edges = np.unique(edges[edges[:, 0] != edges[:, 1]], axis=0)
+        node_labels, inverse = np.unique(edges, return_inverse=True)
+        inverse = inverse.reshape(-1, 2)
+        return CompactDirectedGraph(node_labels.tolist(), inverse[:, 0], inverse[:, 1])
+
+    def out_neighbours(self, i):
+        return self.out_indices[self.out_indptr[i]:self.out_indptr[i + 1]]
+
+    def in_neighbours(self, i):
+        return self.in_indices[self.in_indptr[i]:self.in_indptr[i + 1]]
+
+    def labels(self, indices):
+        """Translate node indices (or a boolean mask) back to a set of original labels."""
+        indices = np.asarray(indices)
+        if indices.dtype == bool:
+            indices = np.flatnonzero(indices)
+        return {self.node_labels[i] for i in indices}
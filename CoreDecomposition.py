@@ -0,0 +1,254 @@
+import heapq
+import itertools
+from collections import Counter, defaultdict
+
+
+class CoreDecomposition:
+    """Core numbers of an undirected graph, maintained under edge insertions and deletions.
+
+    An inserted or deleted edge can only change the core number of nodes in the K-subcore around
+    its endpoints, and only by one. Instead of traversing that subcore, updates follow the
+    order-based algorithm of Zhang et al. (ICDE 2017): the object keeps a k-order, a peeling order
+    in which every node has at most its core number of neighbours after it (its later degree),
+    and every node's max-core degree (MCD, neighbours whose core number is at least its own).
+      * insertion of (u, v), u first in the order, only has work when u's later degree exceeds K;
+        it then scans forward from u, visiting only nodes that gained candidate neighbours, so
+        it stays near the new edge however large the K-subcore is,
+      * deletion demotes nodes whose MCD falls below K and moves them to the end of level K - 1.
+    Positions in the order are tuples (core number, ...) compared lexicographically; nodes placed
+    between two others get a longer tuple, and a level is relabelled once they grow too long.
+    """
+
+    MAX_KEY_LENGTH = 10
+
+    def __init__(self, graph):
+        """
+        Args:
+            graph: NetworkX graph that this object takes ownership of and mutates on updates
+        """
+        self.graph = graph
+        self.core = {}
+        self.key = {}
+        self.later_degree = {}
+        self._peel()
+        self.mcd = {node: self._max_core_degree(node) for node in self.graph}
+        self.core_sizes = Counter(self.core.values())
+        self._max_core = max(self.core_sizes, default=0)
+        self._next_front = -1  # keys before, and after, every key of a level
+        self._next_back = self.graph.number_of_nodes()
+        self._tags = itertools.count()
+
+    def _peel(self):
+        """Bucket peel (Batagelj and Zaversnik): core numbers and the initial k-order."""
+        degree = dict(self.graph.degree())
+        buckets = [set() for _ in range(max(degree.values(), default=0) + 1)]
+        for node, d in degree.items():
+            buckets[d].add(node)
+        k = i = 0
+        for position in range(len(degree)):
+            while not buckets[i]:
+                i += 1
+            node = buckets[i].pop()
+            k = max(k, i)
+            self.core[node] = k
+            self.key[node] = (k, position)
+            self.later_degree[node] = degree[node]
+            for neighbour in self.graph[node]:
+                if neighbour not in self.key:
+                    buckets[degree[neighbour]].remove(neighbour)
+                    degree[neighbour] -= 1
+                    buckets[degree[neighbour]].add(neighbour)
+            i = max(i - 1, 0)
+
+    def _max_core_degree(self, node):
+        k = self.core[node]
+        return sum(1 for x in self.graph[node] if self.core[x] >= k)
+
+    def _set_core(self, nodes, k):
+        """Move nodes to core number k, keeping the per-core counts and the maximum up to date."""
+        for node in nodes:
+            self.core_sizes[self.core[node]] -= 1
+            self.core[node] = k
+        self.core_sizes[k] += len(nodes)
+        if k > self._max_core:
+            self._max_core = k
+        while self._max_core > 0 and self.core_sizes[self._max_core] == 0:
+            self._max_core -= 1
+
+    def _relabel(self, k):
+        """Give the nodes of level k short keys again, keeping their order."""
+        level = sorted((node for node, core in self.core.items() if core == k), key=self.key.__getitem__)
+        for position, node in enumerate(level):
+            self.key[node] = (k, position)
+
+    def max_core_number(self):
+        return self._max_core
+
+    def core_nodes(self, k):
+        """Nodes of the k-core."""
+        return {node for node, core in self.core.items() if core >= k}
+
+    def _add_node(self, node):
+        self.graph.add_node(node)
+        self.core[node] = 0
+        self.mcd[node] = 0
+        self.later_degree[node] = 0
+        self.key[node] = (0, self._next_back)
+        self._next_back += 1
+        self.core_sizes[0] += 1
+
+    def insert_edge(self, u, v):
+        """Add edge (u, v) to the graph and update core numbers. Returns the nodes whose core grew."""
+        for node in (u, v):
+            if node not in self.core:
+                self._add_node(node)
+        if u == v or self.graph.has_edge(u, v):
+            return set()
+        self.graph.add_edge(u, v)
+        if self.core[v] >= self.core[u]:
+            self.mcd[u] += 1
+        if self.core[u] >= self.core[v]:
+            self.mcd[v] += 1
+
+        if self.key[v] < self.key[u]:
+            u, v = v, u
+        self.later_degree[u] += 1
+        if self.later_degree[u] <= self.core[u]:
+            return set()  # the order is still a k-order
+        return self._promote(u, self.core[u])
+
+    def _promote(self, u, k):
+        """Scan level k forward from u; nodes that keep more than k later neighbours move up a level.
+
+        Candidates leave level k for the front of level k + 1, so a node after them gains them as
+        later neighbours (star). A scanned node whose later degree plus star stays within k keeps
+        its place, which costs each candidate neighbour one supporting neighbour; candidates left
+        with at most k are put back into level k right after it.
+        """
+        later, key, core = self.later_degree, self.key, self.core
+        star = defaultdict(int)
+        candidates = {}  # candidate -> neighbours in levels above k, among candidates or not yet scanned
+        scanned = set()
+        relabel = False
+        heap = [(key[u], u)]
+        while heap:
+            _, node = heapq.heappop(heap)
+            if node in scanned:
+                continue
+            scanned.add(node)
+            if later[node] + star[node] > k:
+                candidates[node] = later[node] + star.pop(node, 0)
+                for x in self.graph[node]:
+                    if core[x] == k and x not in scanned and key[x] > key[node]:
+                        star[x] += 1
+                        heapq.heappush(heap, (key[x], x))
+                continue
+
+            later[node] += star.pop(node, 0)
+            evicted = [c for c in self.graph[node] if c in candidates]
+            for c in evicted:
+                candidates[c] -= 1
+            evicted = [c for c in evicted if candidates[c] <= k]
+            tag, position = next(self._tags), 0
+            while evicted:
+                c = evicted.pop()
+                if c not in candidates:
+                    continue
+                later[c] = candidates.pop(c)
+                key[c] = key[node] + (-tag, position)
+                position += 1
+                for x in self.graph[c]:
+                    if x in candidates:
+                        candidates[x] -= 1
+                        if candidates[x] <= k:
+                            evicted.append(x)
+                    elif core[x] == k and x not in scanned and key[x] > key[node]:
+                        star[x] -= 1
+            relabel |= position > 0 and len(key[node]) + 2 > CoreDecomposition.MAX_KEY_LENGTH
+
+        # the remaining candidates go to the front of level k + 1, in the order they were found
+        promoted = list(candidates)
+        rank = {c: i for i, c in enumerate(promoted)}
+        for c in promoted:
+            later[c] = sum(1 for x in self.graph[c] if core[x] > k or rank.get(x, -1) > rank[c])
+        first = self._next_front - len(promoted) + 1
+        for i, c in enumerate(promoted):
+            key[c] = (k + 1, first + i)
+        self._next_front = first - 1
+
+        self._set_core(promoted, k + 1)
+        # neighbours at k + 1 now count the promoted nodes; the promoted nodes count afresh
+        for node in promoted:
+            for neighbour in self.graph[node]:
+                if core[neighbour] == k + 1 and neighbour not in rank:
+                    self.mcd[neighbour] += 1
+        for node in promoted:
+            self.mcd[node] = self._max_core_degree(node)
+        if relabel:
+            self._relabel(k)  # after the scan, whose heap holds the current keys
+        return set(promoted)
+
+    def remove_edge(self, u, v):
+        """Remove edge (u, v) from the graph and update core numbers. Returns the nodes whose core dropped."""
+        if not self.graph.has_edge(u, v):
+            return set()
+        self.graph.remove_edge(u, v)
+        if u == v:
+            return set()
+        if self.core[v] >= self.core[u]:
+            self.mcd[u] -= 1
+        if self.core[u] >= self.core[v]:
+            self.mcd[v] -= 1
+        self.later_degree[min(u, v, key=self.key.__getitem__)] -= 1
+
+        k = min(self.core[u], self.core[v])
+        if k == 0:
+            return set()
+
+        # a node at k keeps its core number while at least k neighbours are at k or above
+        demoted = []
+        stack = [root for root in {u, v} if self.core[root] == k and self.mcd[root] < k]
+        while stack:
+            node = stack.pop()
+            if self.core[node] != k or self.mcd[node] >= k:
+                continue
+            demoted.append(node)
+            self._set_core([node], k - 1)
+            for neighbour in self.graph[node]:
+                if self.core[neighbour] == k:
+                    self.mcd[neighbour] -= 1
+                    if self.mcd[neighbour] < k:
+                        stack.append(neighbour)
+
+        # demoted nodes move to the end of level k - 1 in demotion order; nodes left at k lose
+        # them as later neighbours
+        rank = {node: i for i, node in enumerate(demoted)}
+        for node in demoted:
+            for neighbour in self.graph[node]:
+                if self.core[neighbour] == k and self.key[neighbour] < self.key[node]:
+                    self.later_degree[neighbour] -= 1
+        for i, node in enumerate(demoted):
+            self.key[node] = (k - 1, self._next_back + i)
+            self.later_degree[node] = sum(1 for x in self.graph[node]
+                                          if self.core[x] >= k or rank.get(x, -1) > i)
+            self.mcd[node] = self._max_core_degree(node)
+        self._next_back += len(demoted)
+        return set(demoted)
+
+    def remove_nodes(self, nodes):
+        """Remove a set of nodes and all their edges, updating core numbers of the remaining nodes.
+
+        Only the boundary edges need incremental updates: once they are gone the removed set is
+        disconnected from the rest of the graph, so its internal edges cannot affect other nodes.
+        """
+        nodes = set(nodes)
+        for node in nodes:
+            for neighbour in list(self.graph[node]):
+                if neighbour not in nodes:
+                    self.remove_edge(node, neighbour)
+        self.graph.remove_nodes_from(nodes)
+        self._set_core(nodes, 0)
+        self.core_sizes[0] -= len(nodes)
+        for node in nodes:
+            for state in (self.core, self.mcd, self.key, self.later_degree):
+                del state[node]
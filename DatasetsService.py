@@ -1,13 +1,78 @@
-from GraphLoader import GraphLoader
+import os
+from collections.abc import Mapping
+
+from SyntheticGraphGenerator import SyntheticGraphGenerator
+
+
+class LazyDatasets(Mapping):
+    """Dataset name -> NetworkX graph, loading each graph the first time it is looked up.
+
+    Only datasets that can be loaded are listed: real datasets whose file exists, and the
+    synthetic benchmark graphs, which are generated on first use.
+    """
+
+    def __init__(self, dataset_names=None):
+        names = dataset_names if dataset_names is not None else DatasetsService.dataset_names()
+        self._names = [name for name in names if DatasetsService.is_available(name)]
+        self._graphs = {}
+
+    def __getitem__(self, dataset_name):
+        if dataset_name not in self._names:
+            raise KeyError(dataset_name)
+        if dataset_name not in self._graphs:
+            from GraphLoader import GraphLoader  # networkx is only needed once a graph is used
+            self._graphs[dataset_name] = GraphLoader.load_graph(DatasetsService.dataset_path(dataset_name))
+        return self._graphs[dataset_name]
+
+    def __iter__(self):
+        return iter(self._names)
+
+    def __len__(self):
+        return len(self._names)
+
+    def is_loaded(self, dataset_name):
+        return dataset_name in self._graphs
+
 
 class DatasetsService:
+    DATASET_FILES = {
+        "Douban": "datasets/douban.txt",
+        "Gowalla": "datasets/gowalla.txt",
+        "Brightkite": "datasets/brightkite.txt",
+        "Livemocha": "datasets/livemocha.txt",
+        "Hamsterster": "datasets/hamsterster.txt",
+        "Catster": "datasets/catster.txt"
+    }
+
+    @staticmethod
+    def dataset_names():
+        return list(DatasetsService.DATASET_FILES) + [name for name, _, _ in SyntheticGraphGenerator.BENCHMARK_SUITE]
+
+    @staticmethod
+    def dataset_path(dataset_name):
+        """Edge list file of a named dataset; synthetic benchmark graphs are generated on first use."""
+        if dataset_name in DatasetsService.DATASET_FILES:
+            return DatasetsService.DATASET_FILES[dataset_name]
+        for name, kind, num_edges in SyntheticGraphGenerator.BENCHMARK_SUITE:
+            if name == dataset_name:
+                return SyntheticGraphGenerator.generate_dataset(kind, num_edges)
+        raise KeyError(f"Unknown dataset: {dataset_name}")
+
+    @staticmethod
+    def planted_subgraph(dataset_name):
+        """Planted block {'nodes', 'density'} of a synthetic planted dataset, None for any other dataset."""
+        if dataset_name in DatasetsService.DATASET_FILES:
+            return None
+        return SyntheticGraphGenerator.load_planted(DatasetsService.dataset_path(dataset_name))
+
+    @staticmethod
+    def is_available(dataset_name):
+        """Whether a dataset can be loaded: its file exists, or it is a synthetic benchmark graph."""
+        if dataset_name in DatasetsService.DATASET_FILES:
+            return os.path.exists(DatasetsService.DATASET_FILES[dataset_name])
+        return any(name == dataset_name for name, _, _ in SyntheticGraphGenerator.BENCHMARK_SUITE)
+
+    @staticmethod
     def load_datasets():
-        datasets = dict()
-        datasets["Douban"] = GraphLoader.load_graph("datasets/douban.txt")
-        datasets["Gowalla"] = GraphLoader.load_graph("datasets/gowalla.txt")
-        datasets["Brightkite"] = GraphLoader.load_graph("datasets/brightkite.txt")
-        datasets["Livemocha"] = GraphLoader.load_graph("datasets/livemocha.txt")
-        datasets["Hamsterster"] = GraphLoader.load_graph("datasets/hamsterster.txt")
-        datasets["Catster"] = GraphLoader.load_graph("datasets/catster.txt")
-
-        return datasets
+        """Mapping of every available dataset; graphs are loaded (or generated) on first access."""
+        return LazyDatasets()
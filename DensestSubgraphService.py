@@ -0,0 +1,477 @@
+import argparse
+import http.client
+import json
+import math
+import os
+import signal
+import socket
+import socketserver
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+import AlgorithmStrategy
+from AlgorithmStrategy import AlgorithmStrategy as AlgoStrat
+from CoreDecomposition import CoreDecomposition
+from DatasetsService import DatasetsService
+from GraphLoader import GraphLoader
+from LocalDensestSubgraph import LocalDensestSubgraph
+from TopKDenseSubgraphs import TopKDenseSubgraphs
+
+
+class LRUCache:
+    """Thread-safe least-recently-used cache with a fixed number of entries.
+
+    get_or_create() computes a missing value once: concurrent callers asking for a key that is
+    being computed wait for that computation instead of starting their own.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self._items = OrderedDict()
+        self._pending = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._items
+
+    def keys(self):
+        with self._lock:
+            return list(self._items)
+
+    def put(self, key, value):
+        with self._lock:
+            self._put(key, value)
+
+    def _put(self, key, value):
+        self._items[key] = value
+        self._items.move_to_end(key)
+        while len(self._items) > self.capacity:
+            self._items.popitem(last=False)
+            self.evictions += 1
+
+    def get_or_create(self, key, factory):
+        """Cached value of key, calling factory() on a miss. Returns (value, was_cached)."""
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return self._items[key], True
+            pending = self._pending.get(key)
+            owner = pending is None
+            if owner:
+                pending = self._pending[key] = Future()
+                self.misses += 1
+            else:
+                self.coalesced += 1
+
+        if not owner:
+            return pending.result(), True
+
+        try:
+            value = factory()
+        except BaseException as e:
+            with self._lock:
+                del self._pending[key]
+            pending.set_exception(e)
+            raise
+        with self._lock:
+            self._put(key, value)
+            del self._pending[key]
+        pending.set_result(value)
+        return value, False
+
+    def stats(self):
+        with self._lock:
+            return {'size': len(self._items), 'capacity': self.capacity, 'hits': self.hits,
+                    'misses': self.misses, 'coalesced': self.coalesced, 'evictions': self.evictions}
+
+
+class DensestSubgraphService:
+    """Long-lived query service that keeps datasets, their dense regions and results resident.
+
+    Queries are JSON objects with a "type" and a "dataset" (a DatasetsService name):
+      * {"type": "densest", "strategy": "CharikarsGreedyMinHeap", "exact": false, "parameters": {}}
+        runs the strategy ("exact": true uses Goldberg) on the ceil(L)-core of the dataset, L being
+        a known density (of the max core, or of a peel inside it); the densest subgraph always lies
+        in that core, since each of its nodes has at least optimal-density neighbours inside it
+        (only unconstrained edge-density strategies are pruned this way; others, e.g. with min_size
+        or a triangle objective, run on the whole dataset)
+      * {"type": "top_k", "k": 5, "strategy": ...} returns k disjoint dense subgraphs
+      * {"type": "seed", "seeds": [...], "max_edges": 50000, "method": "greedy", "contain_seeds": true}
+        returns the densest subgraph containing (or near) the seed nodes with LocalDensestSubgraph,
+        which reads at most max_edges adjacency entries instead of the whole dataset
+    Queries run on a thread pool, so they share the resident caches; identical concurrent queries
+    are computed once. Latency is recorded per query type.
+    """
+
+    QUERY_TYPES = ("densest", "top_k", "seed")
+    DEFAULT_STRATEGY = "CharikarsGreedyMinHeap"
+
+    def __init__(self, max_graphs=3, max_results=512, workers=4, latency_window=1000):
+        """
+        Args:
+            max_graphs: Datasets (and their dense regions) kept resident
+            max_results: Query results kept resident
+            workers: Threads answering queries
+            latency_window: Most recent latencies per query type used for the metrics
+        """
+        self.graphs = LRUCache(max_graphs)
+        self.regions = LRUCache(max_graphs)
+        self.results = LRUCache(max_results)
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="densest-query")
+        self.latencies = {query_type: deque(maxlen=latency_window) for query_type in DensestSubgraphService.QUERY_TYPES}
+        self.query_counts = {query_type: 0 for query_type in DensestSubgraphService.QUERY_TYPES}
+        self.errors = 0
+        self.started = time.time()
+        self._metrics_lock = threading.Lock()
+
+    def graph(self, dataset_name):
+        """Resident graph of a dataset, loaded on first use."""
+        def load():
+            graph = GraphLoader.load_graph(DatasetsService.dataset_path(dataset_name))
+            if graph is None:
+                raise ValueError(f"Dataset {dataset_name} could not be loaded")
+            return graph
+        return self.graphs.get_or_create(dataset_name, load)[0]
+
+    def dense_region(self, dataset_name):
+        """Nodes of the ceil(L)-core of a dataset, computed on first use.
+
+        Only the node set is cached: the core decomposition refers to the graph, and would keep
+        it resident after the graph cache evicted it.
+        """
+        def decompose():
+            graph = self.graph(dataset_name)
+            cores = CoreDecomposition(graph)  # never updated here, so the resident graph is not mutated
+            max_core = cores.core_nodes(cores.max_core_number())
+            region = cores.core_nodes(math.ceil(AlgoStrat.subgraph_density(graph, max_core)) if max_core else 0)
+            # a peel of that core usually finds a denser subgraph, which shrinks the region further
+            peeled = AlgorithmStrategy.CharikarsGreedyMinHeap().apply_algorithm(graph.subgraph(region))
+            lower_bound = max(AlgoStrat.subgraph_density(graph, max_core), AlgoStrat.subgraph_density(graph, peeled))
+            return frozenset(cores.core_nodes(math.ceil(lower_bound)))
+        return self.regions.get_or_create(dataset_name, decompose)[0]
+
+    def warm(self, dataset_name):
+        """Load a dataset and its dense region ahead of the first query."""
+        self.dense_region(dataset_name)
+        return {'dataset': dataset_name, 'nodes': self.graph(dataset_name).number_of_nodes(),
+                'edges': self.graph(dataset_name).number_of_edges()}
+
+    @staticmethod
+    def normalize(query):
+        """Validate a query and fill in defaults, so equal queries get equal cache keys."""
+        if not isinstance(query, dict):
+            raise ValueError("A query must be a JSON object")
+        query_type = query.get('type', 'densest')
+        if query_type not in DensestSubgraphService.QUERY_TYPES:
+            raise ValueError(f"Unknown query type: {query_type}")
+        if query.get('dataset') not in DatasetsService.dataset_names():
+            raise ValueError(f"Unknown dataset: {query.get('dataset')}")
+
+        normalized = {
+            'type': query_type,
+            'dataset': query['dataset'],
+            'strategy': query.get('strategy', DensestSubgraphService.DEFAULT_STRATEGY),
+            'parameters': dict(query.get('parameters', {})),
+            'iterations': query.get('iterations')
+        }
+        strategy_class = getattr(AlgorithmStrategy, normalized['strategy'], None)
+        if (not isinstance(strategy_class, type) or not issubclass(strategy_class, AlgoStrat) or
+                issubclass(strategy_class, AlgorithmStrategy.DirectedDensestSubgraphStrategy)):
+            raise ValueError(f"Unknown undirected strategy: {normalized['strategy']}")
+        if query_type == 'densest':
+            normalized['exact'] = bool(query.get('exact', False))
+        elif query_type == 'top_k':
+            normalized['k'] = int(query.get('k', 5))
+        else:
+            seeds = query.get('seeds')
+            if not seeds:
+                raise ValueError("A seed query needs a non-empty list of seeds")
+            normalized['seeds'] = sorted(seeds, key=str)
+            normalized['max_edges'] = int(query.get('max_edges', 50_000))
+            normalized['method'] = query.get('method', 'greedy')
+            if normalized['method'] not in LocalDensestSubgraph.METHODS:
+                raise ValueError(f"Unknown local search method: {normalized['method']}")
+            normalized['contain_seeds'] = bool(query.get('contain_seeds', True))
+        return normalized
+
+    def execute(self, query):
+        """Answer one query; errors are returned as {"error": ...} instead of raised."""
+        start_time = time.perf_counter()
+        try:
+            query = DensestSubgraphService.normalize(query)
+            key = json.dumps(query, sort_keys=True)
+            result, cached = self.results.get_or_create(key, lambda: self._compute(query))
+        except Exception as e:
+            with self._metrics_lock:
+                self.errors += 1
+            return {'error': f"{type(e).__name__}: {e}"}
+
+        latency = time.perf_counter() - start_time
+        with self._metrics_lock:
+            self.latencies[query['type']].append(latency)
+            self.query_counts[query['type']] += 1
+        return {'query': query, 'result': result, 'cached': cached, 'latency_ms': latency * 1000}
+
+    def submit(self, query):
+        """Queue a query on the worker pool; returns a Future of execute(query)."""
+        return self.executor.submit(self.execute, query)
+
+    def execute_batch(self, queries):
+        """
+        Answer a list of queries, in order.
+
+        Datasets used by the batch are loaded (once each) before the queries are queued, then all
+        queries run concurrently on the worker pool.
+        """
+        for dataset_name in {query.get('dataset') for query in queries if isinstance(query, dict)}:
+            if dataset_name in DatasetsService.dataset_names():
+                try:
+                    self.dense_region(dataset_name)
+                except Exception:
+                    pass  # reported by the queries themselves
+        futures = [self.submit(query) for query in queries]
+        return [future.result() for future in futures]
+
+    def _strategy(self, query):
+        return getattr(AlgorithmStrategy, query['strategy'])(**query['parameters'])
+
+    @staticmethod
+    def core_pruning_applies(strategy):
+        """Whether the answer of strategy is guaranteed to lie in the ceil(L)-core.
+
+        Only the unconstrained, unweighted edge-density optimum is; a size constraint (min_size),
+        edge weights or another objective (triangle density) can move it outside, so those
+        strategies run on the full dataset.
+        """
+        return (getattr(strategy, 'objective', 'edge') == 'edge' and getattr(strategy, 'min_size', 1) <= 1
+                and getattr(strategy, 'weight', None) is None)
+
+    def _run(self, strategy, graph, query):
+        if query['iterations'] is not None and getattr(strategy, 'takes_iterations', False):
+            nodes = strategy.apply_algorithm(graph, query['iterations'])
+        else:
+            nodes = strategy.apply_algorithm(graph)
+        if isinstance(nodes, tuple):  # strategies return (set(), 0.0) on empty input
+            nodes = nodes[0]
+        return set(nodes)
+
+    def _compute(self, query):
+        graph = self.graph(query['dataset'])
+
+        if query['type'] == 'densest':
+            strategy = AlgorithmStrategy.GoldbergsMaxDensitySubgraph() if query['exact'] else self._strategy(query)
+            if DensestSubgraphService.core_pruning_applies(strategy):
+                region = self.dense_region(query['dataset'])
+                searched = graph.subgraph(region)
+            else:
+                searched = graph
+            nodes = self._run(strategy, searched, query)
+            return dict(DensestSubgraphService.describe(graph, nodes), searched_nodes=searched.number_of_nodes())
+
+        if query['type'] == 'top_k':
+            if not DensestSubgraphService.core_pruning_applies(self._strategy(query)):
+                # TopKDenseSubgraphs solves each component on its ceil(L)-core
+                raise ValueError(f"top_k needs an unconstrained edge-density strategy, got {query['strategy']} "
+                                 f"with {query['parameters']}")
+            found = TopKDenseSubgraphs(self._strategy(query)).find_top_k(graph, query['k'])
+            return {'subgraphs': [DensestSubgraphService.describe(graph, nodes) for nodes, _ in found]}
+
+        missing = [seed for seed in query['seeds'] if seed not in graph]
+        if missing:
+            raise ValueError(f"Seed nodes not in {query['dataset']}: {missing[:10]}")
+        local = LocalDensestSubgraph(max_edges=query['max_edges'], method=query['method'],
+                                     contain_seeds=query['contain_seeds'])
+        nodes, _ = local.find(graph, query['seeds'])
+        return dict(DensestSubgraphService.describe(graph, nodes), searched_nodes=local.region_size,
+                    contains_seeds=all(seed in nodes for seed in query['seeds']), **local.get_metrics())
+
+    @staticmethod
+    def describe(graph, nodes):
+        try:
+            node_list = sorted(nodes)
+        except TypeError:
+            node_list = sorted(nodes, key=str)
+        return {'nodes': node_list, 'size': len(node_list), 'density': AlgoStrat.subgraph_density(graph, nodes)}
+
+    def metrics(self):
+        """Per query type latency (ms) statistics over the latency window, and cache statistics."""
+        with self._metrics_lock:
+            latencies = {query_type: np.array(values) * 1000 for query_type, values in self.latencies.items()}
+            counts = dict(self.query_counts)
+            errors = self.errors
+        return {
+            'uptime_s': time.time() - self.started,
+            'queries': counts,
+            'errors': errors,
+            'latency_ms': {
+                query_type: ({'mean': float(values.mean()), 'p50': float(np.percentile(values, 50)),
+                              'p95': float(np.percentile(values, 95)), 'max': float(values.max())}
+                             if len(values) else None)
+                for query_type, values in latencies.items()
+            },
+            'caches': {'graphs': self.graphs.stats(), 'regions': self.regions.stats(), 'results': self.results.stats()},
+            'resident_datasets': self.graphs.keys()
+        }
+
+    def serve(self, host="127.0.0.1", port=8765, unix_socket=None):
+        """Serve the HTTP API on localhost (or a Unix socket) until interrupted."""
+        if unix_socket is not None:
+            if os.path.exists(unix_socket):
+                os.remove(unix_socket)
+            server = _UnixThreadingHTTPServer(unix_socket, _QueryRequestHandler)
+            address = unix_socket
+        else:
+            server = ThreadingHTTPServer((host, port), _QueryRequestHandler)
+            address = f"http://{host}:{server.server_port}"
+        server.daemon_threads = True
+        server.service = self
+        print(f"🛰️ Densest subgraph service listening on {address}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            print("\n⏹ Service stopped")
+        finally:
+            server.server_close()
+            self.executor.shutdown()
+            if unix_socket is not None and os.path.exists(unix_socket):
+                os.remove(unix_socket)
+
+
+class _UnixThreadingHTTPServer(ThreadingHTTPServer):
+    address_family = socket.AF_UNIX
+
+    def server_bind(self):
+        # HTTPServer.server_bind resolves a host name, which a socket path does not have
+        socketserver.TCPServer.server_bind(self)
+        self.server_name, self.server_port = "localhost", 0
+
+
+class _QueryRequestHandler(BaseHTTPRequestHandler):
+    """JSON API: GET /health, /metrics, /datasets; POST /query, /batch ({"queries": [...]}), /warm ({"dataset"})."""
+
+    server_version = "DensestSubgraphService/1.0"
+
+    def address_string(self):
+        return self.client_address[0] if self.client_address else "unix"
+
+    def log_message(self, format, *args):
+        pass  # per-request lines would drown the service output; latencies are in /metrics
+
+    def do_GET(self):
+        service = self.server.service
+        if self.path == "/health":
+            self._send_json(200, {'status': 'ok'})
+        elif self.path == "/metrics":
+            self._send_json(200, service.metrics())
+        elif self.path == "/datasets":
+            self._send_json(200, {'datasets': DatasetsService.dataset_names(), 'resident': service.graphs.keys()})
+        else:
+            self._send_json(404, {'error': f"Unknown path: {self.path}"})
+
+    def do_POST(self):
+        service = self.server.service
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError as e:
+            self._send_json(400, {'error': f"Invalid JSON: {e}"})
+            return
+
+        if self.path == "/query":
+            response = service.submit(body).result()
+            self._send_json(400 if 'error' in response else 200, response)
+        elif self.path == "/batch":
+            queries = body.get('queries') if isinstance(body, dict) else None
+            if not isinstance(queries, list):
+                self._send_json(400, {'error': "Expected {\"queries\": [...]}"})
+                return
+            self._send_json(200, {'responses': service.execute_batch(queries)})
+        elif self.path == "/warm":
+            try:
+                self._send_json(200, service.warm(body.get('dataset')))
+            except Exception as e:
+                self._send_json(400, {'error': f"{type(e).__name__}: {e}"})
+        else:
+            self._send_json(404, {'error': f"Unknown path: {self.path}"})
+
+    def _send_json(self, status, payload):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class ServiceClient:
+    """Minimal client for DensestSubgraphService over localhost HTTP or a Unix socket."""
+
+    def __init__(self, host="127.0.0.1", port=8765, unix_socket=None, timeout=None):
+        self.host = host
+        self.port = port
+        self.unix_socket = unix_socket
+        self.timeout = timeout
+
+    def _connection(self):
+        if self.unix_socket is None:
+            return http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        connection = http.client.HTTPConnection("localhost", timeout=self.timeout)
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(self.unix_socket)
+        connection.sock = sock
+        return connection
+
+    def _request(self, method, path, payload=None):
+        connection = self._connection()
+        try:
+            body = json.dumps(payload) if payload is not None else None
+            connection.request(method, path, body=body, headers={"Content-Type": "application/json"})
+            return json.loads(connection.getresponse().read())
+        finally:
+            connection.close()
+
+    def query(self, **query):
+        return self._request("POST", "/query", query)
+
+    def batch(self, queries):
+        return self._request("POST", "/batch", {'queries': queries})['responses']
+
+    def warm(self, dataset_name):
+        return self._request("POST", "/warm", {'dataset': dataset_name})
+
+    def metrics(self):
+        return self._request("GET", "/metrics")
+
+
+# Usage:
+#   python DensestSubgraphService.py --preload Hamsterster          # http://127.0.0.1:8765
+#   python DensestSubgraphService.py --socket /tmp/densest.sock
+#   curl -s -X POST localhost:8765/query -d '{"dataset": "Hamsterster", "type": "top_k", "k": 3}'
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Resident densest subgraph query service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--socket", default=None, help="serve on this Unix socket instead of TCP")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--max-graphs", type=int, default=3)
+    parser.add_argument("--max-results", type=int, default=512)
+    parser.add_argument("--preload", nargs="*", default=[], help="datasets to load before serving")
+    arguments = parser.parse_args()
+
+    signal.signal(signal.SIGTERM, signal.default_int_handler)  # stop cleanly, removing the socket file
+    service = DensestSubgraphService(arguments.max_graphs, arguments.max_results, arguments.workers)
+    for dataset_name in arguments.preload:
+        print(f"⏳ Loading {dataset_name}: {service.warm(dataset_name)}")
+    service.serve(arguments.host, arguments.port, arguments.socket)
@@ -0,0 +1,157 @@
+import time
+
+from AlgorithmStrategy import AlgorithmStrategy as AlgoStrat, CharikarsGreedyMinHeap
+from CoreDecomposition import CoreDecomposition
+
+
+class DynamicDensestSubgraph:
+    """Maintains an approximate densest subgraph while edges are inserted and deleted.
+
+    The engine keeps core numbers up to date incrementally and uses them as a certified
+    bracket on the optimum: the maintained node set gives the lower bound, and the maximum
+    core number k_max gives the upper bound, because the densest subgraph lies inside the
+    ceil(rho*)-core. A full recomputation with the given strategy runs only when the
+    upper/lower gap drifts more than a factor (1 + drift_tolerance) past the gap measured
+    at the last recomputation.
+    """
+
+    def __init__(self, graph, baseline_nodes=None, strategy=None, drift_tolerance=0.1):
+        """
+        Args:
+            graph: Undirected NetworkX graph at the time of the baseline result (copied)
+            baseline_nodes: Node set returned by a strategy on graph, or None to compute one
+            strategy: AlgorithmStrategy used for full recomputations
+            drift_tolerance: Allowed relative growth of the optimality gap before recomputing
+        """
+        self.strategy = strategy if strategy is not None else CharikarsGreedyMinHeap()
+        self.drift_tolerance = drift_tolerance
+        self.cores = CoreDecomposition(graph.copy())
+        self.graph = self.cores.graph
+        self.batch_reports = []
+        self.recomputations = 0
+
+        if baseline_nodes is None:
+            self.recompute()
+        else:
+            self._set_best(baseline_nodes)
+            self.reference_gap = self.optimality_gap()
+
+    def _set_best(self, nodes):
+        self.best_nodes = set(nodes)
+        self.best_edges = self.graph.subgraph(self.best_nodes).number_of_edges()
+
+    @property
+    def lower_bound(self):
+        return self.best_edges / len(self.best_nodes) if self.best_nodes else 0.0
+
+    @property
+    def upper_bound(self):
+        return float(self.cores.max_core_number())
+
+    def optimality_gap(self):
+        if self.lower_bound == 0.0:
+            return float('inf') if self.upper_bound > 0 else 1.0
+        return self.upper_bound / self.lower_bound
+
+    def recompute(self):
+        """Run the full strategy from scratch and reset the reference gap."""
+        self.recomputations += 1
+        self._set_best(self.strategy.apply_algorithm(self.graph))
+        self._consider_max_core()
+        self.reference_gap = self.optimality_gap()
+
+    def _consider_max_core(self):
+        """Adopt the max core as the maintained result when it is denser (it is always a 2-approximation)."""
+        k_max = self.cores.max_core_number()
+        if k_max == 0:
+            return
+        max_core = self.cores.core_nodes(k_max)
+        edges = self.graph.subgraph(max_core).number_of_edges()
+        if edges / len(max_core) > self.lower_bound:
+            self.best_nodes = max_core
+            self.best_edges = edges
+
+    def insert_edge(self, u, v):
+        if u == v or self.graph.has_edge(u, v):
+            return
+        self.cores.insert_edge(u, v)
+        if u in self.best_nodes and v in self.best_nodes:
+            self.best_edges += 1
+
+    def remove_edge(self, u, v):
+        if not self.graph.has_edge(u, v):
+            return
+        self.cores.remove_edge(u, v)
+        if u in self.best_nodes and v in self.best_nodes:
+            self.best_edges -= 1
+
+    def apply_batch(self, insertions=(), deletions=()):
+        """
+        Apply one batch of edge updates.
+
+        Args:
+            insertions: Iterable of (u, v) edges to add
+            deletions: Iterable of (u, v) edges to remove
+
+        Returns:
+            Report dict with the update latency, current bounds and whether a recomputation ran
+        """
+        start_time = time.perf_counter()
+        max_core_before = self.cores.max_core_number()
+        num_insertions = num_deletions = 0
+
+        for u, v in deletions:
+            self.remove_edge(u, v)
+            num_deletions += 1
+        for u, v in insertions:
+            self.insert_edge(u, v)
+            num_insertions += 1
+
+        if self.cores.max_core_number() != max_core_before:
+            self._consider_max_core()
+
+        recomputed = self.optimality_gap() > self.reference_gap * (1 + self.drift_tolerance)
+        if recomputed:
+            self.recompute()
+
+        report = {
+            'batch': len(self.batch_reports) + 1,
+            'insertions': num_insertions,
+            'deletions': num_deletions,
+            'update_latency': time.perf_counter() - start_time,
+            'lower_bound': self.lower_bound,
+            'upper_bound': self.upper_bound,
+            'best_size': len(self.best_nodes),
+            'recomputed': recomputed
+        }
+        self.batch_reports.append(report)
+        return report
+
+    def process_stream(self, batches):
+        """Apply a stream of (insertions, deletions) batches, yielding one report per batch."""
+        for insertions, deletions in batches:
+            yield self.apply_batch(insertions, deletions)
+
+    def density(self):
+        """Density of the maintained node set, recomputed with the evaluator's metric."""
+        return AlgoStrat.subgraph_density(self.graph, self.best_nodes)
+
+
+# Usage
+if __name__ == "__main__":
+    import random
+    from GraphLoader import GraphLoader
+
+    graph = GraphLoader.load_graph("datasets/hamsterster.txt")
+    engine = DynamicDensestSubgraph(graph)
+    print(f"Baseline: density {engine.lower_bound:.4f}, upper bound {engine.upper_bound:.1f}")
+
+    rng = random.Random(42)
+    nodes = list(graph.nodes())
+    for _ in range(20):
+        insertions = [(rng.choice(nodes), rng.choice(nodes)) for _ in range(500)]
+        deletions = rng.sample(list(engine.graph.edges()), 500)
+        report = engine.apply_batch(insertions, deletions)
+        print(f"Batch {report['batch']}: {report['update_latency'] * 1000:.1f} ms, "
+              f"density in [{report['lower_bound']:.4f}, {report['upper_bound']:.1f}]"
+              + (" (recomputed)" if report['recomputed'] else ""))
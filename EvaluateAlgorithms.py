@@ -2,7 +2,7 @@ import networkx
 
 from AlgorithmEvaluator import AlgorithmEvaluator
 from AlgorithmStrategy import AlgorithmStrategy, CharikarsGreedy, CharikarsGreedyMinHeap, GoldbergsMaxDensitySubgraph, \
-    GreedyPlusPlus, GreedyPlusPlusPriorityQueue
+    GreedyPlusPlus, GreedyPlusPlusPriorityQueue, BatchPeelingDensestSubgraph
 from Datasets import Datasets
 from EvaluationResultsView import AlgorithmResultsViewer
 
@@ -18,7 +18,7 @@ class EvaluateAlgorithms:
 
         # Example evaluation
         for dataset_name, dataset_graph in datasets.datasets.items():
-            if dataset_name == "Hamsterster":
+            if dataset_name == "Hamsterster" or dataset_name.startswith("Synthetic"):
                 print(f"\nEvaluating on dataset: {dataset_name}")
 
                 # Test different algorithms
@@ -27,7 +27,8 @@ class EvaluateAlgorithms:
                     CharikarsGreedyMinHeap(),
                     GoldbergsMaxDensitySubgraph(),
                     GreedyPlusPlus(),
-                    GreedyPlusPlusPriorityQueue()
+                    GreedyPlusPlusPriorityQueue(),
+                    BatchPeelingDensestSubgraph()
                 ]
 
                 for algorithm in algorithms:
@@ -49,7 +50,8 @@ class EvaluateAlgorithms:
             CharikarsGreedyMinHeap(),
             GoldbergsMaxDensitySubgraph(),
             GreedyPlusPlus(),
-            GreedyPlusPlusPriorityQueue()
+            GreedyPlusPlusPriorityQueue(),
+            BatchPeelingDensestSubgraph()
         ]
 
         for algorithm in algorithms:
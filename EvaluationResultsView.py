@@ -1,10 +1,12 @@
+import json
 import os
 import uuid
 from datetime import datetime
 
-import matplotlib.pyplot as plt
 import networkx as nx
-from matplotlib.lines import Line2D
+import numpy as np
+
+from GraphLayout import GraphLayout
 
 
 class AlgorithmResultsViewer:
@@ -35,6 +37,17 @@ class AlgorithmResultsViewer:
     @staticmethod
     def display_please_wait():
         print("Please standby for the results of this experiment to be computed and displayed...")
+        print("(Press Ctrl+C to stop early and keep the best result found so far)")
+
+    @staticmethod
+    def display_progress(report, elapsed):
+        """Overwrite the current console line with the latest anytime progress report."""
+        upper_bound = f"{report['upper_bound']:.4f}" if report['upper_bound'] is not None else "?"
+        print(f"\r  {report['progress']:>6.1%} | density {report['lower_bound']:.4f} "
+              f"(optimum <= {upper_bound}) | {len(report['nodes'])} nodes | {elapsed:.1f} s",
+              end="", flush=True)
+        if report['progress'] >= 1.0:
+            print()
 
     @staticmethod
     def display_evaluation_results(algorithm_evaluator):
@@ -49,6 +62,14 @@ class AlgorithmResultsViewer:
         print("*** Experiment Results ***")
         print(f"Running Time: {algorithm_evaluator.running_time:.6f} seconds")
         print(f"Memory Usage: {algorithm_evaluator.memory_used:.2f} MB")
+        profile = algorithm_evaluator.memory_profile or {}
+        if profile.get('peak_traced_mb') is not None:
+            print(f"Peak Traced Python Memory: {profile['peak_traced_mb']:.2f} MB")
+        if profile.get('peak_uss_mb') is not None:
+            print(f"Peak USS Increase: {profile['peak_uss_mb']:.2f} MB")
+        if profile.get('structure_mb'):
+            print("Traced Memory at Peak: " + ", ".join(
+                f"{structure.replace('_', ' ')} {size:.2f} MB" for structure, size in profile['structure_mb'].items()))
         print(f"Identified Subgraph Size: {algorithm_evaluator.identified_subgraph_size} nodes")
         print(f"Identified Subgraph Density: {algorithm_evaluator.identified_subgraph_density:.6f}")
 
@@ -57,27 +78,92 @@ class AlgorithmResultsViewer:
             print(f"Optimal Density: {algorithm_evaluator.optimal_density:.6f}")
         else:
             print("Optimal Density: Unknown")
-        print(f"Densest Subgraph Similarity with Optimal: {algorithm_evaluator.optimal_nodes_overlap:.2f}%")
-        print(f"Overall Accuracy: {algorithm_evaluator.accuracy:.2f}%")
+        if algorithm_evaluator.certified_upper_bound is not None:
+            print(f"Certified Upper Bound on Optimal Density: {algorithm_evaluator.certified_upper_bound:.6f}")
+        if algorithm_evaluator.guaranteed_ratio is not None:
+            print(f"Guaranteed Approximation Ratio: {algorithm_evaluator.guaranteed_ratio * 100:.2f}%")
+        if algorithm_evaluator.optimal_nodes_overlap is not None:
+            print(f"Densest Subgraph Similarity with Optimal: {algorithm_evaluator.optimal_nodes_overlap:.2f}%")
+        elif algorithm_evaluator.stopped_early:
+            print("Densest Subgraph Similarity with Optimal: Unknown (exact solver skipped after the early stop)")
+        else:
+            print("Densest Subgraph Similarity with Optimal: Unknown (exact solver skipped, gap within tolerance)")
+        if algorithm_evaluator.accuracy is not None:
+            print(f"Overall Accuracy: {algorithm_evaluator.accuracy:.2f}%")
+        if algorithm_evaluator.stopped_early:
+            print("Stopped Early: yes (best result found before the stop)")
+        time_to_99 = algorithm_evaluator.time_to_quality(0.99)
+        if time_to_99 is not None:
+            print(f"Time to 99% of Optimal Density: {time_to_99:.6f} seconds")
+        for metric, value in (algorithm_evaluator.strategy_metrics or {}).items():
+            label = metric.replace('_', ' ').title()
+            print(f"{label}: {value:.6g}" if isinstance(value, float) else f"{label}: {value}")
         print("=" * 60)
 
     @staticmethod
     def draw_densest_component_zoom(
-            graph, densest_subgraph_nodes,  # ← unchanged
-            graph_name, algorithm_name, margin=2):
-
-        if not densest_subgraph_nodes:  # guard – unchanged
-            subgraph_to_draw = graph
-            nodes_to_draw = list(graph.nodes())
-        else:  # collect margin-hop neighbourhood
-            nodes_to_draw = set(densest_subgraph_nodes)
-            for _ in range(margin):
-                neighbours = set()
-                for v in nodes_to_draw:
-                    neighbours.update(graph.neighbors(v))
-                nodes_to_draw.update(neighbours)
-            subgraph_to_draw = graph.subgraph(nodes_to_draw)
+            graph, densest_subgraph_nodes,
+            graph_name, algorithm_name, margin=2,
+            max_nodes=1000, sample_by="edges", layout_iterations=50, label_limit=60,
+            image_format="png", dpi=None):
+        """
+        Draw the densest subgraph inside its margin-hop neighbourhood, next to the induced subgraph alone.
+
+        The neighbourhood is capped at max_nodes by GraphLayout.sample_neighbourhood, layouts come
+        from GraphLayout.layout (cached per dataset and node set), and nodes / edges are drawn as
+        matplotlib collections. Node labels are only drawn for panels with at most label_limit nodes.
 
+        Returns:
+            Path of the saved figure
+        """
+        zoom = AlgorithmResultsViewer.prepare_densest_component_zoom(
+            graph, densest_subgraph_nodes, margin, max_nodes, sample_by)
+        return AlgorithmResultsViewer.render_densest_component_zoom(
+            zoom, graph_name, algorithm_name, layout_iterations, label_limit, image_format, dpi)
+
+    @staticmethod
+    def prepare_densest_component_zoom(graph, densest_subgraph_nodes, margin=2, max_nodes=1000, sample_by="edges"):
+        """
+        Sample the neighbourhood to draw and cut it out of the dataset.
+
+        Returns:
+            Picklable dict with the induced subgraph to draw, the densest node set, the margin and the
+            size of the full neighbourhood, so rendering never needs the whole dataset
+        """
+        densest_subgraph_nodes = set(densest_subgraph_nodes)
+        if not densest_subgraph_nodes:  # no result: show a sample of the whole graph
+            seed_nodes = set(list(graph.nodes())[:1])
+            nodes_to_draw, full_size = GraphLayout.sample_neighbourhood(
+                graph, seed_nodes, graph.number_of_nodes(), max_nodes, sample_by)
+        else:
+            nodes_to_draw, full_size = GraphLayout.sample_neighbourhood(
+                graph, densest_subgraph_nodes, margin, max_nodes, sample_by)
+
+        subgraph = nx.Graph()
+        subgraph.add_nodes_from(nodes_to_draw)
+        subgraph.add_edges_from(graph.subgraph(nodes_to_draw).edges())
+        return {
+            'subgraph': subgraph,
+            'densest_subgraph_nodes': densest_subgraph_nodes,
+            'margin': margin,
+            'neighbourhood_size': full_size
+        }
+
+    @staticmethod
+    def render_densest_component_zoom(zoom, graph_name, algorithm_name, layout_iterations=50, label_limit=60,
+                                      image_format="png", dpi=None):
+        """Render and save a zoom prepared by prepare_densest_component_zoom. Returns the saved path."""
+        # matplotlib is imported by the drawing code only, it is the slowest import of the menu
+        import matplotlib.pyplot as plt
+        from matplotlib.lines import Line2D
+
+        graph = zoom['subgraph']
+        densest_subgraph_nodes = zoom['densest_subgraph_nodes']
+        margin = zoom['margin']
+        full_size = zoom['neighbourhood_size']
+        nodes_to_draw = set(graph.nodes())
+
+        subgraph_to_draw = graph
         densest_subgraph = graph.subgraph(densest_subgraph_nodes)
 
         # ─── figure with two side-by-side panels ────────────────────────────────
@@ -86,32 +172,22 @@ class AlgorithmResultsViewer:
                      fontsize=16, weight='bold')
 
         # -------- left: neighbourhood view -------------------------------------
-        pos_left = nx.spring_layout(subgraph_to_draw, seed=42)  # layout once
-        nx.draw_networkx_edges(subgraph_to_draw, pos_left,
-                               alpha=0.3, edge_color='lightgray',
-                               width=1, ax=ax_left)
-        densest_edges = [(u, v) for u, v in subgraph_to_draw.edges()
-                         if u in densest_subgraph_nodes and v in densest_subgraph_nodes]
-        nx.draw_networkx_edges(subgraph_to_draw, pos_left, edgelist=densest_edges,
-                               alpha=0.9, edge_color='red', width=2, ax=ax_left)
-
-        node_colours = ['red' if n in densest_subgraph_nodes else 'lightblue'
-                        for n in subgraph_to_draw.nodes()]
-        nx.draw_networkx_nodes(subgraph_to_draw, pos_left, node_color=node_colours,
-                               node_size=400, ax=ax_left)
-        nx.draw_networkx_labels(subgraph_to_draw, pos_left, font_size=8,
-                                font_weight='bold', ax=ax_left)
-        ax_left.set_title(f"Margin {margin} hops – {len(subgraph_to_draw)} nodes", fontsize=12)
+        pos_left = GraphLayout.layout(graph, nodes_to_draw, graph_name, layout_iterations)
+        other_edges = [(u, v) for u, v in subgraph_to_draw.edges()
+                       if u not in densest_subgraph_nodes or v not in densest_subgraph_nodes]
+        densest_edges = list(densest_subgraph.edges())
+        AlgorithmResultsViewer._draw_collections(
+            ax_left, pos_left, other_edges, densest_edges,
+            [n for n in subgraph_to_draw.nodes() if n not in densest_subgraph_nodes],
+            list(densest_subgraph_nodes), label_limit)
+        sampled = f" of {full_size} (sampled)" if len(nodes_to_draw) < full_size else ""
+        ax_left.set_title(f"Margin {margin} hops – {len(subgraph_to_draw)}{sampled} nodes", fontsize=12)
         ax_left.axis('off')
 
         # -------- right: induced densest subgraph ------------------------------
-        pos_right = nx.spring_layout(densest_subgraph, seed=42)
-        nx.draw_networkx_edges(densest_subgraph, pos_right,
-                               alpha=0.8, edge_color='red', width=2, ax=ax_right)
-        nx.draw_networkx_nodes(densest_subgraph, pos_right,
-                               node_color='red', node_size=400, ax=ax_right)
-        nx.draw_networkx_labels(densest_subgraph, pos_right, font_size=8,
-                                font_weight='bold', ax=ax_right)
+        pos_right = GraphLayout.layout(graph, densest_subgraph_nodes, graph_name, layout_iterations)
+        AlgorithmResultsViewer._draw_collections(
+            ax_right, pos_right, [], densest_edges, [], list(densest_subgraph_nodes), label_limit)
         ax_right.set_title(f"Induced densest subgraph – {len(densest_subgraph)} nodes",
                            fontsize=12)
         ax_right.axis('off')
@@ -127,12 +203,126 @@ class AlgorithmResultsViewer:
         ]
 
         fig.legend(handles=legend_items, loc='lower center', ncol=4)
-        AlgorithmResultsViewer.save_experiment_results_drawing(fig, graph_name, algorithm_name)
+        path = AlgorithmResultsViewer.save_experiment_results_drawing(fig, graph_name, algorithm_name,
+                                                                      image_format, dpi)
 
         plt.close(fig)  # free GUI backend
+        return path
+
+    @staticmethod
+    def _draw_collections(ax, positions, other_edges, densest_edges, other_nodes, densest_nodes, label_limit):
+        """Draw edges as LineCollections and nodes as scatter plots, sizing markers to the node count."""
+        from matplotlib.collections import LineCollection
+
+        num_nodes = len(other_nodes) + len(densest_nodes)
+        node_size = 400 if num_nodes <= label_limit else max(4.0, 4000.0 / num_nodes)
+
+        if other_edges:
+            ax.add_collection(LineCollection([(positions[u], positions[v]) for u, v in other_edges],
+                                             colors='lightgray', linewidths=1, alpha=0.3, zorder=1))
+        if densest_edges:
+            ax.add_collection(LineCollection([(positions[u], positions[v]) for u, v in densest_edges],
+                                             colors='red', linewidths=2 if num_nodes <= label_limit else 0.5,
+                                             alpha=0.9 if num_nodes <= label_limit else 0.4, zorder=2))
+        for nodes, colour in ((other_nodes, 'lightblue'), (densest_nodes, 'red')):
+            if nodes:
+                xy = np.array([positions[n] for n in nodes])
+                ax.scatter(xy[:, 0], xy[:, 1], s=node_size, c=colour, linewidths=0, zorder=3)
+
+        if num_nodes <= label_limit:
+            for node in list(other_nodes) + list(densest_nodes):
+                ax.annotate(str(node), positions[node], ha='center', va='center',
+                            fontsize=8, fontweight='bold', zorder=4)
+        ax.autoscale_view()
 
     @staticmethod
-    def save_experiment_results_drawing(fig, graph_name, algorithm_name):
+    def display_scaling_results(curves):
+        print("*** Scaling Benchmark Results ***")
+        for curve in curves:
+            time_exponent = "n/a" if curve['time_exponent'] is None else f"{curve['time_exponent']:.2f}"
+            memory_exponent = "n/a" if curve['memory_exponent'] is None else f"{curve['memory_exponent']:.2f}"
+            largest = curve['points'][-1]['edges'] if curve['points'] else 0
+            print(f"{curve['algorithm_name']}: time ∝ m^{time_exponent}, memory ∝ m^{memory_exponent}, "
+                  f"largest sample {largest} edges" + (" (stopped by budget)" if curve['stopped_early'] else ""))
+        print("=" * 60)
+
+    @staticmethod
+    def draw_scaling_curves(curves, graph_name):
+        """
+        Plot running time and peak memory against sample size (edges) on log-log axes.
+
+        Parameters:
+        -----------
+        curves : list of dict
+            Scaling curves as returned by ScalingBenchmark.run
+        graph_name : str
+            Name of the sampled dataset
+        """
+        import matplotlib.pyplot as plt
+
+        fig, (ax_time, ax_memory) = plt.subplots(1, 2, figsize=(14, 6))
+        fig.suptitle(f"{graph_name} – scaling curves", fontsize=16, weight='bold')
+
+        for curve in curves:
+            edges = [p['edges'] for p in curve['points']]
+            if not edges:
+                continue
+            label = curve['algorithm_name']
+            if curve['time_exponent'] is not None:
+                label += f" (α={curve['time_exponent']:.2f})"
+            ax_time.loglog(edges, [p['running_time'] for p in curve['points']], marker='o', label=label)
+            traced = [p for p in curve['points'] if p['peak_memory'] is not None]
+            ax_memory.loglog([p['edges'] for p in traced], [p['peak_memory'] for p in traced], marker='o',
+                             label=curve['algorithm_name'])
+
+        ax_time.set_xlabel("edges in sample")
+        ax_time.set_ylabel("running time (s)")
+        ax_time.set_title("Time ∝ m^α", fontsize=12)
+        ax_time.legend(fontsize=8)
+        ax_memory.set_xlabel("edges in sample")
+        ax_memory.set_ylabel("peak traced memory (MB)")
+        ax_memory.set_title("Peak memory", fontsize=12)
+        ax_memory.legend(fontsize=8)
+
+        AlgorithmResultsViewer.save_experiment_results_drawing(fig, graph_name, "Scaling Curves")
+        plt.close(fig)
+
+    @staticmethod
+    def save_memory_profile(memory_profile, graph_name, algorithm_name):
+        """
+        Save an evaluation's memory profile (peaks, attribution and sampled series) as JSON under
+        experiment_results, named like the result drawings.
+
+        Returns:
+            Absolute path of the saved file
+        """
+        folder = "experiment_results"
+        os.makedirs(folder, exist_ok=True)
+        ts = datetime.now().strftime("%Y%m%d_%H%M%S")
+        # the suffix keeps profiles saved within the same second apart
+        filename = (f"{ts}_{graph_name.replace(' ', '_')}_{algorithm_name.replace(' ', '_')}_"
+                    f"{uuid.uuid4().hex[:8]}_memory.json")
+        path = os.path.abspath(os.path.join(folder, filename))
+        with open(path, 'w') as profile_file:
+            json.dump(memory_profile, profile_file)
+        print(f"🧠 Memory profile saved to: {path}")
+        return path
+
+    @staticmethod
+    def save_experiment_results_drawing(fig, graph_name, algorithm_name, image_format="png", dpi=None):
+        """
+        Save a figure under experiment_results with a timestamped, uniquely suffixed name.
+
+        Args:
+            fig: Matplotlib figure
+            graph_name: Dataset name used in the file name
+            algorithm_name: Algorithm (or plot) name used in the file name
+            image_format: File format understood by matplotlib, e.g. "png", "svg" or "pdf"
+            dpi: Resolution in dots per inch, or None for matplotlib's default
+
+        Returns:
+            Absolute path of the saved file
+        """
         folder = "experiment_results"
         os.makedirs(folder, exist_ok=True)
 
@@ -143,11 +333,13 @@ class AlgorithmResultsViewer:
         gname = graph_name.replace(" ", "_")
         aname = algorithm_name.replace(" ", "_")
 
-        filename = f"{ts}_{gname}_{aname}.png"
+        # render workers save concurrently, so figures from the same second need a unique suffix
+        filename = f"{ts}_{gname}_{aname}_{uuid.uuid4().hex[:8]}.{image_format}"
         path = os.path.join(folder, filename)
         abs_path = os.path.abspath(path)
 
-        fig.savefig(path)
+        fig.savefig(path, format=image_format, dpi=dpi)
         print(f"📊 Identified Densest Subgraph Graph Drawing saved to: {abs_path}")
+        return abs_path
 
 
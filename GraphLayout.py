@@ -0,0 +1,180 @@
+import hashlib
+import os
+
+import numpy as np
+
+
+class GraphLayout:
+    """Bounded-size neighbourhood sampling and cached, vectorised force-directed layouts for drawings."""
+
+    CACHE_FOLDER = ".layout_cache"
+
+    # layouts computed in this process, keyed like the files in CACHE_FOLDER
+    _memory_cache = {}
+
+    @staticmethod
+    def sample_neighbourhood(graph, core_nodes, margin=2, max_nodes=1000, sample_by="edges", seed=42):
+        """
+        Expand core_nodes by up to margin hops, keeping at most max_nodes nodes in total.
+
+        When a hop offers more neighbours than the remaining budget, the best-connected ones are
+        kept: sample_by="edges" ranks them by edges into the nodes collected so far, "degree" by
+        their degree in graph. Ties are broken randomly with the given seed.
+
+        Args:
+            graph: Undirected NetworkX graph
+            core_nodes: Nodes that are always kept (the densest subgraph)
+            margin: Number of hops to expand
+            max_nodes: Node budget of the sample (core nodes always count towards it)
+            sample_by: "edges" or "degree"
+            seed: Seed for tie breaking
+
+        Returns:
+            (sampled node set, size of the full margin-hop neighbourhood)
+        """
+        if sample_by not in ("edges", "degree"):
+            raise ValueError(f"Unknown neighbourhood sampling mode: {sample_by}")
+        rng = np.random.default_rng(seed)
+        nodes = set(core_nodes)
+        frontier = set(nodes)
+
+        for _ in range(margin):
+            candidates = list(dict.fromkeys(neighbour for v in frontier for neighbour in graph.neighbors(v)
+                                            if neighbour not in nodes))
+            if not candidates:
+                break
+            budget = max_nodes - len(nodes)
+            if len(candidates) > budget:
+                # a candidate dropped in an earlier hop can also have edges into earlier hops
+                scores = np.array([sum(1 for x in graph.neighbors(v) if x in nodes) if sample_by == "edges"
+                                   else graph.degree(v) for v in candidates], dtype=np.float64)
+                # lexsort uses the last key first: highest score, then a random tie break
+                ranked = np.lexsort((rng.random(len(candidates)), -scores))
+                candidates = [candidates[i] for i in ranked[:max(budget, 0)]]
+            nodes.update(candidates)
+            frontier = set(candidates)
+
+        # the full neighbourhood is only counted: a truncated hop also reaches fewer nodes next hop
+        reached = set(core_nodes)
+        frontier = set(reached)
+        for _ in range(margin):
+            frontier = {neighbour for v in frontier for neighbour in graph.neighbors(v) if neighbour not in reached}
+            if not frontier:
+                break
+            reached.update(frontier)
+
+        return nodes, len(reached)
+
+    @staticmethod
+    def spring_layout(num_nodes, sources, targets, iterations=50, seed=42, chunk_size=1024):
+        """
+        Fruchterman-Reingold layout with numpy, running a fixed number of iterations.
+
+        Repulsion is evaluated in row chunks of chunk_size, so memory stays O(chunk_size * n).
+
+        Args:
+            num_nodes: Number of nodes, indexed 0 .. num_nodes - 1
+            sources: Edge source indices
+            targets: Edge target indices
+            iterations: Number of force iterations
+            seed: Seed for the initial positions
+            chunk_size: Rows of the pairwise repulsion evaluated at once
+
+        Returns:
+            (num_nodes, 2) array of positions scaled to [-1, 1]
+        """
+        rng = np.random.default_rng(seed)
+        positions = rng.random((num_nodes, 2))
+        if num_nodes <= 1:
+            return positions * 0.0
+        sources = np.asarray(sources, dtype=np.int64)
+        targets = np.asarray(targets, dtype=np.int64)
+
+        k = 1.0 / np.sqrt(num_nodes)
+        temperature = 0.1
+        cooling = temperature / (iterations + 1)
+
+        for _ in range(iterations):
+            displacement = np.zeros_like(positions)
+            for start in range(0, num_nodes, chunk_size):
+                delta = positions[start:start + chunk_size, None, :] - positions[None, :, :]
+                distance_squared = np.maximum(np.einsum('ijk,ijk->ij', delta, delta), 1e-4)
+                displacement[start:start + chunk_size] = np.einsum('ijk,ij->ik', delta, k * k / distance_squared)
+
+            delta = positions[sources] - positions[targets]
+            distance = np.maximum(np.linalg.norm(delta, axis=1), 1e-2)
+            attraction = delta * (distance / k)[:, None]
+            np.subtract.at(displacement, sources, attraction)
+            np.add.at(displacement, targets, attraction)
+
+            length = np.maximum(np.linalg.norm(displacement, axis=1), 1e-9)
+            positions += displacement * (np.minimum(length, temperature) / length)[:, None]
+            temperature -= cooling
+
+        positions -= positions.mean(axis=0)
+        scale = np.abs(positions).max()
+        return positions / scale if scale > 0 else positions
+
+    @staticmethod
+    def cache_key(graph_name, graph, nodes, iterations, seed):
+        """Key of a layout: dataset name, node set, its edge count and the layout parameters."""
+        digest = hashlib.sha1()
+        digest.update(repr((graph_name, iterations, seed, graph.subgraph(nodes).number_of_edges())).encode())
+        for node in sorted(map(str, nodes)):
+            digest.update(node.encode())
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    @staticmethod
+    def layout(graph, nodes, graph_name, iterations=50, seed=42, use_disk_cache=True):
+        """
+        Positions for the subgraph induced by nodes, cached in memory and under CACHE_FOLDER.
+
+        Args:
+            graph: Undirected NetworkX graph
+            nodes: Nodes to lay out
+            graph_name: Dataset name, part of the cache key
+            iterations: Number of force iterations
+            seed: Seed for the initial positions
+            use_disk_cache: Also read and write layouts in CACHE_FOLDER
+
+        Returns:
+            Dict mapping node -> (x, y) array
+        """
+        ordered_nodes = sorted(nodes, key=str)
+        key = GraphLayout.cache_key(graph_name, graph, ordered_nodes, iterations, seed)
+        path = os.path.join(GraphLayout.CACHE_FOLDER, f"{key}.npy")
+
+        positions = GraphLayout._memory_cache.get(key)
+        if positions is None and use_disk_cache and os.path.exists(path):
+            try:
+                positions = np.load(path)
+            except Exception as e:
+                print(f"Error reading cached layout {path}: {e}")
+        if positions is None or len(positions) != len(ordered_nodes):
+            index = {node: i for i, node in enumerate(ordered_nodes)}
+            edges = np.array([(index[u], index[v]) for u, v in graph.subgraph(ordered_nodes).edges() if u != v],
+                             dtype=np.int64).reshape(-1, 2)
+            positions = GraphLayout.spring_layout(len(ordered_nodes), edges[:, 0], edges[:, 1], iterations, seed)
+            if use_disk_cache:
+                os.makedirs(GraphLayout.CACHE_FOLDER, exist_ok=True)
+                np.save(path, positions)
+        GraphLayout._memory_cache[key] = positions
+
+        return {node: positions[i] for i, node in enumerate(ordered_nodes)}
+
+
+# Usage
+if __name__ == "__main__":
+    import time
+    from GraphLoader import GraphLoader
+
+    graph = GraphLoader.load_graph("datasets/hamsterster.txt")
+    core = {node for node, degree in graph.degree() if degree > 100}
+    nodes, full_size = GraphLayout.sample_neighbourhood(graph, core)
+    print(f"Sampled {len(nodes)} of {full_size} neighbourhood nodes")
+
+    for attempt in ("first call", "second call"):
+        start_time = time.perf_counter()
+        GraphLayout.layout(graph, nodes, "Hamsterster")
+        print(f"Layout ({attempt}) in {time.perf_counter() - start_time:.3f} s")
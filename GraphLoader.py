@@ -81,29 +81,85 @@ import networkx as nx
 #     graph1, nodes1, edges1 = load_graph(file_path)
 
 import networkx as nx
-from typing import Optional
+import numpy as np
+from typing import Iterator, Optional, Tuple
+
+from CompactGraph import CompactDirectedGraph
 
 
 class GraphLoader:
     """Loads graphs from tab-separated edge list files."""
 
     @staticmethod
-    def load_graph(file_path: str) -> Optional[nx.Graph]:
+    def load_graph(file_path: str, directed: bool = False, weighted: bool = False) -> Optional[nx.Graph]:
         """
         Load a NetworkX graph from a tab-separated edge list file.
 
         Args:
             file_path: Path to tab-separated edge list file
+            directed: Keep edge direction and return a DiGraph (u -> v for each line "u v")
+            weighted: Read a third column as the float edge attribute 'weight' (lines without it weigh 1.0)
 
         Returns:
-            NetworkX Graph object or None if loading fails
+            NetworkX Graph (or DiGraph) object or None if loading fails
         """
         try:
-            return nx.read_edgelist(file_path, nodetype=int)
+            graph = nx.read_edgelist(file_path, nodetype=int,
+                                     create_using=nx.DiGraph if directed else nx.Graph,
+                                     data=(('weight', float),) if weighted else True)
+            graph.graph['weighted'] = weighted
+            return graph
         except Exception as e:
             print(f"Error loading graph from {file_path}: {e}")
             return None
 
+    @staticmethod
+    def load_directed_arrays(file_path: str) -> Optional[CompactDirectedGraph]:
+        """
+        Load an edge list file as compact directed in/out adjacency arrays without building a NetworkX graph.
+
+        Args:
+            file_path: Path to whitespace-separated edge list file
+
+        Returns:
+            CompactDirectedGraph or None if loading fails
+        """
+        try:
+            edges = np.loadtxt(file_path, dtype=np.int64, usecols=(0, 1), ndmin=2)
+            return CompactDirectedGraph.from_edge_array(edges)
+        except Exception as e:
+            print(f"Error loading directed arrays from {file_path}: {e}")
+            return None
+
+
+    @staticmethod
+    def stream_edges(file_path: str) -> Iterator[Tuple[int, int]]:
+        """
+        Stream (u, v) node pairs from an edge list file one line at a time without building a graph.
+
+        Blank lines and '#' / '%' comment lines are skipped, and extra columns are ignored.
+
+        Args:
+            file_path: Path to whitespace-separated edge list file
+
+        Yields:
+            (u, v) integer node pairs in file order
+
+        Raises:
+            OSError: The file cannot be read
+            ValueError: A line has a non-integer node id
+        """
+        try:
+            with open(file_path, 'r') as edge_file:
+                for line in edge_file:
+                    fields = line.split()
+                    if len(fields) < 2 or fields[0][0] in '#%':
+                        continue
+                    yield int(fields[0]), int(fields[1])
+        except (OSError, ValueError) as e:
+            # a truncated stream would look like a smaller graph to the caller, so the error is re-raised
+            print(f"Error streaming edges from {file_path}: {e}")
+            raise
 
 # Usage
 if __name__ == "__main__":
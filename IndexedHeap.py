@@ -0,0 +1,244 @@
+from array import array
+
+
+class IndexedDaryHeap:
+    """Indexed d-ary min-heap over the items 0 .. capacity - 1, stored in flat arrays.
+
+    Keys, heap order and each item's heap position live in three array.array buffers, so a heap
+    of n items costs about 24 n bytes instead of one Python object per entry. The position index
+    makes decrease_key, increase_key and remove O(log_d n) without stale duplicate entries.
+    Equal keys are ordered by item index, so pops are deterministic.
+    """
+
+    def __init__(self, capacity, arity=4, typecode='q'):
+        """
+        Args:
+            capacity: Number of items; items are the integers 0 .. capacity - 1
+            arity: Children per heap node (4 keeps the tree shallow and sift_down cheap)
+            typecode: array typecode of the keys, 'q' for integer and 'd' for float priorities
+        """
+        if arity < 2:
+            raise ValueError(f"Heap arity must be at least 2, got {arity}")
+        self.arity = arity
+        self.capacity = capacity
+        self.keys = array(typecode, [0]) * capacity
+        self.heap = array('q', [0]) * capacity
+        self.positions = array('q', [-1]) * capacity  # -1 for items not in the heap
+        self.size = 0
+
+    @staticmethod
+    def from_keys(keys, arity=4, typecode='q'):
+        """Heap holding every item i with priority keys[i], built bottom-up in O(n)."""
+        keys = array(typecode, keys)
+        heap = IndexedDaryHeap(len(keys), arity, typecode)
+        heap.keys = keys
+        heap.heap = array('q', range(len(keys)))
+        heap.positions = array('q', range(len(keys)))
+        heap.size = len(keys)
+        for position in range((heap.size - 2) // arity, -1, -1):
+            heap._sift_down(position)
+        return heap
+
+    def __len__(self):
+        return self.size
+
+    def __bool__(self):
+        return self.size > 0
+
+    def __contains__(self, item):
+        return 0 <= item < self.capacity and self.positions[item] >= 0
+
+    def key(self, item):
+        """Current priority of an item in the heap."""
+        if item not in self:
+            raise KeyError(item)
+        return self.keys[item]
+
+    def peek(self):
+        """(item, key) with the smallest key, without removing it."""
+        if not self.size:
+            raise IndexError("peek from an empty heap")
+        item = self.heap[0]
+        return item, self.keys[item]
+
+    def push(self, item, key):
+        """Insert an item that is not in the heap."""
+        if item in self:
+            raise ValueError(f"Item {item} is already in the heap")
+        self.keys[item] = key
+        self.heap[self.size] = item
+        self.positions[item] = self.size
+        self.size += 1
+        self._sift_up(self.size - 1)
+
+    def pop(self):
+        """Remove and return (item, key) with the smallest key."""
+        if not self.size:
+            raise IndexError("pop from an empty heap")
+        heap = self.heap
+        item = heap[0]
+        self.size -= 1
+        self.positions[item] = -1
+        if self.size:
+            last = heap[self.size]
+            heap[0] = last
+            self.positions[last] = 0
+            self._sift_down(0)
+        return item, self.keys[item]
+
+    def remove(self, item):
+        """Remove an item from anywhere in the heap and return its key."""
+        position = self.positions[item] if 0 <= item < self.capacity else -1
+        if position < 0:
+            raise KeyError(item)
+        key = self.keys[item]
+        self.size -= 1
+        self.positions[item] = -1
+        if position != self.size:
+            last = self.heap[self.size]
+            self.heap[position] = last
+            self.positions[last] = position
+            self._sift_up(position)
+            self._sift_down(self.positions[last])
+        return key
+
+    def decrease_key(self, item, key):
+        """Lower the priority of an item; raises ValueError if key is larger than the current one."""
+        if key > self.key(item):
+            raise ValueError(f"New key {key} is larger than the current key {self.keys[item]}")
+        self.keys[item] = key
+        self._sift_up(self.positions[item])
+
+    def increase_key(self, item, key):
+        """Raise the priority of an item; raises ValueError if key is smaller than the current one."""
+        if key < self.key(item):
+            raise ValueError(f"New key {key} is smaller than the current key {self.keys[item]}")
+        self.keys[item] = key
+        self._sift_down(self.positions[item])
+
+    def update(self, item, key):
+        """Set the priority of an item in either direction, inserting it if it is missing."""
+        if item not in self:
+            self.push(item, key)
+        elif key < self.keys[item]:
+            self.keys[item] = key
+            self._sift_up(self.positions[item])
+        else:
+            self.keys[item] = key
+            self._sift_down(self.positions[item])
+
+    def _sift_up(self, position):
+        heap, keys, positions, arity = self.heap, self.keys, self.positions, self.arity
+        item = heap[position]
+        key = keys[item]
+        while position > 0:
+            parent_position = (position - 1) // arity
+            parent = heap[parent_position]
+            parent_key = keys[parent]
+            if parent_key < key or (parent_key == key and parent < item):
+                break
+            heap[position] = parent
+            positions[parent] = position
+            position = parent_position
+        heap[position] = item
+        positions[item] = position
+
+    def _sift_down(self, position):
+        heap, keys, positions, arity, size = self.heap, self.keys, self.positions, self.arity, self.size
+        item = heap[position]
+        key = keys[item]
+        while True:
+            first_child = arity * position + 1
+            if first_child >= size:
+                break
+            # smallest (key, item) among the children
+            best_position = first_child
+            best = heap[first_child]
+            best_key = keys[best]
+            for child_position in range(first_child + 1, min(first_child + arity, size)):
+                child = heap[child_position]
+                child_key = keys[child]
+                if child_key < best_key or (child_key == best_key and child < best):
+                    best_position, best, best_key = child_position, child, child_key
+            if key < best_key or (key == best_key and item < best):
+                break
+            heap[position] = best
+            positions[best] = position
+            position = best_position
+        heap[position] = item
+        positions[item] = position
+
+
+# Usage
+if __name__ == "__main__":
+    import heapq
+    import random
+    import time
+    import tracemalloc
+
+    from dsd.fibheap import FibonacciHeap
+
+    # peel-like workload: every pop is followed by a few decrease-key operations on live items
+    num_items, updates_per_pop = 50_000, 4
+    rng = random.Random(42)
+    initial_keys = [rng.randrange(1, 1000) for _ in range(num_items)]
+    workload = [[rng.randrange(num_items) for _ in range(updates_per_pop)] for _ in range(num_items)]
+
+    def build_indexed_heap():
+        return IndexedDaryHeap.from_keys(initial_keys)
+
+    def run_indexed_heap():
+        heap = build_indexed_heap()
+        for updates in workload:
+            heap.pop()
+            for item in updates:
+                if item in heap and heap.keys[item] > 0:
+                    heap.decrease_key(item, heap.keys[item] - 1)
+
+    def build_fibonacci_heap():
+        heap = FibonacciHeap()
+        return heap, [heap.insert(key, item) for item, key in enumerate(initial_keys)]
+
+    def run_fibonacci_heap():
+        heap, entries = build_fibonacci_heap()
+        alive = [True] * num_items
+        for updates in workload:
+            alive[heap.extract_min().value] = False
+            for item in updates:
+                if alive[item] and entries[item].key > 0:
+                    heap.decrease_key(entries[item], entries[item].key - 1)
+
+    def build_lazy_heapq():
+        heap = [(key, item) for item, key in enumerate(initial_keys)]
+        heapq.heapify(heap)
+        return heap
+
+    def run_lazy_heapq():
+        keys = list(initial_keys)
+        heap = build_lazy_heapq()
+        alive = [True] * num_items
+        for updates in workload:
+            while True:  # skip stale duplicates
+                key, item = heapq.heappop(heap)
+                if alive[item] and keys[item] == key:
+                    break
+            alive[item] = False
+            for item in updates:
+                if alive[item] and keys[item] > 0:
+                    keys[item] -= 1
+                    heapq.heappush(heap, (keys[item], item))
+
+    print(f"{num_items} pops with {updates_per_pop} decrease-key attempts each")
+    for name, build, run in [("IndexedDaryHeap", build_indexed_heap, run_indexed_heap),
+                             ("dsd FibonacciHeap", build_fibonacci_heap, run_fibonacci_heap),
+                             ("heapq with stale entries", build_lazy_heapq, run_lazy_heapq)]:
+        start_time = time.perf_counter()
+        run()
+        running_time = time.perf_counter() - start_time
+        # traced separately: tracemalloc slows down every boxed integer read from an array
+        tracemalloc.start()
+        structure = build()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del structure
+        print(f"  {name:<26} {running_time:7.3f} s, {peak / 1024 / 1024:7.2f} MB to build")
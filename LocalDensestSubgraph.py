@@ -0,0 +1,208 @@
+import networkx as nx
+import numpy as np
+
+from AlgorithmStrategy import AlgorithmStrategy as AlgoStrat, DensityProfile, WeightedCharikarsGreedy
+from CompactGraph import CompactGraph
+from IndexedHeap import IndexedDaryHeap
+
+
+class LocalDensestSubgraph:
+    """Densest subgraph around seed nodes, found without processing the whole graph.
+
+    The search only reads adjacency lists of nodes it grows into, and every read counts its
+    degree towards max_edges, so the work is bounded by the budget instead of the graph size:
+      * grow: starting from the seeds, repeatedly add the frontier node with the most edges into
+        the grown set (an indexed max-heap of those counts), until the best frontier node has
+        fewer than expansion_ratio times the best density seen so far, or the budget runs out;
+        a node whose adjacency list does not fit in the remaining budget is skipped,
+      * peel: Charikar's peel of the grown region with the seeds pinned (peeled last), so every
+        peel set of at least len(seeds) nodes contains all seeds; the best of those, or of the
+        grown prefixes, is kept,
+      * flow (method="flow"): the peel answer is refined to the exact densest subgraph of the
+        grown region containing the seeds, by Goldberg cuts with the seeds fixed on the source side.
+    With contain_seeds=False the seeds are not pinned and the answer only has to be near them.
+    """
+
+    METHODS = ("greedy", "flow")
+
+    def __init__(self, max_edges=50_000, method="greedy", contain_seeds=True, expansion_ratio=0.5, max_nodes=None):
+        """
+        Args:
+            max_edges: Adjacency entries the search may read (a node of degree d costs d)
+            method: "greedy" (grow and peel) or "flow" (grow, peel and refine with flow cuts)
+            contain_seeds: Only consider subgraphs containing every seed
+            expansion_ratio: Growth stops once the best frontier node has fewer edges into the grown
+                set than expansion_ratio * best density; adding a node raises the density only when
+                it has more than the density, so values below 1 let growth cross sparser layers
+            max_nodes: Optional cap on the grown region
+        """
+        if method not in LocalDensestSubgraph.METHODS:
+            raise ValueError(f"Unknown local search method: {method}")
+        self.max_edges = max_edges
+        self.method = method
+        self.contain_seeds = contain_seeds
+        self.expansion_ratio = expansion_ratio
+        self.max_nodes = max_nodes
+        self.explored_edges = 0
+        self.region_size = 0
+        self.budget_exhausted = False
+        self.flow_cuts = 0
+
+    def grow(self, graph, seeds):
+        """
+        Grow a region around the seeds within the edge budget.
+
+        Returns:
+            (region nodes in the order they were added, seeds first,
+             number of added nodes after which the grown prefix was densest)
+        """
+        seeds = list(dict.fromkeys(seeds))
+        capacity = min(graph.number_of_nodes(), self.max_edges + len(seeds))
+        heap = IndexedDaryHeap(capacity)  # keys are minus the edges into the region
+        node_list = []
+        node_index = {}
+        region = []
+        in_region = set()
+        internal_edges = 0
+        best_density, best_prefix = -1.0, len(seeds)
+        self.explored_edges = 0
+        self.budget_exhausted = False
+
+        def add(node):
+            region.append(node)
+            in_region.add(node)
+            if node in node_index and node_index[node] in heap:
+                heap.remove(node_index[node])  # a seed next to an earlier seed
+            self.explored_edges += graph.degree(node)
+            for neighbour in graph.neighbors(node):
+                if neighbour in in_region:
+                    continue
+                if neighbour not in node_index:
+                    if len(node_list) == capacity:
+                        continue  # only when seeds are much denser than the budget
+                    node_index[neighbour] = len(node_list)
+                    node_list.append(neighbour)
+                    heap.push(node_index[neighbour], -1)
+                elif node_index[neighbour] in heap:
+                    heap.decrease_key(node_index[neighbour], heap.key(node_index[neighbour]) - 1)
+                else:
+                    continue  # skipped earlier for its degree
+
+        for seed in seeds:
+            add(seed)
+        internal_edges = graph.subgraph(seeds).number_of_edges()
+        best_density = internal_edges / len(region)
+
+        max_nodes = self.max_nodes if self.max_nodes is not None else graph.number_of_nodes()
+        while heap and len(region) < max_nodes:
+            i, key = heap.peek()
+            if -key < self.expansion_ratio * best_density:
+                break
+            heap.pop()
+            node = node_list[i]
+            if self.explored_edges + graph.degree(node) > self.max_edges:
+                self.budget_exhausted = True
+                continue
+            internal_edges += -key
+            add(node)
+            if internal_edges / len(region) > best_density:
+                best_density, best_prefix = internal_edges / len(region), len(region)
+        return region, best_prefix
+
+    def find(self, graph, seeds):
+        """
+        Args:
+            graph: Undirected NetworkX graph (not modified)
+            seeds: Seed nodes of the query
+
+        Returns:
+            (node set, density)
+        """
+        seeds = list(dict.fromkeys(seeds))
+        missing = [seed for seed in seeds if seed not in graph]
+        if missing:
+            raise ValueError(f"Seed nodes not in the graph: {missing[:10]}")
+        if not seeds:
+            raise ValueError("A local query needs at least one seed")
+        self.flow_cuts = 0
+
+        region, best_prefix = self.grow(graph, seeds)
+        self.region_size = len(region)
+        region_graph = graph.subgraph(region)
+        best_nodes = set(region[:best_prefix])
+        best_density = AlgoStrat.subgraph_density(region_graph, best_nodes)
+
+        compact = CompactGraph.from_networkx(region_graph)
+        priorities = None
+        if self.contain_seeds:
+            pinned = set(seeds)
+            # larger than any degree, so seeds are peeled after every other node
+            priorities = np.array([compact.num_edges + 1 if node in pinned else 0 for node in compact.node_labels],
+                                  dtype=np.float64)
+        order, removal_degrees, _, _ = WeightedCharikarsGreedy.peel(compact, priorities)
+        profile = DensityProfile(compact, order, removal_degrees)
+        smallest = len(seeds) if self.contain_seeds else 1
+        if profile.best_density(smallest) > best_density:
+            best_nodes, best_density = set(profile.nodes(smallest)), profile.best_density(smallest)
+
+        if self.method == "flow":
+            best_nodes = self._refine(region_graph, seeds if self.contain_seeds else [], best_nodes)
+            best_density = AlgoStrat.subgraph_density(region_graph, best_nodes)
+        return best_nodes, best_density
+
+    def _refine(self, graph, pinned, nodes):
+        """Densest subgraph of graph containing pinned, starting from nodes (Dinkelbach style Goldberg cuts).
+
+        A cut at density g minimises m |V| + 2 g |S| - 2 e(S) over source sides S; infinite source
+        capacities keep the pinned nodes in S, so the cut returns a denser set containing them or
+        proves g optimal.
+        """
+        degrees = dict(graph.degree())
+        big = max(degrees.values(), default=0) + 1
+        g = AlgoStrat.subgraph_density(graph, nodes)
+        pinned = set(pinned)
+        while True:
+            flow_graph = nx.DiGraph()
+            flow_graph.add_nodes_from(['s', 't'])
+            for u, v in graph.edges():
+                flow_graph.add_edge(u, v, capacity=1)
+                flow_graph.add_edge(v, u, capacity=1)
+            for v in graph.nodes:
+                if v in pinned:
+                    flow_graph.add_edge('s', v)  # no capacity attribute: infinite
+                else:
+                    flow_graph.add_edge('s', v, capacity=big)
+                flow_graph.add_edge(v, 't', capacity=big + 2 * g - degrees[v])
+
+            self.flow_cuts += 1
+            _, (source_side, _) = nx.minimum_cut(flow_graph, 's', 't')
+            candidate = source_side - {'s'}
+            if not candidate or AlgoStrat.subgraph_density(graph, candidate) <= g + 1e-12:
+                return nodes
+            nodes = candidate
+            g = AlgoStrat.subgraph_density(graph, nodes)
+
+    def get_metrics(self):
+        """Work done by the last query."""
+        return {
+            'explored_edges': self.explored_edges,
+            'region_size': self.region_size,
+            'budget_exhausted': self.budget_exhausted,
+            'flow_cuts': self.flow_cuts
+        }
+
+
+# Usage
+if __name__ == "__main__":
+    import time
+
+    from GraphLoader import GraphLoader
+
+    graph = GraphLoader.load_graph("datasets/hamsterster.txt")
+    seed = max(graph.nodes, key=graph.degree)
+    for method in LocalDensestSubgraph.METHODS:
+        local = LocalDensestSubgraph(max_edges=20_000, method=method)
+        start_time = time.perf_counter()
+        nodes, density = local.find(graph, [seed])
+        print(f"{method}: {len(nodes)} nodes, density {density:.4f} in {time.perf_counter() - start_time:.2f} s, "
+              f"{local.get_metrics()}")
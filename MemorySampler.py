@@ -0,0 +1,230 @@
+import ast
+import os
+import threading
+import time
+import tracemalloc
+
+import psutil
+
+
+class MemorySampler:
+    """Samples process memory from a background thread while a block of code runs.
+
+    Every interval seconds the thread records RSS, USS (optional, reading it is slower) and the
+    memory currently traced by tracemalloc, so transient peaks, e.g. flow networks that are freed
+    after every binary-search step, show up in the peak and in the time series. RSS and USS are
+    recorded without tracemalloc's own bookkeeping, which otherwise dominates them.
+
+    Traced memory is also attributed to structures: whenever traced memory grows past the last
+    snapshot by snapshot_growth, a tracemalloc snapshot is taken, and the largest one is grouped
+    by STRUCTURE_CATEGORIES when sampling stops. A trace belongs to the first category whose
+    pattern occurs in any of its frames, written as "path/to/file.py:Class.function".
+    """
+
+    # checked in order; traces matching none are counted as "other"
+    STRUCTURE_CATEGORIES = {
+        'flow_network': ('networkx/algorithms/flow/', 'GoldbergsMaxDensitySubgraph.iter_algorithm',
+                         'DirectedGoldbergApprox', 'dsd/dsp.py'),
+        'heap': ('IndexedHeap.py', 'dsd/fibheap.py', 'heapq.py'),
+        'graph': ('networkx/classes/', 'networkx/convert', 'CompactGraph.py', 'GraphLoader.py'),
+    }
+
+    # filename -> [(first line, last line, qualified name)] of its functions and classes
+    _function_index = {}
+
+    def __init__(self, interval=0.02, sample_uss=True, trace_python=True, attribute_structures=True,
+                 traceback_depth=3, snapshot_growth=1.25):
+        """
+        Args:
+            interval: Seconds between samples
+            sample_uss: Also sample USS (unique set size); more accurate than RSS but slower to read
+            trace_python: Record tracemalloc's traced and peak Python allocations
+            attribute_structures: Attribute the peak traced memory to STRUCTURE_CATEGORIES
+            traceback_depth: Frames stored per traced allocation, used for the attribution; tracing
+                cost grows with it, and 3 frames reach from an allocation to the code building the structure
+            snapshot_growth: Traced memory growth factor that triggers a new attribution snapshot
+        """
+        self.interval = interval
+        self.sample_uss = sample_uss
+        self.trace_python = trace_python
+        self.attribute_structures = attribute_structures and trace_python
+        self.traceback_depth = traceback_depth
+        self.snapshot_growth = snapshot_growth
+        self.process = psutil.Process(os.getpid())
+        self.samples = []
+        self.peak_traced = None
+        self.peak_snapshot = None
+        self.structure_memory = None
+        self._started_tracing = False
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+        return False
+
+    def start(self):
+        """Record the baseline sample and start the sampling thread."""
+        self.samples = []
+        self.peak_traced = None
+        self.peak_snapshot = None
+        self.structure_memory = None
+        self._snapshot_size = 0
+        if self.trace_python:
+            self._started_tracing = not tracemalloc.is_tracing()
+            if self._started_tracing:
+                tracemalloc.start(self.traceback_depth if self.attribute_structures else 1)
+            tracemalloc.reset_peak()
+            self._traced_baseline = tracemalloc.get_traced_memory()[0]
+        self._start_time = time.perf_counter()
+        self._sample()
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="MemorySampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop sampling, take a last sample and compute the peaks and the structure attribution."""
+        if self._thread is None:
+            return
+        self._stop_event.set()
+        self._thread.join()
+        self._thread = None
+        self._sample()
+        if self.trace_python:
+            self.peak_traced = max(tracemalloc.get_traced_memory()[1] - self._traced_baseline, 0)
+            if self.attribute_structures and self.peak_snapshot is None:
+                self.peak_snapshot = tracemalloc.take_snapshot()  # traced memory stayed small
+            if self.peak_snapshot is not None:
+                self.structure_memory = MemorySampler.attribute(self.peak_snapshot)
+            self.peak_snapshot = None  # snapshots hold every trace, keep only the attribution
+            if self._started_tracing:
+                tracemalloc.stop()
+                self._started_tracing = False
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval):
+            self._sample()
+
+    def _sample(self):
+        """Append (elapsed seconds, RSS, USS or None, traced bytes or None)."""
+        if self.sample_uss:
+            info = self.process.memory_full_info()
+            rss, uss = info.rss, info.uss
+        else:
+            rss, uss = self.process.memory_info().rss, None
+        traced = None
+        if self.trace_python and tracemalloc.is_tracing():
+            overhead = tracemalloc.get_tracemalloc_memory()
+            rss -= overhead
+            uss = uss - overhead if uss is not None else None
+            traced = tracemalloc.get_traced_memory()[0]
+            if self.attribute_structures and traced > max(self._snapshot_size * self.snapshot_growth, 1 << 20):
+                self._snapshot_size = traced
+                self.peak_snapshot = tracemalloc.take_snapshot()
+        self.samples.append((time.perf_counter() - self._start_time, rss, uss, traced))
+
+    @staticmethod
+    def attribute(snapshot):
+        """Bytes per STRUCTURE_CATEGORIES entry (plus "other") in a tracemalloc snapshot.
+
+        When tracing was already active before start(), allocations made earlier are included.
+        """
+        totals = {category: 0 for category in MemorySampler.structure_names()}
+        frame_labels = {}
+        for trace in snapshot.traces:
+            category = 'other'
+            labels = []
+            for frame in trace.traceback:
+                key = (frame.filename, frame.lineno)
+                if key not in frame_labels:
+                    filename = frame.filename.replace(os.sep, '/')
+                    frame_labels[key] = f"{filename}:{MemorySampler.function_name(frame.filename, frame.lineno)}"
+                labels.append(frame_labels[key])
+            for candidate, patterns in MemorySampler.STRUCTURE_CATEGORIES.items():
+                if any(pattern in label for label in labels for pattern in patterns):
+                    category = candidate
+                    break
+            totals[category] += trace.size
+        return totals
+
+    @staticmethod
+    def structure_names():
+        """Categories reported by attribute(): STRUCTURE_CATEGORIES followed by "other"."""
+        return list(MemorySampler.STRUCTURE_CATEGORIES) + ['other']
+
+    @staticmethod
+    def function_name(filename, lineno):
+        """Qualified name of the innermost function or class of a source file containing lineno."""
+        if filename not in MemorySampler._function_index:
+            index = []
+            try:
+                with open(filename, encoding='utf-8') as source_file:
+                    tree = ast.parse(source_file.read())
+                stack = [(node, "") for node in tree.body]
+                while stack:
+                    node, prefix = stack.pop()
+                    if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                        name = f"{prefix}{node.name}"
+                        index.append((node.lineno, node.end_lineno, name))
+                        stack.extend((child, f"{name}.") for child in node.body)
+            except (OSError, SyntaxError, ValueError):
+                pass  # frozen or generated modules only match by filename
+            MemorySampler._function_index[filename] = index
+        best = ""
+        best_span = None
+        for first, last, name in MemorySampler._function_index[filename]:
+            if first <= lineno <= last and (best_span is None or last - first < best_span):
+                best, best_span = name, last - first
+        return best
+
+    def peak_rss(self):
+        """Largest sampled RSS minus the baseline sample, in bytes."""
+        return max(rss for _, rss, _, _ in self.samples) - self.samples[0][1] if self.samples else None
+
+    def peak_uss(self):
+        """Largest sampled USS minus the baseline sample, in bytes, or None when USS is not sampled."""
+        if not self.samples or self.samples[0][2] is None:
+            return None
+        return max(uss for _, _, uss, _ in self.samples) - self.samples[0][2]
+
+    def to_dict(self):
+        """Peaks and attribution in MB plus the sampled time series, ready for JSON export."""
+        megabyte = 1024 * 1024
+
+        def to_mb(value):
+            return None if value is None else value / megabyte
+
+        return {
+            'interval': self.interval,
+            'peak_rss_mb': to_mb(self.peak_rss()),
+            'peak_uss_mb': to_mb(self.peak_uss()),
+            'peak_traced_mb': to_mb(self.peak_traced),
+            'structure_mb': ({category: size / megabyte for category, size in self.structure_memory.items()}
+                             if self.structure_memory is not None else None),
+            'series': {
+                'time': [elapsed for elapsed, _, _, _ in self.samples],
+                'rss_mb': [rss / megabyte for _, rss, _, _ in self.samples],
+                'uss_mb': [to_mb(uss) for _, _, uss, _ in self.samples],
+                'traced_mb': [to_mb(traced) for _, _, _, traced in self.samples]
+            }
+        }
+
+
+# Usage
+if __name__ == "__main__":
+    from AlgorithmStrategy import GoldbergsMaxDensitySubgraph
+    from GraphLoader import GraphLoader
+
+    graph = GraphLoader.load_graph("datasets/hamsterster.txt")
+    with MemorySampler(interval=0.05) as sampler:
+        GoldbergsMaxDensitySubgraph().apply_algorithm(graph)
+
+    profile = sampler.to_dict()
+    print(f"{len(profile['series']['time'])} samples, peak USS +{profile['peak_uss_mb']:.2f} MB, "
+          f"peak traced {profile['peak_traced_mb']:.2f} MB")
+    for category, size in profile['structure_mb'].items():
+        print(f"  {category}: {size:.2f} MB")
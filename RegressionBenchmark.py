@@ -0,0 +1,421 @@
+import argparse
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+
+import AcceleratedKernels
+import AlgorithmStrategy
+from AlgorithmStrategy import AlgorithmStrategy as AlgoStrat
+from CoreDecomposition import CoreDecomposition
+from DatasetsService import DatasetsService
+from GraphLoader import GraphLoader
+from MemorySampler import MemorySampler
+
+
+class RegressionBenchmark:
+    """Performance regression suite: every strategy on fixed datasets, compared against a stored baseline.
+
+    record() writes running times (several repeats), peak traced memory and result densities to a
+    versioned JSON baseline; compare() measures again and reports
+      * slowdowns that a one-sided Welch t-test finds significant (and larger than min_slowdown),
+      * peak memory growth beyond memory_tolerance,
+      * any drop of density / exact optimum below the baseline's, and exact strategies missing the optimum,
+      * on planted synthetic datasets, a drop in the share of the planted block recovered, and exact
+        strategies finding less than the planted block's density.
+    Timing runs are untraced and follow an untimed warm-up run; runs shorter than min_sample_time
+    are repeated in a loop per sample, like timeit. Peak memory comes from one extra traced run.
+    """
+
+    BASELINE_VERSION = 1
+    BASELINE_FILE = "benchmarks/baseline.json"
+
+    DATASETS = [
+        "Hamsterster", "Brightkite", "Douban",
+        "Synthetic Erdos-Renyi 10^4", "Synthetic Chung-Lu 10^4",
+        "Synthetic Planted Clique 10^4", "Synthetic Planted Dense Block 10^4"
+    ]
+    QUICK_DATASETS = ["Hamsterster", "Synthetic Chung-Lu 10^3", "Synthetic Planted Clique 10^3"]
+
+    # (strategy class, constructor parameters, Greedy++ iterations, largest dataset in edges or None)
+    # the quadratic reference implementations and networkx-flow exact solvers are capped
+    STRATEGIES = [
+        ("CharikarsGreedy", {}, None, 20_000),
+        ("CharikarsGreedyMinHeap", {}, None, None),
+        ("CharikarsGreedyFibonacciHeap", {}, None, None),
+        ("GreedyPlusPlus", {}, 5, 20_000),
+        ("GreedyPlusPlusPriorityQueue", {}, 5, None),
+        ("GoldbergsMaxDensitySubgraph", {}, None, 20_000),
+        ("BatchPeelingDensestSubgraph", {}, None, None),
+        ("WeightedCharikarsGreedy", {}, None, None),
+        ("WeightedGreedyPlusPlus", {}, 5, None),
+        ("DensestAtLeastK", {}, None, None),
+        ("ExactDensestAtLeastK", {}, None, 20_000),
+        ("EdgeSamplingSketch", {}, None, None),
+        # triangle-density objective: density and ratio stay in edge density, which is deterministic
+        # for a given peel, so a changed answer still shows; repeated runs reuse the cached counts
+        ("TriangleDensestGreedy", {}, None, None),
+        ("TriangleDensestGreedyPlusPlus", {}, 5, 20_000),
+    ]
+    EXACT_STRATEGIES = {"GoldbergsMaxDensitySubgraph", "ExactDensestAtLeastK"}
+
+    def __init__(self, datasets=None, strategies=None, repeats=5, measure_memory=True, min_sample_time=0.05):
+        """
+        Args:
+            datasets: Dataset names (DatasetsService) to run on, defaults to DATASETS
+            strategies: Entries like STRATEGIES, defaults to all of them
+            repeats: Timing samples per strategy and dataset
+            measure_memory: Also run each strategy once under a MemorySampler for its peak memory
+            min_sample_time: Seconds each timing sample should last; faster strategies run in a loop
+        """
+        self.datasets = datasets if datasets is not None else RegressionBenchmark.DATASETS
+        self.strategies = strategies if strategies is not None else RegressionBenchmark.STRATEGIES
+        self.repeats = repeats
+        self.measure_memory = measure_memory
+        self.min_sample_time = min_sample_time
+
+    @staticmethod
+    def strategy_label(class_name, parameters, iterations):
+        """Stable key of a strategy configuration in the baseline, e.g. "GreedyPlusPlus(iterations=5)"."""
+        arguments = dict(parameters)
+        if iterations is not None:
+            arguments['iterations'] = iterations
+        return f"{class_name}({', '.join(f'{key}={value}' for key, value in sorted(arguments.items()))})"
+
+    @staticmethod
+    def exact_density(graph):
+        """
+        Optimal density, solved exactly on the ceil(L)-core where L is the density of the max core.
+
+        The densest subgraph always lies inside that core, so Goldberg only runs on a small region.
+        """
+        if graph.number_of_edges() == 0:
+            return 0.0
+        cores = CoreDecomposition(graph)
+        max_core = cores.core_nodes(cores.max_core_number())
+        threshold = math.ceil(AlgoStrat.subgraph_density(graph, max_core))
+        region = [node for node, core in cores.core.items() if core >= threshold]
+        nodes = AlgorithmStrategy.GoldbergsMaxDensitySubgraph().apply_algorithm(graph.subgraph(region))
+        if isinstance(nodes, tuple):  # strategies return (set(), 0.0) on empty input
+            nodes = nodes[0]
+        return max(AlgoStrat.subgraph_density(graph, nodes), AlgoStrat.subgraph_density(graph, max_core))
+
+    @staticmethod
+    def run_once(strategy, graph, iterations):
+        nodes = (strategy.apply_algorithm(graph, iterations)
+                 if getattr(strategy, 'takes_iterations', False) and iterations is not None
+                 else strategy.apply_algorithm(graph))
+        if isinstance(nodes, tuple):
+            nodes = nodes[0]
+        return nodes
+
+    def measure(self, class_name, parameters, iterations, graph, planted=None):
+        """Mean running time per run of self.repeats samples, peak traced memory in MB and the result density.
+
+        With a planted block (DatasetsService.planted_subgraph) the share of it in the result is recorded too.
+        """
+        strategy_class = getattr(AlgorithmStrategy, class_name)
+
+        # the warm-up run also decides how many runs one timing sample needs
+        start_time = time.perf_counter()
+        nodes = RegressionBenchmark.run_once(strategy_class(**parameters), graph, iterations)
+        warm_up_time = time.perf_counter() - start_time
+        loops = min(max(1, math.ceil(self.min_sample_time / max(warm_up_time, 1e-6))), 1000)
+
+        times = []
+        for _ in range(self.repeats):
+            start_time = time.perf_counter()
+            for _ in range(loops):
+                nodes = RegressionBenchmark.run_once(strategy_class(**parameters), graph, iterations)
+            times.append((time.perf_counter() - start_time) / loops)
+
+        peak_memory = None
+        if self.measure_memory:
+            sampler = MemorySampler(sample_uss=False, attribute_structures=False)
+            with sampler:
+                RegressionBenchmark.run_once(strategy_class(**parameters), graph, iterations)
+            peak_memory = sampler.to_dict()['peak_traced_mb']
+
+        return {
+            'times': times,
+            'loops': loops,
+            'peak_memory_mb': peak_memory,
+            'density': AlgoStrat.subgraph_density(graph, nodes),
+            'size': len(nodes),
+            'planted_recall': (len(planted['nodes'] & set(nodes)) / len(planted['nodes'])
+                               if planted is not None and planted['nodes'] else None)
+        }
+
+    def run(self):
+        """Measure every (dataset, strategy) pair; returns a baseline-formatted dict."""
+        results = {
+            'version': RegressionBenchmark.BASELINE_VERSION,
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'environment': RegressionBenchmark.environment(),
+            'repeats': self.repeats,
+            'datasets': {},
+            'results': {}
+        }
+
+        for dataset_name in self.datasets:
+            graph = GraphLoader.load_graph(DatasetsService.dataset_path(dataset_name))
+            if graph is None:
+                print(f"⛔ Skipping {dataset_name}: dataset could not be loaded")
+                continue
+            print(f"\n📏 {dataset_name}: {graph.number_of_nodes()} nodes, {graph.number_of_edges()} edges")
+            optimal_density = RegressionBenchmark.exact_density(graph)
+            planted = DatasetsService.planted_subgraph(dataset_name)
+            results['datasets'][dataset_name] = {
+                'nodes': graph.number_of_nodes(),
+                'edges': graph.number_of_edges(),
+                'optimal_density': optimal_density,
+                'planted_density': planted['density'] if planted is not None else None
+            }
+            results['results'][dataset_name] = {}
+
+            for class_name, parameters, iterations, max_edges in self.strategies:
+                label = RegressionBenchmark.strategy_label(class_name, parameters, iterations)
+                if max_edges is not None and graph.number_of_edges() > max_edges:
+                    continue
+                try:
+                    measurement = self.measure(class_name, parameters, iterations, graph, planted)
+                except Exception as e:
+                    print(f"  ⛔ {label}: {e}")
+                    continue
+                measurement['ratio'] = measurement['density'] / optimal_density if optimal_density > 0 else 1.0
+                results['results'][dataset_name][label] = measurement
+                print(f"  {label}: {np.mean(measurement['times']):.4f} s ± {np.std(measurement['times']):.4f}, "
+                      f"density {measurement['density']:.4f} ({measurement['ratio']:.2%} of optimal)")
+
+        return results
+
+    def record(self, path=BASELINE_FILE):
+        """Run the suite and store it as the baseline at path."""
+        baseline = self.run()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, 'w') as baseline_file:
+            json.dump(baseline, baseline_file, indent=2)
+        print(f"\n✅ Baseline saved to: {os.path.abspath(path)}")
+        return baseline
+
+    @staticmethod
+    def load_baseline(path=BASELINE_FILE):
+        with open(path) as baseline_file:
+            baseline = json.load(baseline_file)
+        if baseline.get('version') != RegressionBenchmark.BASELINE_VERSION:
+            raise ValueError(f"Baseline {path} has format version {baseline.get('version')}, "
+                             f"expected {RegressionBenchmark.BASELINE_VERSION}; record a new baseline")
+        return baseline
+
+    @staticmethod
+    def environment():
+        try:
+            commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                    timeout=10).stdout.strip() or None
+        except (OSError, subprocess.SubprocessError):
+            commit = None
+        return {
+            'git_commit': commit,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'processor': platform.processor(),
+            'cpu_count': os.cpu_count(),
+            'kernel_backend': AcceleratedKernels.backend()
+        }
+
+    @staticmethod
+    def welch_t_test(baseline_times, current_times):
+        """
+        One-sided Welch t-test that the current mean running time is larger than the baseline's.
+
+        Returns:
+            (t statistic, p-value) with Welch-Satterthwaite degrees of freedom, or (None, None)
+            with fewer than two samples on either side
+        """
+        a = np.asarray(baseline_times, dtype=np.float64)
+        b = np.asarray(current_times, dtype=np.float64)
+        if len(a) < 2 or len(b) < 2:
+            return None, None
+        difference = float(b.mean() - a.mean())
+        variance_a, variance_b = float(a.var(ddof=1)) / len(a), float(b.var(ddof=1)) / len(b)
+        if variance_a + variance_b == 0:
+            if difference == 0:
+                return 0.0, 0.5
+            return math.copysign(math.inf, difference), 0.0 if difference > 0 else 1.0
+        t = difference / math.sqrt(variance_a + variance_b)
+        degrees_of_freedom = (variance_a + variance_b) ** 2 / (
+            variance_a ** 2 / (len(a) - 1) + variance_b ** 2 / (len(b) - 1))
+        return t, RegressionBenchmark.student_t_sf(t, degrees_of_freedom)
+
+    @staticmethod
+    def student_t_sf(t, degrees_of_freedom):
+        """P(T > t) for Student's t distribution, via the regularized incomplete beta function."""
+        tail = 0.5 * RegressionBenchmark.incomplete_beta(
+            degrees_of_freedom / 2, 0.5, degrees_of_freedom / (degrees_of_freedom + t * t))
+        return tail if t > 0 else 1 - tail
+
+    @staticmethod
+    def incomplete_beta(a, b, x):
+        """Regularized incomplete beta I_x(a, b), evaluated with Lentz's continued fraction."""
+        if x <= 0:
+            return 0.0
+        if x >= 1:
+            return 1.0
+        if x > (a + 1) / (a + b + 2):  # the continued fraction converges quickly below this point
+            return 1 - RegressionBenchmark.incomplete_beta(b, a, 1 - x)
+        front = math.exp(math.lgamma(a + b) - math.lgamma(a) - math.lgamma(b) +
+                         a * math.log(x) + b * math.log(1 - x)) / a
+        tiny = 1e-300
+        c, d = 1.0, 1 - (a + b) * x / (a + 1)
+        d = 1 / (d if abs(d) > tiny else tiny)
+        fraction = d
+        for m in range(1, 300):
+            for numerator in (m * (b - m) * x / ((a + 2 * m - 1) * (a + 2 * m)),
+                              -(a + m) * (a + b + m) * x / ((a + 2 * m) * (a + 2 * m + 1))):
+                d = 1 + numerator * d
+                d = 1 / (d if abs(d) > tiny else tiny)
+                c = 1 + numerator / c
+                c = c if abs(c) > tiny else tiny
+                fraction *= c * d
+            if abs(c * d - 1) < 1e-14:
+                break
+        return front * fraction
+
+    @staticmethod
+    def compare(baseline, current, alpha=0.01, min_slowdown=0.05, memory_tolerance=0.10):
+        """
+        Compare a current run with a baseline.
+
+        Args:
+            baseline: Baseline dict from record() / load_baseline()
+            current: Dict from run()
+            alpha: Significance level of the slowdown test
+            min_slowdown: Smallest relative slowdown of the mean running time that is flagged
+            memory_tolerance: Largest relative peak memory growth that is not flagged
+
+        Returns:
+            List of rows (dataset, strategy, metrics and a list of flagged regressions)
+        """
+        rows = []
+        for dataset_name, strategies in current['results'].items():
+            if dataset_name not in baseline['results']:
+                continue
+            base_dataset = baseline['datasets'][dataset_name]
+            current_dataset = current['datasets'][dataset_name]
+            dataset_changed = (base_dataset['nodes'], base_dataset['edges']) != \
+                              (current_dataset['nodes'], current_dataset['edges'])
+
+            for label, measurement in strategies.items():
+                base = baseline['results'][dataset_name].get(label)
+                if base is None:
+                    continue
+                row = {
+                    'dataset': dataset_name,
+                    'strategy': label,
+                    'baseline_time': float(np.mean(base['times'])),
+                    'current_time': float(np.mean(measurement['times'])),
+                    'baseline_memory_mb': base['peak_memory_mb'],
+                    'current_memory_mb': measurement['peak_memory_mb'],
+                    'baseline_ratio': base['ratio'],
+                    'current_ratio': measurement['ratio'],
+                    'regressions': []
+                }
+                row['time_change'] = row['current_time'] / row['baseline_time'] - 1 if row['baseline_time'] > 0 else 0.0
+                row['t_statistic'], row['p_value'] = RegressionBenchmark.welch_t_test(base['times'], measurement['times'])
+
+                if dataset_changed:
+                    row['regressions'].append("dataset changed since the baseline")
+                if row['p_value'] is not None and row['p_value'] < alpha and row['time_change'] > min_slowdown:
+                    row['regressions'].append(f"slower by {row['time_change']:.1%} (p = {row['p_value']:.2g})")
+                if (row['baseline_memory_mb'] is not None and row['current_memory_mb'] is not None and
+                        row['current_memory_mb'] > row['baseline_memory_mb'] * (1 + memory_tolerance) + 0.1):
+                    row['regressions'].append(
+                        f"peak memory {row['baseline_memory_mb']:.2f} -> {row['current_memory_mb']:.2f} MB")
+                if row['current_ratio'] < row['baseline_ratio'] - 1e-9:
+                    row['regressions'].append(
+                        f"density {row['baseline_ratio']:.4%} -> {row['current_ratio']:.4%} of optimal")
+                if label.split("(")[0] in RegressionBenchmark.EXACT_STRATEGIES and row['current_ratio'] < 1 - 1e-9:
+                    row['regressions'].append("exact strategy missed the optimum")
+                # baselines recorded before planted blocks were tracked have no recall to compare with
+                base_recall, current_recall = base.get('planted_recall'), measurement.get('planted_recall')
+                if base_recall is not None and current_recall is not None and current_recall < base_recall - 1e-9:
+                    row['regressions'].append(f"planted block recovery {base_recall:.2%} -> {current_recall:.2%}")
+                planted_density = current_dataset.get('planted_density')
+                if (label.split("(")[0] in RegressionBenchmark.EXACT_STRATEGIES and planted_density is not None
+                        and measurement['density'] < planted_density - 1e-9):
+                    row['regressions'].append("exact strategy found less than the planted block's density")
+                rows.append(row)
+        return rows
+
+    @staticmethod
+    def format_report(baseline, current, rows):
+        lines = [
+            f"Regression report {current['created']}",
+            f"Baseline: {baseline['created']} (commit {baseline['environment'].get('git_commit')}), "
+            f"current commit {current['environment'].get('git_commit')}"
+        ]
+        if baseline['environment'].get('platform') != current['environment'].get('platform') or \
+                baseline['environment'].get('cpu_count') != current['environment'].get('cpu_count'):
+            lines.append("⚠️ Baseline was recorded on a different machine; timings are not comparable")
+        baseline_backend = baseline['environment'].get('kernel_backend', "python")  # older baselines predate the kernels
+        if baseline_backend != current['environment'].get('kernel_backend'):
+            lines.append(f"⚠️ Baseline used the {baseline_backend} kernel backend, "
+                         f"this run {current['environment'].get('kernel_backend')}")
+        lines.append("")
+        for row in rows:
+            status = "⛔" if row['regressions'] else "✅"
+            lines.append(f"{status} {row['dataset']} / {row['strategy']}: "
+                         f"{row['baseline_time']:.4f} -> {row['current_time']:.4f} s ({row['time_change']:+.1%}), "
+                         f"density {row['current_ratio']:.4%} of optimal")
+            lines.extend(f"     - {regression}" for regression in row['regressions'])
+        regressions = sum(1 for row in rows if row['regressions'])
+        lines.append("")
+        lines.append(f"{regressions} of {len(rows)} comparisons regressed")
+        return "\n".join(lines)
+
+    @staticmethod
+    def save_report(report, rows):
+        """Write the text report and its rows under experiment_results; returns the text report path."""
+        folder = "experiment_results"
+        os.makedirs(folder, exist_ok=True)
+        ts = datetime.now().strftime("%Y%m%d_%H%M%S")
+        path = os.path.abspath(os.path.join(folder, f"{ts}_regression_report.txt"))
+        with open(path, 'w') as report_file:
+            report_file.write(report + "\n")
+        with open(path.replace(".txt", ".json"), 'w') as rows_file:
+            json.dump(rows, rows_file, indent=2)
+        return path
+
+
+# Usage:
+#   python RegressionBenchmark.py record            # store benchmarks/baseline.json
+#   python RegressionBenchmark.py compare           # exit code 1 when a regression is flagged
+#   python RegressionBenchmark.py compare --quick   # hamsterster and small synthetic graphs only
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Densest subgraph performance regression suite")
+    parser.add_argument("command", choices=["record", "compare"])
+    parser.add_argument("--baseline", default=RegressionBenchmark.BASELINE_FILE)
+    parser.add_argument("--quick", action="store_true", help="run on QUICK_DATASETS only")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--alpha", type=float, default=0.01)
+    arguments = parser.parse_args()
+
+    benchmark = RegressionBenchmark(RegressionBenchmark.QUICK_DATASETS if arguments.quick else None,
+                                    repeats=arguments.repeats)
+    if arguments.command == "record":
+        benchmark.record(arguments.baseline)
+    else:
+        baseline = RegressionBenchmark.load_baseline(arguments.baseline)
+        benchmark.datasets = [name for name in benchmark.datasets if name in baseline['results']]
+        current = benchmark.run()
+        rows = RegressionBenchmark.compare(baseline, current, alpha=arguments.alpha)
+        report = RegressionBenchmark.format_report(baseline, current, rows)
+        print("\n" + report)
+        print(f"\n📄 Report saved to: {RegressionBenchmark.save_report(report, rows)}")
+        sys.exit(1 if any(row['regressions'] for row in rows) else 0)
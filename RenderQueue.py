@@ -0,0 +1,111 @@
+import contextlib
+import io
+import multiprocessing
+import signal
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+
+def _init_render_worker():
+    # a terminal Ctrl+C reaches the whole process group; it stops the evaluation, not the renderers
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    import matplotlib
+    matplotlib.use("Agg")  # workers never open windows
+
+
+def _render_zoom(zoom, graph_name, algorithm_name, draw_options):
+    from EvaluationResultsView import AlgorithmResultsViewer
+    # the caller reports saved paths itself, so worker output does not interleave with progress lines
+    with contextlib.redirect_stdout(io.StringIO()):
+        return AlgorithmResultsViewer.render_densest_component_zoom(zoom, graph_name, algorithm_name, **draw_options)
+
+
+class RenderQueue:
+    """Renders and saves result figures in background processes so evaluation loops only enqueue.
+
+    Workers are started with the "spawn" context, so each has its own clean matplotlib state.
+    Only the sampled neighbourhood of a result is sent to a worker, never the whole dataset.
+    Workers ignore SIGINT; if a worker dies anyway, the pool is recreated on the next submit.
+    """
+
+    def __init__(self, workers=1, image_format="png", dpi=100):
+        """
+        Args:
+            workers: Number of rendering processes
+            image_format: File format of saved figures, e.g. "png", "svg" or "pdf"
+            dpi: Resolution of saved figures
+        """
+        self.image_format = image_format
+        self.dpi = dpi
+        self.workers = workers
+        self.executor = self._new_executor()
+        self.pending = []
+
+    def _new_executor(self):
+        return ProcessPoolExecutor(max_workers=self.workers,
+                                   mp_context=multiprocessing.get_context("spawn"),
+                                   initializer=_init_render_worker)
+
+    def _restart(self):
+        print("⚠️ A rendering process terminated abruptly, restarting the rendering pool")
+        self.executor.shutdown(wait=False)
+        self.executor = self._new_executor()
+
+    def submit_zoom(self, graph, densest_subgraph_nodes, graph_name, algorithm_name, margin=2, **draw_options):
+        """
+        Queue a densest component zoom; only the neighbourhood sampling runs in the caller.
+
+        Args:
+            graph: Dataset graph
+            densest_subgraph_nodes: Node set to highlight
+            graph_name: Dataset name
+            algorithm_name: Algorithm name
+            margin: Number of neighbourhood hops
+            **draw_options: Extra render_densest_component_zoom arguments (layout_iterations, label_limit)
+        """
+        from EvaluationResultsView import AlgorithmResultsViewer
+        zoom = AlgorithmResultsViewer.prepare_densest_component_zoom(graph, densest_subgraph_nodes, margin)
+        draw_options = {'image_format': self.image_format, 'dpi': self.dpi, **draw_options}
+        try:
+            future = self.executor.submit(_render_zoom, zoom, graph_name, algorithm_name, draw_options)
+        except BrokenProcessPool:
+            self._restart()
+            future = self.executor.submit(_render_zoom, zoom, graph_name, algorithm_name, draw_options)
+        self.pending.append((f"{graph_name} / {algorithm_name}", future))
+
+    def wait(self):
+        """Block until every queued figure is saved. Returns the saved paths."""
+        if not self.pending:
+            return []
+        print(f"\n🖼️ Waiting for {len(self.pending)} figure(s) to finish rendering...")
+        start_time = time.perf_counter()
+        paths = []
+        broken = False
+        for description, future in self.pending:
+            try:
+                paths.append(future.result())
+                print(f"📊 Identified Densest Subgraph Graph Drawing saved to: {paths[-1]}")
+            except BrokenProcessPool as e:
+                print(f"⛔ Error rendering {description}: {e}")
+                broken = True
+            except Exception as e:
+                print(f"⛔ Error rendering {description}: {e}")
+        self.pending = []
+        if broken:
+            self._restart()
+        print(f"🖼️ Rendering finished after waiting {time.perf_counter() - start_time:.2f} seconds")
+        return paths
+
+    def close(self):
+        """Wait for pending figures and stop the workers."""
+        paths = self.wait()
+        self.executor.shutdown()
+        return paths
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
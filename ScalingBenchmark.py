@@ -0,0 +1,198 @@
+import time
+import tracemalloc
+
+import networkx as nx
+import numpy as np
+
+import AlgorithmStrategy
+
+
+class ScalingBenchmark:
+    """Runs strategies on increasing-size samples of a dataset and fits empirical complexity exponents."""
+
+    DEFAULT_FRACTIONS = [0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1.0]
+
+    # a sample is skipped when the fitted curve predicts more than this multiple of the time budget
+    PREDICTION_MARGIN = 2.0
+
+    def __init__(self, dataset, fractions=None, sampling="node", time_budget=60.0, seed=42):
+        """
+        Args:
+            dataset: NetworkX graph to sample from
+            fractions: Increasing sample fractions in (0, 1]
+            sampling: "node" for induced node samples, "edge" for uniform edge samples
+            time_budget: Seconds after which a strategy's curve is stopped
+            seed: Random seed used for sampling
+        """
+        if sampling not in ("node", "edge"):
+            raise ValueError(f"Unknown sampling mode: {sampling}")
+        self.dataset = dataset
+        self.fractions = sorted(fractions if fractions is not None else ScalingBenchmark.DEFAULT_FRACTIONS)
+        self.sampling = sampling
+        self.time_budget = time_budget
+        self.seed = seed
+        self._samples = {}
+
+    def sample_graph(self, fraction):
+        """Return the (cached) sample of the dataset for the given fraction."""
+        if fraction in self._samples:
+            return self._samples[fraction]
+
+        if fraction >= 1.0:
+            sample = self.dataset
+        elif self.sampling == "node":
+            rng = np.random.default_rng(self.seed)
+            nodes = list(self.dataset.nodes())
+            size = max(1, int(round(fraction * len(nodes))))
+            chosen = rng.choice(len(nodes), size=size, replace=False)
+            sample = self.dataset.subgraph([nodes[i] for i in chosen]).copy()
+        else:
+            rng = np.random.default_rng(self.seed)
+            edges = list(self.dataset.edges(data=True))
+            size = max(1, int(round(fraction * len(edges))))
+            chosen = rng.choice(len(edges), size=size, replace=False)
+            sample = nx.Graph()
+            sample.graph.update(self.dataset.graph)
+            sample.add_edges_from(edges[i] for i in chosen)
+
+        self._samples[fraction] = sample
+        return sample
+
+    @staticmethod
+    def run_once(algorithm_strategy, graph, iterations=None):
+        """Run a strategy once, passing iterations to Greedy++ strategies."""
+        if getattr(algorithm_strategy, 'takes_iterations', False) and iterations is not None:
+            algorithm_strategy.apply_algorithm(graph, iterations)
+        else:
+            algorithm_strategy.apply_algorithm(graph)
+
+    @staticmethod
+    def measure(algorithm_strategy, graph, iterations=None, time_budget=None):
+        """
+        Run a strategy twice: untraced for the running time, then under tracemalloc for the memory.
+
+        The traced run is skipped when the untimed run already exceeded time_budget.
+
+        Returns:
+            (running time in seconds, peak traced memory in MB or None)
+        """
+        start_time = time.perf_counter()
+        ScalingBenchmark.run_once(algorithm_strategy, graph, iterations)
+        running_time = time.perf_counter() - start_time
+        if time_budget is not None and running_time > time_budget:
+            return running_time, None
+
+        tracemalloc.start()
+        try:
+            ScalingBenchmark.run_once(algorithm_strategy, graph, iterations)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        return running_time, peak / 1024 / 1024
+
+    @staticmethod
+    def fit_exponent(sizes, values):
+        """
+        Least-squares fit of values = c * sizes^alpha in log-log space.
+
+        Returns:
+            (alpha, c), or (None, None) when fewer than two usable points exist
+        """
+        sizes = np.asarray(sizes, dtype=np.float64)
+        values = np.asarray(values, dtype=np.float64)
+        usable = (sizes > 0) & (values > 0)
+        if np.count_nonzero(usable) < 2 or len(np.unique(sizes[usable])) < 2:
+            return None, None
+        alpha, log_c = np.polyfit(np.log(sizes[usable]), np.log(values[usable]), 1)
+        return float(alpha), float(np.exp(log_c))
+
+    def run_strategy(self, algorithm_strategy, iterations=None):
+        """
+        Measure one strategy over all sample fractions, stopping once the time budget is exceeded.
+
+        From the second point on, the running time of the next sample is predicted from the fit so
+        far, and the curve also stops when that prediction exceeds the budget by PREDICTION_MARGIN.
+        """
+        points = []
+        stopped_early = False
+
+        for fraction in self.fractions:
+            sample = self.sample_graph(fraction)
+            time_exponent, time_constant = ScalingBenchmark.fit_exponent(
+                [p['edges'] for p in points], [p['running_time'] for p in points])
+            if time_exponent is not None and sample.number_of_edges() > 0:
+                predicted_time = time_constant * sample.number_of_edges() ** time_exponent
+                if predicted_time > self.time_budget * ScalingBenchmark.PREDICTION_MARGIN:
+                    print(f"  ⏱️ Skipping {fraction:.0%} of {self.sampling}s and beyond: "
+                          f"predicted {predicted_time:.1f} s exceeds the {self.time_budget} s budget")
+                    stopped_early = True
+                    break
+            try:
+                running_time, peak_memory = ScalingBenchmark.measure(
+                    algorithm_strategy, sample, iterations, self.time_budget)
+            except Exception as e:
+                print(f"Error running {algorithm_strategy.algorithm_name} at fraction {fraction}: {e}")
+                stopped_early = True
+                break
+
+            points.append({
+                'fraction': fraction,
+                'nodes': sample.number_of_nodes(),
+                'edges': sample.number_of_edges(),
+                'running_time': running_time,
+                'peak_memory': peak_memory
+            })
+            memory_text = "memory not traced (over budget)" if peak_memory is None else f"{peak_memory:.2f} MB"
+            print(f"  {fraction:>6.0%} of {self.sampling}s: {sample.number_of_edges()} edges, "
+                  f"{running_time:.4f} s, {memory_text}")
+
+            if running_time > self.time_budget:
+                stopped_early = fraction < self.fractions[-1]
+                break
+
+        edges = [p['edges'] for p in points]
+        time_exponent, time_constant = ScalingBenchmark.fit_exponent(edges, [p['running_time'] for p in points])
+        traced = [p for p in points if p['peak_memory'] is not None]
+        memory_exponent, _ = ScalingBenchmark.fit_exponent([p['edges'] for p in traced],
+                                                           [p['peak_memory'] for p in traced])
+
+        return {
+            'algorithm': type(algorithm_strategy).__name__,
+            'algorithm_name': algorithm_strategy.algorithm_name,
+            'sampling': self.sampling,
+            'points': points,
+            'time_exponent': time_exponent,
+            'time_constant': time_constant,
+            'memory_exponent': memory_exponent,
+            'stopped_early': stopped_early
+        }
+
+    def run(self, algorithm_strategies, iterations=None):
+        curves = []
+        for algorithm_strategy in algorithm_strategies:
+            print(f"\n📈 Scaling curve for {algorithm_strategy.algorithm_name}")
+            curves.append(self.run_strategy(algorithm_strategy, iterations))
+        return curves
+
+    @staticmethod
+    def predict_running_time(curve, num_edges):
+        """Extrapolate a fitted curve to a graph with num_edges edges."""
+        if curve['time_exponent'] is None:
+            return None
+        return curve['time_constant'] * num_edges ** curve['time_exponent']
+
+
+# Usage
+if __name__ == "__main__":
+    from Datasets import Datasets
+    from EvaluationResultsView import AlgorithmResultsViewer
+
+    dataset = Datasets().datasets["Hamsterster"]
+    benchmark = ScalingBenchmark(dataset, time_budget=30.0)
+    curves = benchmark.run([
+        AlgorithmStrategy.CharikarsGreedyMinHeap(),
+        AlgorithmStrategy.GreedyPlusPlusPriorityQueue(),
+        AlgorithmStrategy.GoldbergsMaxDensitySubgraph()
+    ], iterations=5)
+    AlgorithmResultsViewer.display_scaling_results(curves)
+    AlgorithmResultsViewer.draw_scaling_curves(curves, "Hamsterster")
@@ -0,0 +1,246 @@
+import json
+import os
+
+import numpy as np
+
+
+class SyntheticGraphGenerator:
+    """Generates synthetic benchmark graphs and writes them as edge list datasets."""
+
+    # (dataset name, generator kind, number of edges) registered alongside the real datasets
+    BENCHMARK_SUITE = [
+        ("Synthetic Erdos-Renyi 10^3", "erdos_renyi", 10 ** 3),
+        ("Synthetic Erdos-Renyi 10^4", "erdos_renyi", 10 ** 4),
+        ("Synthetic Chung-Lu 10^3", "chung_lu", 10 ** 3),
+        ("Synthetic Chung-Lu 10^4", "chung_lu", 10 ** 4),
+        ("Synthetic Planted Clique 10^3", "planted_clique", 10 ** 3),
+        ("Synthetic Planted Clique 10^4", "planted_clique", 10 ** 4),
+        ("Synthetic Planted Dense Block 10^4", "planted_dense_block", 10 ** 4),
+    ]
+
+    # edge counts covered by the full scaling ladder (see __main__)
+    SCALING_LADDER = [10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6, 10 ** 7]
+
+    @staticmethod
+    def _unique_undirected_edges(sources, targets):
+        """Drop self loops and duplicate pairs, keeping the first occurrence of each edge."""
+        mask = sources != targets
+        low = np.minimum(sources[mask], targets[mask]).astype(np.int64)
+        high = np.maximum(sources[mask], targets[mask]).astype(np.int64)
+        keys = low * (int(high.max(initial=0)) + 1) + high
+        _, first_index = np.unique(keys, return_index=True)
+        first_index.sort()
+        return np.column_stack((low[first_index], high[first_index]))
+
+    @staticmethod
+    def _sample_edges(num_edges, sampler, rng, max_rounds=20):
+        """Draw endpoint pairs from sampler until num_edges distinct edges have been collected."""
+        edges = np.empty((0, 2), dtype=np.int64)
+        for _ in range(max_rounds):
+            missing = num_edges - len(edges)
+            if missing <= 0:
+                break
+            # over-sample a little so collisions rarely need another round
+            batch_size = int(missing * 1.1) + 16
+            sources, targets = sampler(batch_size)
+            candidates = np.vstack((edges, np.column_stack((sources, targets))))
+            edges = SyntheticGraphGenerator._unique_undirected_edges(candidates[:, 0], candidates[:, 1])
+        edges = edges[:num_edges]
+        return edges[rng.permutation(len(edges))]
+
+    @staticmethod
+    def erdos_renyi(num_edges, average_degree=10.0, seed=42):
+        """
+        Uniform random G(n, m) graph.
+
+        Args:
+            num_edges: Number of distinct undirected edges to generate
+            average_degree: Target average degree, which fixes n = 2m / average_degree
+            seed: Random seed
+
+        Returns:
+            (edges, num_nodes) where edges is an (m, 2) int64 array
+        """
+        rng = np.random.default_rng(seed)
+        num_nodes = max(2, int(round(2 * num_edges / average_degree)))
+        num_edges = min(num_edges, num_nodes * (num_nodes - 1) // 2)
+
+        def sampler(size):
+            return rng.integers(0, num_nodes, size), rng.integers(0, num_nodes, size)
+
+        return SyntheticGraphGenerator._sample_edges(num_edges, sampler, rng), num_nodes
+
+    @staticmethod
+    def chung_lu(num_edges, average_degree=10.0, exponent=2.5, seed=42):
+        """
+        Power-law graph following the Chung-Lu model.
+
+        Endpoints are drawn independently with probability proportional to the expected
+        degree w_i ~ i^(-1 / (exponent - 1)), which yields a degree distribution with the
+        given power-law exponent.
+
+        Args:
+            num_edges: Number of distinct undirected edges to generate
+            average_degree: Target average degree, which fixes n = 2m / average_degree
+            exponent: Power-law exponent of the degree distribution (> 2)
+            seed: Random seed
+
+        Returns:
+            (edges, num_nodes) where edges is an (m, 2) int64 array
+        """
+        rng = np.random.default_rng(seed)
+        num_nodes = max(2, int(round(2 * num_edges / average_degree)))
+        num_edges = min(num_edges, num_nodes * (num_nodes - 1) // 2)
+
+        weights = np.arange(1, num_nodes + 1, dtype=np.float64) ** (-1.0 / (exponent - 1.0))
+        cumulative = np.cumsum(weights)
+        cumulative /= cumulative[-1]
+
+        def sampler(size):
+            sources = np.searchsorted(cumulative, rng.random(size), side="right")
+            targets = np.searchsorted(cumulative, rng.random(size), side="right")
+            return np.minimum(sources, num_nodes - 1), np.minimum(targets, num_nodes - 1)
+
+        return SyntheticGraphGenerator._sample_edges(num_edges, sampler, rng), num_nodes
+
+    @staticmethod
+    def planted_dense_subgraph(num_edges, block_size=None, block_probability=1.0, average_degree=10.0, seed=42):
+        """
+        Two-block stochastic block model: a sparse G(n, m) background with a planted dense block.
+
+        With block_probability=1.0 the planted block is a clique. The returned planted density
+        is |E(block)| / |block|, which lower-bounds the optimal density of the whole graph.
+
+        Args:
+            num_edges: Approximate total number of distinct undirected edges
+            block_size: Number of nodes in the planted block (defaults to about 4 * sqrt(average_degree * log m))
+            block_probability: Probability of each edge inside the planted block
+            average_degree: Average degree of the background graph
+            seed: Random seed
+
+        Returns:
+            (edges, num_nodes, planted_nodes, planted_density)
+        """
+        rng = np.random.default_rng(seed)
+        if block_size is None:
+            block_size = int(4 * np.sqrt(average_degree * np.log(max(num_edges, 2))))
+
+        background_edges, num_nodes = SyntheticGraphGenerator.erdos_renyi(
+            num_edges, average_degree=average_degree, seed=seed)
+        block_size = min(block_size, num_nodes)
+
+        planted_nodes = np.sort(rng.choice(num_nodes, size=block_size, replace=False))
+        rows, cols = np.triu_indices(block_size, k=1)
+        keep = rng.random(len(rows)) < block_probability
+        block_edges = np.column_stack((planted_nodes[rows[keep]], planted_nodes[cols[keep]]))
+
+        edges = SyntheticGraphGenerator._unique_undirected_edges(
+            np.concatenate((block_edges[:, 0], background_edges[:, 0])),
+            np.concatenate((block_edges[:, 1], background_edges[:, 1])))
+
+        in_block = np.zeros(num_nodes, dtype=bool)
+        in_block[planted_nodes] = True
+        planted_edge_count = int(np.count_nonzero(in_block[edges[:, 0]] & in_block[edges[:, 1]]))
+        planted_density = planted_edge_count / block_size if block_size > 0 else 0.0
+
+        return edges, num_nodes, planted_nodes, planted_density
+
+    @staticmethod
+    def generate(kind, num_edges, seed=42):
+        """
+        Dispatch to a generator by kind name.
+
+        Returns:
+            (edges, planted) where edges is the (m, 2) edge array and planted is
+            {'nodes': [...], 'density': float} for the planted kinds, None otherwise
+        """
+        planted = None
+        if kind == "erdos_renyi":
+            edges, _ = SyntheticGraphGenerator.erdos_renyi(num_edges, seed=seed)
+        elif kind == "chung_lu":
+            edges, _ = SyntheticGraphGenerator.chung_lu(num_edges, seed=seed)
+        elif kind in ("planted_clique", "planted_dense_block"):
+            if kind == "planted_clique":
+                edges, _, planted_nodes, planted_density = SyntheticGraphGenerator.planted_dense_subgraph(
+                    num_edges, seed=seed)
+            else:
+                edges, _, planted_nodes, planted_density = SyntheticGraphGenerator.planted_dense_subgraph(
+                    num_edges, block_size=int(np.sqrt(num_edges)), block_probability=0.5, seed=seed)
+            planted = {'nodes': planted_nodes.tolist(), 'density': planted_density}
+        else:
+            raise ValueError(f"Unknown synthetic graph kind: {kind}")
+        return edges, planted
+
+    @staticmethod
+    def write_edge_list(edges, file_path):
+        """Write an (m, 2) edge array in the space-separated format read by GraphLoader."""
+        os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+        # write to a temporary file first so an interrupted run never leaves a truncated dataset
+        tmp_path = file_path + ".tmp"
+        np.savetxt(tmp_path, edges, fmt="%d", delimiter=" ")
+        os.replace(tmp_path, file_path)
+
+    @staticmethod
+    def planted_path(file_path):
+        """Sidecar file next to an edge list holding its planted block, e.g. "x.txt" -> "x.planted.json"."""
+        return os.path.splitext(file_path)[0] + ".planted.json"
+
+    @staticmethod
+    def write_planted(planted, file_path):
+        """Write the planted block of the edge list at file_path to its sidecar file."""
+        tmp_path = SyntheticGraphGenerator.planted_path(file_path) + ".tmp"
+        with open(tmp_path, "w") as planted_file:
+            json.dump(planted, planted_file)
+        os.replace(tmp_path, SyntheticGraphGenerator.planted_path(file_path))
+
+    @staticmethod
+    def load_planted(file_path):
+        """
+        Planted block of a generated edge list.
+
+        Returns:
+            {'nodes': set of node ids, 'density': planted block density}, or None without a sidecar file
+        """
+        try:
+            with open(SyntheticGraphGenerator.planted_path(file_path)) as planted_file:
+                planted = json.load(planted_file)
+        except FileNotFoundError:
+            return None
+        return {'nodes': set(planted['nodes']), 'density': planted['density']}
+
+    @staticmethod
+    def generate_dataset(kind, num_edges, seed=42, folder="datasets/synthetic"):
+        """
+        Generate a synthetic dataset file, reusing the cached file if it already exists.
+
+        Planted kinds also get a sidecar file with the planted block (see load_planted), which
+        is regenerated for edge lists cached before sidecars were written.
+
+        Args:
+            kind: One of erdos_renyi, chung_lu, planted_clique, planted_dense_block
+            num_edges: Number of edges to generate
+            seed: Random seed
+            folder: Folder the edge list files are cached in
+
+        Returns:
+            Path to the edge list file
+        """
+        file_path = os.path.join(folder, f"{kind}_m{num_edges}_seed{seed}.txt")
+        planted_missing = kind.startswith("planted") and not os.path.exists(
+            SyntheticGraphGenerator.planted_path(file_path))
+        if not os.path.exists(file_path) or planted_missing:
+            edges, planted = SyntheticGraphGenerator.generate(kind, num_edges, seed=seed)
+            if not os.path.exists(file_path):
+                SyntheticGraphGenerator.write_edge_list(edges, file_path)
+            if planted is not None:
+                SyntheticGraphGenerator.write_planted(planted, file_path)
+        return file_path
+
+
+# Usage
+if __name__ == "__main__":
+    # Pre-generate the full 10^3 .. 10^7 edge ladder for every generator kind
+    for kind in ["erdos_renyi", "chung_lu", "planted_clique", "planted_dense_block"]:
+        for num_edges in SyntheticGraphGenerator.SCALING_LADDER:
+            path = SyntheticGraphGenerator.generate_dataset(kind, num_edges)
+            print(f"Generated {kind} with {num_edges} edges at {path}")
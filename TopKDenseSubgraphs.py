@@ -0,0 +1,106 @@
+import heapq
+import itertools
+import math
+
+import networkx as nx
+
+from AlgorithmStrategy import AlgorithmStrategy as AlgoStrat, CharikarsGreedyMinHeap
+from CoreDecomposition import CoreDecomposition
+
+
+class TopKDenseSubgraphs:
+    """Finds the k densest pairwise disjoint subgraphs with any AlgorithmStrategy.
+
+    After a community is reported and removed, work is reused between rounds:
+      * core numbers are updated incrementally around the removed nodes only,
+      * results of connected components that the removed community did not touch stay valid,
+      * components are solved lazily, best-first by their certified upper bound (max core number),
+        so a component is only solved when it could contain the next densest community,
+      * each component is solved on its ceil(L)-core, where L is the density of its max core,
+        since the densest subgraph of the component always lies inside that core.
+    The region pruning keeps exact strategies exact.
+    """
+
+    def __init__(self, strategy=None):
+        self.strategy = strategy if strategy is not None else CharikarsGreedyMinHeap()
+        self.solved_components = 0
+
+    def _solve_component(self, cores, component):
+        """Best (nodes, density) inside one connected component of the working graph."""
+        graph = cores.graph
+        k_max = max(cores.core[node] for node in component)
+        max_core = {node for node in component if cores.core[node] == k_max}
+        max_core_density = AlgoStrat.subgraph_density(graph, max_core)
+
+        threshold = math.ceil(max_core_density)
+        region = {node for node in component if cores.core[node] >= threshold}
+        self.solved_components += 1
+        nodes = self.strategy.apply_algorithm(graph.subgraph(region))
+        if isinstance(nodes, tuple):  # strategies return (set(), 0.0) on empty input
+            nodes = nodes[0]
+        density = AlgoStrat.subgraph_density(graph, nodes)
+
+        if density < max_core_density:
+            return max_core, max_core_density
+        return set(nodes), density
+
+    def find_top_k(self, graph, k):
+        """
+        Args:
+            graph: Undirected NetworkX graph (not modified)
+            k: Number of disjoint dense subgraphs to return
+
+        Returns:
+            List of up to k (node set, density) pairs in the order they were found
+        """
+        self.solved_components = 0
+        cores = CoreDecomposition(graph.copy())
+        counter = itertools.count()
+        heap = []
+        components = {}
+
+        def add_components(nodes):
+            for component in nx.connected_components(cores.graph.subgraph(nodes)):
+                if len(component) < 2:
+                    continue
+                component_id = next(counter)
+                components[component_id] = component
+                upper_bound = max(cores.core[node] for node in component)
+                heapq.heappush(heap, (-upper_bound, component_id, None))
+
+        add_components(cores.graph.nodes())
+        results = []
+
+        while heap and len(results) < k:
+            negative_key, component_id, solution = heapq.heappop(heap)
+            if component_id not in components:
+                continue
+
+            if solution is None:
+                # first time this component is the most promising: solve it and re-queue by density
+                solution = self._solve_component(cores, components[component_id])
+                heapq.heappush(heap, (-solution[1], component_id, solution))
+                continue
+
+            nodes, density = solution
+            if density <= 0.0:
+                break
+            results.append((nodes, density))
+
+            # only the component the community came from changes
+            remaining = components.pop(component_id) - nodes
+            cores.remove_nodes(nodes)
+            add_components(remaining)
+
+        return results
+
+
+# Usage
+if __name__ == "__main__":
+    from GraphLoader import GraphLoader
+
+    graph = GraphLoader.load_graph("datasets/hamsterster.txt")
+    top_k = TopKDenseSubgraphs()
+    for rank, (nodes, density) in enumerate(top_k.find_top_k(graph, 5), 1):
+        print(f"#{rank}: {len(nodes)} nodes, density {density:.4f}")
+    print(f"Components solved: {top_k.solved_components}")
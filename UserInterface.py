@@ -1,26 +1,79 @@
+import time
+
+_STARTED = time.perf_counter()
+
+import argparse
+import importlib
 import sys
 from Datasets import Datasets
-from DatasetsService import DatasetsService
-import AlgorithmStrategy
-from AlgorithmEvaluator import AlgorithmEvaluator
-from EvaluationResultsView import AlgorithmResultsViewer
 
 
 class UI:
+    # Strategies, the evaluator and the views (networkx, psutil, matplotlib) are
+    # imported when a feature first needs them, so the menu appears without loading them
+    DEFERRED_MODULES = ["AlgorithmStrategy", "AlgorithmEvaluator", "EvaluationResultsView", "matplotlib.pyplot",
+                        "RenderQueue", "ScalingBenchmark"]
+
     def __init__(self):
         self.welcome_message = ("👋 Welcome user, to the Dense Subgraph Discovery Algorithm for Community Detection Evaluator.\n"
                                 "Please interact with the main menu.")
         self.datasets = Datasets()
         self.available_algorithms = {
-            '1': ('Charikar\'s Greedy', AlgorithmStrategy.CharikarsGreedy),
-            '2': ('Charikar\'s Greedy with Fibonacci Heap', AlgorithmStrategy.CharikarsGreedyFibonacciHeap),
-            '3': ('Goldberg\'s Maximum Density Subgraph', AlgorithmStrategy.GoldbergsMaxDensitySubgraph),
-            '4': ('Greedy++ (Flowless)', AlgorithmStrategy.GreedyPlusPlus),
-            '5': ('Greedy++ with Priority Queue (Flowless)', AlgorithmStrategy.GreedyPlusPlusPriorityQueue)
+            '1': ('Charikar\'s Greedy', 'CharikarsGreedy'),
+            '2': ('Charikar\'s Greedy with Fibonacci Heap', 'CharikarsGreedyFibonacciHeap'),
+            '3': ('Goldberg\'s Maximum Density Subgraph', 'GoldbergsMaxDensitySubgraph'),
+            '4': ('Greedy++ (Flowless)', 'GreedyPlusPlus'),
+            '5': ('Greedy++ with Priority Queue (Flowless)', 'GreedyPlusPlusPriorityQueue'),
+            '6': ('Batch Peeling (Bahmani, Approximate)', 'BatchPeelingDensestSubgraph'),
+            '7': ('Weighted Charikar\'s Greedy', 'WeightedCharikarsGreedy'),
+            '8': ('Weighted Greedy++ (Flowless)', 'WeightedGreedyPlusPlus'),
+            '9': ('Weighted Goldberg\'s Maximum Density Subgraph', 'WeightedGoldbergsMaxDensitySubgraph'),
+            '10': ('Densest Subgraph with at least k Nodes (Peeling)', 'DensestAtLeastK'),
+            '11': ('Densest Subgraph with at least k Nodes (Peeling + Flow Refinement)', 'ExactDensestAtLeastK'),
+            '12': ('Edge Sampling Sketch (Approximate, Streaming)', 'EdgeSamplingSketch'),
+            '13': ('Triangle-Densest Subgraph (Greedy Peeling)', 'TriangleDensestGreedy'),
+            '14': ('Triangle-Densest Subgraph (Greedy++)', 'TriangleDensestGreedyPlusPlus')
         }
         self.selected_datasets = []
         self.selected_algorithms = []
         self.iterations = 10
+        self.min_size = 1
+        self.gap_tolerance = 0.0
+        self.image_format = "png"
+        self.image_dpi = 100
+        self.trace_memory = False
+
+    @staticmethod
+    def strategy_class(class_name):
+        """Strategy class by name from AlgorithmStrategy, which is imported on first use."""
+        import AlgorithmStrategy
+        return getattr(AlgorithmStrategy, class_name)
+
+    def dataset_summary(self, dataset_name):
+        """Node and edge counts of a loaded dataset; datasets are not loaded just to list them."""
+        if not self.datasets.datasets.is_loaded(dataset_name):
+            return "(not loaded yet)"
+        graph = self.datasets.datasets[dataset_name]
+        if graph is None:
+            return "(failed to load)"
+        return f"(Nodes: {graph.number_of_nodes()}, Edges: {graph.number_of_edges()})"
+
+    def load_dataset(self, dataset_name):
+        if not self.datasets.datasets.is_loaded(dataset_name):
+            print(f"📂 Loading {dataset_name}...")
+        return self.datasets.datasets[dataset_name]
+
+    @staticmethod
+    def import_time_report(startup_time):
+        """Print how long the menu took to become ready and what each deferred module costs on first use."""
+        print(f"⏱️ Menu ready {startup_time * 1000:.0f} ms after UserInterface started importing")
+        heavy = ["numpy", "networkx", "matplotlib", "psutil", "dsd", "numba"]
+        print(f"Heavy modules loaded at startup: {', '.join(m for m in heavy if m in sys.modules) or 'none'}")
+        print("First use of deferred modules:")
+        for module_name in UI.DEFERRED_MODULES:
+            start_time = time.perf_counter()
+            importlib.import_module(module_name)
+            print(f"  {module_name:<22} {(time.perf_counter() - start_time) * 1000:8.1f} ms")
 
     def display_welcome_message(self):
         print("\n" + "=" * 60)
@@ -35,18 +88,17 @@ class UI:
         print("4. Run Currently Configured Experiment")
         print("5. View Current Experiment Configuration")
         print("6. Run Quick Experiment (All algorithms ran once on each dataset)")
-        print("7. Exit")
+        print("7. Run Scaling Benchmark (Selected algorithms on growing samples of selected datasets)")
+        print("8. Exit")
         print("-" * 40)
 
     def display_datasets_menu(self):
         print("\n📑AVAILABLE DATASETS")
-        dataset_items = list(self.datasets.datasets.items())
+        dataset_items = list(self.datasets.datasets)
 
-        for i, (name, graph) in enumerate(dataset_items, 1):
-            nodes = graph.number_of_nodes()
-            edges = graph.number_of_edges()
+        for i, name in enumerate(dataset_items, 1):
             status = "✓" if name in self.selected_datasets else " "
-            print(f"{i}. [{status}] {name} (Nodes: {nodes}, Edges: {edges})")
+            print(f"{i}. [{status}] {name} {self.dataset_summary(name)}")
 
         print(f"{len(dataset_items) + 1}. Select All")
         print(f"{len(dataset_items) + 2}. ⚠ Clear Selection")
@@ -57,17 +109,17 @@ class UI:
         print("\n🔬 AVAILABLE ALGORITHMS")
 
         for key, (name, _) in self.available_algorithms.items():
-            status = "✔" if key in [str(i) for i, _ in enumerate(self.selected_algorithms, 1)] else " "
-            selected_index = None
+            status = " "
             for i, (selected_key, _) in enumerate(self.selected_algorithms):
                 if selected_key == key:
                     status = "✔"
                     break
             print(f"{key}. [{status}] {name}")
 
-        print("6. Select All")
-        print("7. ⚠ Clear Selection")
-        print("8. ⬅ Back to Main Menu")
+        num_algorithms = len(self.available_algorithms)
+        print(f"{num_algorithms + 1}. Select All")
+        print(f"{num_algorithms + 2}. ⚠ Clear Selection")
+        print(f"{num_algorithms + 3}. ⬅ Back to Main Menu")
         print("-" * 40)
 
     def select_datasets(self):
@@ -78,13 +130,13 @@ class UI:
             if not choice:
                 continue
 
-            dataset_items = list(self.datasets.datasets.items())
+            dataset_items = list(self.datasets.datasets)
 
             try:
                 choice_num = int(choice)
 
                 if 1 <= choice_num <= len(dataset_items):
-                    dataset_name = dataset_items[choice_num - 1][0]
+                    dataset_name = dataset_items[choice_num - 1]
                     if dataset_name in self.selected_datasets:
                         self.selected_datasets.remove(dataset_name)
                         print(f"❌ Removed {dataset_name}")
@@ -93,7 +145,7 @@ class UI:
                         print(f"✅ Added {dataset_name}")
 
                 elif choice_num == len(dataset_items) + 1:  # Select All
-                    self.selected_datasets = [name for name, _ in dataset_items]
+                    self.selected_datasets = list(dataset_items)
                     print("✅ Selected all datasets")
 
                 elif choice_num == len(dataset_items) + 2:  # Clear Selection
@@ -117,6 +169,8 @@ class UI:
             if not choice:
                 continue
 
+            num_algorithms = len(self.available_algorithms)
+
             if choice in self.available_algorithms:
                 # Check if already selected
                 already_selected = any(key == choice for key, _ in self.selected_algorithms)
@@ -128,15 +182,15 @@ class UI:
                     self.selected_algorithms.append((choice, self.available_algorithms[choice]))
                     print(f"✅ Added {self.available_algorithms[choice][0]}")
 
-            elif choice == "6":  # Select All
+            elif choice == str(num_algorithms + 1):  # Select All
                 self.selected_algorithms = [(k, v) for k, v in self.available_algorithms.items()]
                 print("✅ Selected all algorithms")
 
-            elif choice == "7":  # Clear Selection
+            elif choice == str(num_algorithms + 2):  # Clear Selection
                 self.selected_algorithms.clear()
                 print("❌ Cleared algorithm selection")
 
-            elif choice == "8":  # Back
+            elif choice == str(num_algorithms + 3):  # Back
                 break
 
             else:
@@ -145,8 +199,16 @@ class UI:
     def configure_parameters(self):
         print("\n⚙️  PARAMETER CONFIGURATION")
         print(f"Current iterations for Greedy++ algorithms: {self.iterations}")
+        print(f"Current minimum subgraph size k for peeling algorithms: {self.min_size}")
+        print(f"Current certified gap tolerance for skipping the exact solver: {self.gap_tolerance:.2%}")
+        print(f"Current figure format and resolution: {self.image_format}, {self.image_dpi} dpi")
+        print(f"Current traced memory run (repeats each evaluation under tracemalloc): {'on' if self.trace_memory else 'off'}")
         print("1. 🤔 Change iterations count")
-        print("2. ⬅ Back to Main Menu")
+        print("2. 🤔 Change minimum subgraph size k")
+        print("3. 🤔 Change certified gap tolerance")
+        print("4. 🤔 Change figure format and resolution")
+        print("5. 🤔 Toggle traced memory run")
+        print("6. ⬅ Back to Main Menu")
 
         choice = input("Enter your choice: ").strip()
 
@@ -161,13 +223,55 @@ class UI:
             except ValueError:
                 print("⛔ Please enter a valid number")
 
+        elif choice == "2":
+            try:
+                new_min_size = int(input(f"Enter new minimum subgraph size k (current: {self.min_size}): "))
+                if new_min_size > 0:
+                    self.min_size = new_min_size
+                    print(f"✅ Minimum subgraph size set to {self.min_size}")
+                else:
+                    print("⛔ Minimum subgraph size must be positive")
+            except ValueError:
+                print("⛔ Please enter a valid number")
+
+        elif choice == "3":
+            try:
+                new_tolerance = float(input(f"Enter new gap tolerance in percent (current: {self.gap_tolerance * 100:g}): "))
+                if new_tolerance >= 0:
+                    self.gap_tolerance = new_tolerance / 100
+                    print(f"✅ Gap tolerance set to {self.gap_tolerance:.2%}")
+                else:
+                    print("⛔ Gap tolerance cannot be negative")
+            except ValueError:
+                print("⛔ Please enter a valid number")
+
+        elif choice == "4":
+            new_format = input(f"Enter figure format, e.g. png, svg or pdf (current: {self.image_format}): ").strip().lower()
+            if new_format in ("png", "svg", "pdf", "jpg", "jpeg"):
+                self.image_format = new_format
+            elif new_format:
+                print("⛔ Unsupported figure format")
+            try:
+                new_dpi = input(f"Enter figure resolution in dpi (current: {self.image_dpi}): ").strip()
+                if new_dpi:
+                    if int(new_dpi) > 0:
+                        self.image_dpi = int(new_dpi)
+                    else:
+                        print("⛔ Resolution must be positive")
+            except ValueError:
+                print("⛔ Please enter a valid number")
+            print(f"✅ Figures will be saved as {self.image_format} at {self.image_dpi} dpi")
+
+        elif choice == "5":
+            self.trace_memory = not self.trace_memory
+            print(f"✅ Traced memory run {'enabled' if self.trace_memory else 'disabled'}")
+
     def view_current_selection(self):
         print("\n👁️  CURRENT SELECTION")
         print("\n📄 Selected Datasets:")
         if self.selected_datasets:
             for dataset in self.selected_datasets:
-                graph = self.datasets.datasets[dataset]
-                print(f"  • {dataset} (Nodes: {graph.number_of_nodes()}, Edges: {graph.number_of_edges()})")
+                print(f"  • {dataset} {self.dataset_summary(dataset)}")
         else:
             print(" None selected")
 
@@ -180,6 +284,10 @@ class UI:
 
         print(f"\n⚙️ Parameters:")
         print(f"  • Iterations (for Greedy++ algorithms): {self.iterations}")
+        print(f"  • Minimum subgraph size k (for peeling algorithms): {self.min_size}")
+        print(f"  • Certified gap tolerance (exact solver skipped below it): {self.gap_tolerance:.2%}")
+        print(f"  • Figures: {self.image_format}, {self.image_dpi} dpi")
+        print(f"  • Traced memory run: {'on' if self.trace_memory else 'off'}")
 
         input("\nPress Enter to continue...")
 
@@ -202,30 +310,43 @@ class UI:
             print("⛔ Evaluation cancelled")
             return
 
+        from AlgorithmEvaluator import AlgorithmEvaluator
+        from EvaluationResultsView import AlgorithmResultsViewer
+        from RenderQueue import RenderQueue
+
         total_evaluations = 0
+        sweep_start_time = time.perf_counter()
+        render_queue = RenderQueue(image_format=self.image_format, dpi=self.image_dpi)
 
         for dataset_name in self.selected_datasets:
-            dataset_graph = self.datasets.datasets[dataset_name]
+            dataset_graph = self.load_dataset(dataset_name)
             print(f"\n🔎 Evaluating on dataset: {dataset_name}")
             print("-" * 50)
 
-            for _, (algo_name, algo_class) in self.selected_algorithms:
+            for _, (algo_name, class_name) in self.selected_algorithms:
                 total_evaluations += 1
                 print(f"\n🔬 Running {algo_name}...")
 
                 try:
-                    algorithm_instance = algo_class()
-                    evaluator = AlgorithmEvaluator(algorithm_instance, dataset_graph)
+                    algorithm_instance = UI.strategy_class(class_name)()
+                    if hasattr(algorithm_instance, 'min_size'):
+                        algorithm_instance.min_size = self.min_size
+                    evaluator = AlgorithmEvaluator(algorithm_instance, dataset_graph, self.gap_tolerance,
+                                                   trace_memory=self.trace_memory)
 
                     # Check if algorithm needs iterations parameter
-                    if algo_class in [AlgorithmStrategy.GreedyPlusPlus, AlgorithmStrategy.GreedyPlusPlusPriorityQueue]:
-                        evaluator.evaluate_algorithm(algorithm_instance, iterations=self.iterations)
+                    if getattr(algorithm_instance, 'takes_iterations', False):
+                        evaluator.evaluate_algorithm(algorithm_instance, iterations=self.iterations,
+                                                     progress_callback=AlgorithmResultsViewer.display_progress)
                     else:
-                        evaluator.evaluate_algorithm(algorithm_instance)
+                        evaluator.evaluate_algorithm(algorithm_instance,
+                                                     progress_callback=AlgorithmResultsViewer.display_progress)
 
                     AlgorithmResultsViewer.display_evaluation_results(evaluator)
+                    AlgorithmResultsViewer.save_memory_profile(evaluator.memory_profile, dataset_name,
+                                                               algorithm_instance.algorithm_name)
 
-                    AlgorithmResultsViewer.draw_densest_component_zoom(
+                    render_queue.submit_zoom(
                      dataset_graph, evaluator.identified_subgraph_nodes,
                      dataset_name, algorithm_instance.algorithm_name
                     )
@@ -233,7 +354,11 @@ class UI:
                 except Exception as e:
                     print(f"⛔ Error evaluating {algo_name}: {e}")
 
+        algorithms_time = time.perf_counter() - sweep_start_time
+        render_queue.close()
         print(f"\n✅ Evaluation completed! Total Evaluations: {total_evaluations}")
+        print(f"⏱️ Sweep time: {algorithms_time:.2f} s, plus {time.perf_counter() - sweep_start_time - algorithms_time:.2f} s "
+              f"waiting for figures")
         input("Press Enter to return to the main menu...")
 
     def run_quick_evaluation(self):
@@ -260,6 +385,44 @@ class UI:
         self.selected_datasets = temp_datasets
         self.selected_algorithms = temp_algorithms
 
+    def run_scaling_benchmark(self):
+        if not self.selected_datasets:
+            print("⛔ No datasets selected. Please select datasets first.")
+            return
+
+        if not self.selected_algorithms:
+            print("⛔ No algorithms selected. Please select algorithms first.")
+            return
+
+        from EvaluationResultsView import AlgorithmResultsViewer
+        from ScalingBenchmark import ScalingBenchmark
+
+        print("\n📈 SCALING BENCHMARK")
+        print(f"Sample fractions: {', '.join(f'{f:.0%}' for f in ScalingBenchmark.DEFAULT_FRACTIONS)}")
+
+        sampling = input("Sample by (n)odes or (e)dges? [n]: ").strip().lower()
+        sampling = "edge" if sampling == "e" else "node"
+        try:
+            budget_input = input("Time budget per run in seconds [60]: ").strip()
+            time_budget = float(budget_input) if budget_input else 60.0
+        except ValueError:
+            print("⛔ Please enter a valid number")
+            return
+
+        for dataset_name in self.selected_datasets:
+            dataset_graph = self.load_dataset(dataset_name)
+            print(f"\n🔎 Scaling benchmark on dataset: {dataset_name}")
+            print("-" * 50)
+
+            benchmark = ScalingBenchmark(dataset_graph, sampling=sampling, time_budget=time_budget)
+            curves = benchmark.run([UI.strategy_class(class_name)() for _, (_, class_name) in self.selected_algorithms],
+                                   iterations=self.iterations)
+
+            AlgorithmResultsViewer.display_scaling_results(curves)
+            AlgorithmResultsViewer.draw_scaling_curves(curves, dataset_name)
+
+        input("Press Enter to return to the main menu...")
+
     def run(self):
         self.display_welcome_message()
 
@@ -281,6 +444,8 @@ class UI:
                 elif choice == "6":
                     self.run_quick_evaluation()
                 elif choice == "7":
+                    self.run_scaling_benchmark()
+                elif choice == "8":
                     print("\n👋 Thank you for using the Dense Subgraph Discovery Algorithm Evaluator!")
                     sys.exit(0)
                 else:
@@ -292,3 +457,17 @@ class UI:
             except Exception as e:
                 print(f"⛔ An error occurred: {e}")
                 input("Press Enter to continue...")
+
+
+# Usage
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Dense subgraph discovery evaluator")
+    parser.add_argument("--import-times", action="store_true",
+                        help="Report startup time and the first-use cost of deferred modules, then exit")
+    arguments = parser.parse_args()
+
+    ui = UI()
+    if arguments.import_times:
+        UI.import_time_report(time.perf_counter() - _STARTED)
+    else:
+        ui.run()